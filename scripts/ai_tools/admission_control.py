@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Admission Control - Gates task starts, Godot checks and model loads on free memory
+Reads available memory and swap (/proc/meminfo, or vm_stat on macOS), the load
+average and the models Ollama has loaded, and only admits work whose estimated
+footprint fits in the headroom; idle models are evicted to make room for a new
+one. Work is always admitted when no other work of its kind is running, so
+tasks waiting for a Godot check can never block each other
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from ollama_client import NUM_CTX, OLLAMA_HOST, base_url, ollama_model
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+GB = 1024 ** 3
+# Memory always left free for the OS, the editor and everything else
+SAFETY_MARGIN_GB = float(os.environ.get("AI_MEMORY_MARGIN_GB", "2"))
+# Approximate resident memory of the processes a task starts
+FOOTPRINTS_GB = {
+    "task": 0.6,  # aider (Python, repo map) or the native client's edits
+    "godot": 1.5,  # headless --check-only, including the import of a fresh worktree
+}
+# CPU-bound work waits while the 1-minute load per core is above this
+MAX_LOAD_PER_CPU = 1.5
+CPU_BOUND = {"godot"}
+# Model estimate when Ollama cannot tell: q4 weights per billion parameters, plus
+# KV cache at the default context (scaled with OLLAMA_NUM_CTX) and runtime buffers
+GB_PER_BILLION = 0.6
+MODEL_OVERHEAD_GB = 1.5 * NUM_CTX / 16384
+# A process reservation stops counting once its usage shows in available memory
+SETTLE_SECONDS = 20
+# Swap growth between two readings that counts as a swap storm
+SWAP_STORM_GB = 0.25
+# Seconds between headroom checks while work waits for admission
+ADMISSION_POLL = 10
+
+
+@dataclass
+class Reservation:
+    kind: str
+    gb: float
+    model: Optional[str] = None  # an Ollama model this reservation loads
+    started: float = field(default_factory=time.time)
+
+
+def model_memory_gb(model: str) -> float:
+    """Estimated memory of a loaded model from its parameter count ("qwen2.5-coder:14b")"""
+    match = re.search(r':(\d+(?:\.\d+)?)b\b', model)
+    return (float(match.group(1)) if match else 7.0) * GB_PER_BILLION + MODEL_OVERHEAD_GB
+
+
+def read_memory() -> Optional[dict]:
+    """{"total", "available", "swap_used"} in bytes, or None if unknown on this platform"""
+    meminfo = Path("/proc/meminfo")
+    if meminfo.exists():
+        values = {}
+        for line in meminfo.read_text().splitlines():
+            name, _, rest = line.partition(":")
+            values[name] = int(rest.split()[0]) * 1024
+        return {
+            "total": values["MemTotal"],
+            "available": values.get("MemAvailable", values["MemFree"]),
+            "swap_used": values.get("SwapTotal", 0) - values.get("SwapFree", 0),
+        }
+
+    if sys.platform == "darwin":
+        try:
+            total = int(subprocess.run(["sysctl", "-n", "hw.memsize"], capture_output=True, text=True).stdout)
+            vm_stat = subprocess.run(["vm_stat"], capture_output=True, text=True).stdout
+            swap = subprocess.run(["sysctl", "-n", "vm.swapusage"], capture_output=True, text=True).stdout
+            page = int(re.search(r'page size of (\d+)', vm_stat).group(1))
+        except (OSError, ValueError, AttributeError):
+            return None
+        pages = {name: int(count) for name, count in re.findall(r'^Pages ([\w ]+):\s+(\d+)', vm_stat, re.M)}
+        free = sum(pages.get(name, 0) for name in ("free", "inactive", "speculative", "purgeable"))
+        used = re.search(r'used = ([\d.]+)M', swap)
+        return {"total": total, "available": free * page,
+                "swap_used": float(used.group(1)) * 1024 ** 2 if used else 0}
+    return None
+
+
+class AdmissionController:
+    def __init__(self, host: str = OLLAMA_HOST, margin_gb: float = SAFETY_MARGIN_GB):
+        self.url = base_url(host)
+        self.margin_gb = margin_gb
+        self.active: List[Reservation] = []
+        self.lock = threading.Lock()
+        self.last_swap: Optional[float] = None
+        self.last_refusal = ""
+        self.model_sizes: Dict[str, float] = {}
+
+    # Readings
+
+    def loaded_models(self) -> Dict[str, float]:
+        """Models Ollama has in memory: {tag: GB of system memory}"""
+        try:
+            with urllib.request.urlopen(f"{self.url}/api/ps", timeout=5) as response:
+                models = json.load(response).get("models", [])
+        except (OSError, ValueError, urllib.error.URLError):
+            return {}
+        loaded = {}
+        for model in models:
+            size = model.get("size", 0)
+            # Apple silicon's "VRAM" is the same unified memory
+            if sys.platform != "darwin":
+                size -= model.get("size_vram", 0)
+            loaded[model.get("name") or model.get("model")] = size / GB
+        return loaded
+
+    def model_footprint(self, model: str) -> float:
+        """Memory a model takes once loaded: installed weights plus KV cache, or an estimate"""
+        tag = ollama_model(model)
+        if not self.model_sizes:
+            try:
+                with urllib.request.urlopen(f"{self.url}/api/tags", timeout=5) as response:
+                    for entry in json.load(response).get("models", []):
+                        self.model_sizes[entry["name"]] = entry.get("size", 0) / GB
+            except (OSError, ValueError, urllib.error.URLError):
+                pass
+        if tag in self.model_sizes:
+            return self.model_sizes[tag] + MODEL_OVERHEAD_GB
+        return model_memory_gb(tag)
+
+    def snapshot(self) -> dict:
+        memory = read_memory()
+        load = os.getloadavg()[0] if hasattr(os, "getloadavg") else 0.0
+        return {
+            "memory": memory,
+            "available_gb": memory["available"] / GB if memory else None,
+            "swap_used_gb": memory["swap_used"] / GB if memory else 0.0,
+            "load_per_cpu": load / (os.cpu_count() or 1),
+            "loaded": self.loaded_models(),
+        }
+
+    # Admission
+
+    def outstanding_gb(self, snapshot: dict) -> float:
+        """Reserved memory that does not show in the available figure yet"""
+        now = time.time()
+        total = 0.0
+        for reservation in self.active:
+            settled = now - reservation.started > SETTLE_SECONDS
+            if reservation.model and ollama_model(reservation.model) not in snapshot["loaded"]:
+                settled = False  # still loading (or waiting to)
+            if not settled:
+                total += reservation.gb
+        return total
+
+    def requirement(self, kind: str, model: Optional[str], snapshot: dict) -> float:
+        gb = FOOTPRINTS_GB.get(kind, 0.0)
+        if model:
+            tag = ollama_model(model)
+            reserved = any(r.model and ollama_model(r.model) == tag for r in self.active)
+            if tag not in snapshot["loaded"] and not reserved:
+                gb += self.model_footprint(model)
+        return gb
+
+    def evict_idle_models(self, needed: float, snapshot: dict) -> float:
+        """Unload models no admitted work uses, largest first; returns GB freed"""
+        in_use = {ollama_model(r.model) for r in self.active if r.model}
+        freed = 0.0
+        for tag, gb in sorted(snapshot["loaded"].items(), key=lambda item: -item[1]):
+            if freed >= needed:
+                break
+            if tag in in_use:
+                continue
+            request = urllib.request.Request(
+                f"{self.url}/api/generate", data=json.dumps({"model": tag, "keep_alive": 0}).encode(),
+                headers={"Content-Type": "application/json"}
+            )
+            try:
+                urllib.request.urlopen(request, timeout=30).close()
+            except (OSError, urllib.error.URLError):
+                continue
+            print(f"🧹 Unloaded idle model {tag} to free {gb:.1f} GB")
+            freed += gb
+        return freed
+
+    def try_admit(self, kind: str, model: Optional[str] = None) -> Optional[Reservation]:
+        """Reserve memory for work if it fits now; None if it has to wait"""
+        with self.lock:
+            snapshot = self.snapshot()
+            need = self.requirement(kind, model, snapshot)
+            reason = None
+
+            busy = any(r.kind == kind for r in self.active)
+            if busy and snapshot["memory"]:
+                swap = snapshot["swap_used_gb"]
+                if self.last_swap is not None and swap - self.last_swap >= SWAP_STORM_GB:
+                    reason = f"swap grew by {swap - self.last_swap:.1f} GB"
+                elif kind in CPU_BOUND and snapshot["load_per_cpu"] > MAX_LOAD_PER_CPU:
+                    reason = f"load {snapshot['load_per_cpu']:.1f} per CPU"
+                else:
+                    headroom = snapshot["available_gb"] - self.outstanding_gb(snapshot) - self.margin_gb
+                    if need > headroom and model:
+                        headroom += self.evict_idle_models(need - headroom, snapshot)
+                    if need > headroom:
+                        reason = f"needs {need:.1f} GB, {max(0.0, headroom):.1f} GB free"
+            elif snapshot["memory"]:
+                # Nothing else of this kind is running: admit regardless, but make room for the model
+                headroom = snapshot["available_gb"] - self.margin_gb
+                if need > headroom and model:
+                    self.evict_idle_models(need - headroom, snapshot)
+            self.last_swap = snapshot["swap_used_gb"]
+
+            if reason:
+                self.last_refusal = f"{kind}{f' ({ollama_model(model)})' if model else ''}: {reason}"
+                return None
+            reservation = Reservation(kind, need, model)
+            self.active.append(reservation)
+            return reservation
+
+    def admit(self, kind: str, model: Optional[str] = None,
+              should_stop: Optional[Callable[[], bool]] = None) -> Reservation:
+        """Wait until work fits (or shutdown starts, when it is admitted regardless)"""
+        reservation = self.try_admit(kind, model)
+        if reservation is None:
+            print(f"⏳ Waiting for memory: {self.last_refusal}")
+        while reservation is None:
+            if should_stop and should_stop():
+                reservation = Reservation(kind, 0.0, model)
+                with self.lock:
+                    self.active.append(reservation)
+                break
+            time.sleep(ADMISSION_POLL)
+            reservation = self.try_admit(kind, model)
+        return reservation
+
+    def release(self, reservation: Optional[Reservation]):
+        with self.lock:
+            if reservation in self.active:
+                self.active.remove(reservation)
+
+    @contextmanager
+    def hold(self, kind: str, model: Optional[str] = None, should_stop: Optional[Callable[[], bool]] = None):
+        reservation = self.admit(kind, model, should_stop)
+        try:
+            yield reservation
+        finally:
+            self.release(reservation)
+
+
+def format_snapshot(controller: AdmissionController, models: List[str]) -> str:
+    snapshot = controller.snapshot()
+    lines = []
+    if snapshot["memory"]:
+        total = snapshot["memory"]["total"] / GB
+        lines.append(f"💾 Memory: {snapshot['available_gb']:.1f} of {total:.1f} GB available "
+                     f"(margin {controller.margin_gb:.1f} GB), swap used {snapshot['swap_used_gb']:.1f} GB")
+    else:
+        lines.append("💾 Memory: unknown on this platform (admission control is off)")
+    lines.append(f"⚙️  Load: {snapshot['load_per_cpu']:.2f} per CPU (Godot checks wait above {MAX_LOAD_PER_CPU})")
+    for tag, gb in sorted(snapshot["loaded"].items()):
+        lines.append(f"🧠 Loaded: {tag} ({gb:.1f} GB)")
+    for model in models:
+        tag = ollama_model(model)
+        if tag not in snapshot["loaded"]:
+            lines.append(f"   {tag}: ~{controller.model_footprint(model):.1f} GB to load")
+    return '\n'.join(lines)
+
+
+def main():
+    from agent_orchestrator import MODELS
+
+    controller = AdmissionController()
+    models = sorted(set(MODELS.values()))
+    if "--watch" not in sys.argv:
+        print(format_snapshot(controller, models))
+        return
+    interval = int(sys.argv[sys.argv.index("--watch") + 1]) if len(sys.argv) > sys.argv.index("--watch") + 1 else 10
+    try:
+        while True:
+            print("\033[2J\033[H" + format_snapshot(controller, models), flush=True)
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
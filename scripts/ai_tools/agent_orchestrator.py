@@ -6,21 +6,47 @@ Coordinates specialized AI agents to build the game autonomously
 
 import subprocess
 import os
+import signal
 import sys
 import json
 import time
 from pathlib import Path
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional
 import re
 import fcntl  # For file locking
+import threading
 import hashlib  # For stable hashing
 
+from admission_control import AdmissionController
+from dependency_graph import DependencyGraph, changed_files, format_broken_references, uncommitted_files
+from github_counts import issue_counts
+from github_queue import GitHubQueue
+from ollama_client import OllamaClient, OllamaError, PatchError, run_task
+from plan_tasks import DEV_PLAN, iter_plan_tasks
+from retry_policy import Failure, RetryPolicy
+from task_coordinator import Coordinator, parse_address
+from task_ids import TaskIdRegistry
+from task_leases import LeaseManager, TaskInterrupted, format_resumable
+from task_logs import COMMENT_CHARS, TaskLog, TaskLogIndex
+from task_scheduler import MAX_FAILURES, TaskScheduler
+from throughput import ThroughputStore
+from godot_diagnostics import (
+    Diagnostic, DiagnosticsStore, errors, format_diagnostics, parse_output, run_godot_check
+)
+
 # CONFIGURATION
 GODOT_PATH = "/Applications/Godot.app/Contents/MacOS/Godot"
 PROJECT_ROOT = Path(__file__).parent.parent.parent
-DEV_PLAN = PROJECT_ROOT / "development_plan.md"
 PROGRESS_FILE = PROJECT_ROOT / ".ai_progress.json"
+ASSET_PREFETCH_LOG = PROJECT_ROOT / ".ai_asset_prefetch.log"
+# Revision whose development_plan.md positional task IDs (S1T3) in an old
+# progress file refer to; found from the file times when unset
+LEGACY_PLAN_REV = os.environ.get("AI_LEGACY_PLAN_REV")
+# "aider" (default) or "ollama" (native client, see ollama_client.py)
+BACKEND = os.environ.get("AI_BACKEND", "aider")
+# Default -j with --distributed: tasks in flight across all workers
+DISTRIBUTED_PARALLEL = 8
 
 # Model configuration - using faster models for better performance on M4
 MODELS = {
@@ -29,6 +55,32 @@ MODELS = {
     "complex": "ollama_chat/deepseek-coder:6.7b" # Complex architectural tasks
 }
 
+# Shared by every task prompt, byte for byte. The Ollama backend sends it as a
+# fixed system prompt so the server reuses its prompt cache across tasks.
+TASK_RULES = """
+CRITICAL REQUIREMENTS:
+1. Use Godot 4.x / GDScript 2.0 syntax ONLY
+2. Use CharacterBody3D instead of KinematicBody3D
+3. Use proper typed GDScript with type hints
+4. Follow the architecture principles in development_plan.md:
+   - Modular scene composition
+   - Event bus for communication (EventBus autoload)
+   - Resource-based data for configs
+   - State machines where appropriate
+
+5. Create clean, well-commented code
+6. Use export variables for designer-facing parameters
+
+FILE CREATION RULES:
+- NEVER create files with backticks, asterisks, or markdown formatting in the name
+- ALWAYS use proper GDScript/Godot file extensions (.gd, .tscn, .tres, .gdshader)
+
+Folder structure:
+- scenes/ for .tscn files (subdivided: player/, ui/, editor/, levels/)
+- scripts/ for .gd files (subdivided: autoloads/, player/, ui/, editor/, resources/)
+- assets/ for external resources (configs/, shaders/, textures/)
+"""
+
 @dataclass
 class Task:
     id: str
@@ -42,9 +94,39 @@ class Task:
     issue_hash: Optional[str] = None  # Hash to prevent re-processing same issue
 
 class AgentOrchestrator:
-    def __init__(self):
+    def __init__(self, backend: str = BACKEND):
+        self.backend = backend
+        self.ollama = OllamaClient() if backend == "ollama" else None
         self.progress = self.load_progress()
         self.current_stage = self.progress.get("current_stage", 1)
+        self.diagnostics_store = DiagnosticsStore()
+        self.metrics = ThroughputStore()
+        # Parallel tasks share the progress dict
+        self.progress_lock = threading.RLock()
+        # In-flight tasks: leases, running aider processes and the shutdown flag
+        self.leases = LeaseManager()
+        self.active_processes: Dict[str, subprocess.Popen] = {}
+        self.stopping = threading.Event()
+        # Task starts, Godot checks and model loads wait for memory headroom
+        self.admission = AdmissionController()
+        # Why each task's last attempt failed; classified by the retry policy
+        self.retries = RetryPolicy(self.progress, MODELS)
+        self.task_failures: Dict[str, Failure] = {}
+        # Each attempt's full output is spooled to a compressed, indexed log
+        self.log_index = TaskLogIndex()
+        self.task_logs: Dict[str, TaskLog] = {}
+        self.log_runs: Dict[str, int] = {}
+        # Plan task IDs survive edits to development_plan.md
+        self.task_ids = TaskIdRegistry(self.progress)
+        # Issue creates, comments and closes are written behind by a background thread
+        self.github = GitHubQueue(lambda task_id: self.progress.get("github_issues", {}).get(task_id),
+                                  self.record_github_issue)
+        # Set by --distributed: tasks run on worker machines instead of here
+        self.remote = None
+        # (fetch_asset process, stages) of the running background asset prefetch
+        self.asset_prefetch = None
+        if self.task_ids.needs_migration():
+            self.migrate_task_ids()
         self.setup_git_config()
         self.run_cleanup()  # Clean up malformed files on startup
 
@@ -68,11 +150,77 @@ class AgentOrchestrator:
             "completed_tasks": [],
             "failed_tasks": [],
             "github_issues": {},
-            "processed_issue_hashes": []  # Track processed issues to prevent loops
+            "processed_issue_hashes": [],  # Track processed issues to prevent loops
+            "task_ids": {},
+            "task_ids_migrated": True
         }
 
+    def migrate_task_ids(self):
+        """One-time rename of positional task IDs (S1T3) in progress and leases
+        to content IDs, matched by position in the plan they were numbered against
+
+        Refuses (and stops) rather than guess when that plan can't be found or
+        has fewer bullets than the progress refers to.
+        """
+        if not DEV_PLAN.exists():
+            return
+        content = self.legacy_plan() if self.task_ids.legacy_ids() else DEV_PLAN.read_text()
+        if content is None:
+            self.refuse_migration("development_plan.md changed after the progress was last saved, "
+                                  "and git has no earlier version of it")
+        plan_tasks = [
+            (stage, legacy, task_id, desc) for (stage, legacy, desc), (_, task_id, _) in
+            zip(iter_plan_tasks(content, positional=True), iter_plan_tasks(content))
+        ]
+        unmatched = self.task_ids.unmatched_legacy_ids(plan_tasks)
+        if unmatched:
+            self.refuse_migration(f"the plan has no bullet for {', '.join(unmatched)}")
+
+        renamed = self.task_ids.migrate(plan_tasks)
+        for legacy, task_id in renamed.items():
+            self.leases.rename(legacy, task_id)
+        self.save_progress()
+        if renamed:
+            print(f"🆔 Migrated {len(renamed)} task ID(s) to content-based IDs")
+
+    def legacy_plan(self) -> Optional[str]:
+        """Text of the plan the positional IDs in progress were numbered against
+
+        The current plan if it is unchanged since progress was last saved, else
+        the last committed version from before then; LEGACY_PLAN_REV names the
+        revision explicitly.
+        """
+        rev = LEGACY_PLAN_REV
+        if not rev:
+            saved = PROGRESS_FILE.stat().st_mtime if PROGRESS_FILE.exists() else None
+            if saved is None or DEV_PLAN.stat().st_mtime <= saved:
+                return DEV_PLAN.read_text()
+            rev = subprocess.run(
+                ["git", "log", "-1", "--format=%H", f"--before=@{int(saved)}", "--", DEV_PLAN.name],
+                capture_output=True, text=True, cwd=PROJECT_ROOT
+            ).stdout.strip()
+            if not rev:
+                return None
+            print(f"🆔 development_plan.md changed since the progress was saved; numbering legacy "
+                  f"task IDs against its version from {rev[:8]}")
+
+        result = subprocess.run(["git", "show", f"{rev}:./{DEV_PLAN.name}"],
+                                capture_output=True, text=True, cwd=PROJECT_ROOT)
+        return result.stdout if result.returncode == 0 else None
+
+    def refuse_migration(self, reason: str):
+        print(f"❌ Cannot migrate positional task IDs ({', '.join(self.task_ids.legacy_ids())}): {reason}.")
+        print("   Mapping them onto the current plan would mark the wrong tasks complete.")
+        print("   Set AI_LEGACY_PLAN_REV to the git revision whose development_plan.md the progress")
+        print(f"   was made with, or fix the IDs in {PROGRESS_FILE.name} by hand, then start again.")
+        sys.exit(1)
+
     def save_progress(self):
         """Save progress to persistent storage with file locking"""
+        with self.progress_lock:
+            self._save_progress()
+
+    def _save_progress(self):
         try:
             # Use a temporary file and atomic rename to prevent corruption
             temp_file = PROGRESS_FILE.with_suffix('.json.tmp')
@@ -259,43 +407,26 @@ class AgentOrchestrator:
             content = f.read()
 
         tasks = []
-        current_stage = None
-        in_tasks_section = False
-
-        for line in content.split('\n'):
-            # Detect stage header
-            stage_match = re.match(r'^## Stage (\d+)', line)
-            if stage_match:
-                current_stage = int(stage_match.group(1))
-                in_tasks_section = False
-                continue
-
-            # Detect tasks section
-            if line.startswith('### Tasks'):
-                in_tasks_section = True
+        for stage, task_id, task_desc in iter_plan_tasks(content):
+            if stage != self.current_stage:
                 continue
 
-            # Stop at next section
-            if line.startswith('###') and not line.startswith('### Tasks'):
-                in_tasks_section = False
-
-            # Parse task items
-            if in_tasks_section and line.startswith('- ') and current_stage:
-                task_desc = line[2:].strip()
-                if task_desc and current_stage == self.current_stage:
-                    # Determine model based on task complexity
-                    model = self.determine_model(task_desc)
-
-                    task_id = f"S{current_stage}T{len(tasks)+1}"
-                    tasks.append(Task(
-                        id=task_id,
-                        title=task_desc[:80],
-                        description=task_desc,
-                        stage=current_stage,
-                        priority="high" if "autoload" in task_desc.lower() or "setup" in task_desc.lower() else "normal",
-                        model=model
-                    ))
-
+            # Determine model based on task complexity
+            model = self.determine_model(task_desc)
+
+            tasks.append(Task(
+                id=task_id,
+                title=task_desc[:80],
+                description=task_desc,
+                stage=stage,
+                priority="high" if "autoload" in task_desc.lower() or "setup" in task_desc.lower() else "normal",
+                model=model
+            ))
+
+        # Reworded tasks keep the ID (and history) of the task they replace
+        with self.progress_lock:
+            self.task_ids.resolve(tasks)
+        self.save_progress()
         return tasks
 
     def determine_model(self, task_desc: str) -> str:
@@ -313,54 +444,16 @@ class AgentOrchestrator:
         # Default to balanced
         return MODELS["balanced"]
 
-    def ensure_github_labels(self):
-        """Ensure required GitHub labels exist, create if missing"""
-        required_labels = [
-            ("ai-generated", "AI generated task", "0366d6"),
-            ("build-error", "Build validation failure", "d73a4a"),
-            ("urgent", "Requires immediate attention", "b60205"),
-        ]
-
-        # Add stage labels
-        for stage in range(1, 13):
-            required_labels.append(
-                (f"stage-{stage}", f"Development stage {stage}", "fbca04")
-            )
-
-        for label_name, description, color in required_labels:
-            try:
-                # Check if label exists
-                check = subprocess.run(
-                    ["gh", "label", "list", "--json", "name"],
-                    capture_output=True,
-                    text=True
-                )
-
-                if check.returncode == 0:
-                    existing_labels = json.loads(check.stdout)
-                    label_exists = any(l["name"] == label_name for l in existing_labels)
-
-                    if not label_exists:
-                        # Create the label
-                        subprocess.run(
-                            ["gh", "label", "create", label_name,
-                             "--description", description,
-                             "--color", color],
-                            capture_output=True
-                        )
-                        print(f"📋 Created label: {label_name}")
-            except Exception as e:
-                print(f"⚠️  Error ensuring label {label_name}: {e}")
-
     def create_github_issue(self, task: Task) -> Optional[int]:
-        """Create a GitHub issue for tracking, if label is missing then create the label"""
+        """Queue a GitHub issue for tracking (labels are created by the queue if missing)
+
+        Returns the issue number if the issue already exists; otherwise it is
+        created in the background and updates for the task wait behind it.
+        """
         # Check if issue already exists
         if task.id in self.progress.get("github_issues", {}):
             return self.progress["github_issues"][task.id]
 
-        # Ensure labels exist before creating issue
-        self.ensure_github_labels()
-
         body = f"""## Stage {task.stage} Task
 
 **Description:**
@@ -373,77 +466,100 @@ class AgentOrchestrator:
 ---
 *This issue was automatically created by the AI agent orchestrator*
 """
+        self.github.create_issue(task.id, f"[Stage {task.stage}] {task.title}", body,
+                                 [f"stage-{task.stage}", "ai-generated"])
+        return None
+
+    def record_github_issue(self, task_id: str, issue_num: int):
+        """Called by the GitHub queue once a task's issue exists"""
+        with self.progress_lock:
+            self.progress.setdefault("github_issues", {})[task_id] = issue_num
+        self.save_progress()
 
-        try:
-            result = subprocess.run(
-                ["gh", "issue", "create",
-                 "--title", f"[Stage {task.stage}] {task.title}",
-                 "--body", body,
-                 "--label", f"stage-{task.stage},ai-generated"],
-                capture_output=True,
-                text=True
-            )
+    def update_github_issue(self, task: Task, status: str, message: str = ""):
+        """Queue a progress comment on the task's GitHub issue (closing it when completed)"""
+        if not (task.github_issue or self.github.has_issue(task.id)):
+            return
+        status_emoji = {
+            "in_progress": "🔄",
+            "completed": "✅",
+            "failed": "❌",
+            "retrying": "🔁"
+        }.get(status, "📝")
+
+        comment = f"{status_emoji} **Status Update:** {status.replace('_', ' ').title()}\n\n{message}"
+        self.github.comment(task.id, task.github_issue, comment)
+        if status == "completed":
+            self.github.close_issue(task.id, task.github_issue)
+
+    def get_head_commit(self, cwd: Path = PROJECT_ROOT) -> Optional[str]:
+        """Get the current HEAD commit, or None on an empty repository"""
+        result = subprocess.run(
+            ["git", "rev-parse", "--verify", "-q", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=cwd
+        )
+        return result.stdout.strip() or None
 
-            if result.returncode == 0:
-                # Extract issue number from output
-                issue_url = result.stdout.strip()
-                issue_num = int(issue_url.split('/')[-1])
-
-                # Save to progress
-                if "github_issues" not in self.progress:
-                    self.progress["github_issues"] = {}
-                self.progress["github_issues"][task.id] = issue_num
-                self.save_progress()
+    def verify_godot_build(self, changed: Optional[List[str]] = None,
+                           workdir: Path = PROJECT_ROOT) -> tuple[bool, str, List[Diagnostic]]:
+        """Run Godot headless verification
 
-                print(f"✅ Created issue #{issue_num}: {task.title}")
-                return issue_num
+        Args:
+            changed: Files touched by the task. When given, references are checked
+                     statically first and Godot only runs if a scene/script is affected.
+                     An empty list (no changes found) runs the full check.
+            workdir: Checkout to verify (a task worktree when running in parallel)
+
+        Only the decision whether to run Godot is affected-based: when it runs,
+        `--check-only` checks the whole project, since scenes cannot be checked
+        one at a time.
+
+        Returns:
+            (ok, message, diagnostics): the message is a compact diagnostics
+            table. Diagnostics go back to the caller (tasks verify concurrently)
+            and are also stored per commit.
+        """
+        commit = self.get_head_commit(workdir)
+
+        if changed is not None and not changed:
+            # Nothing committed or left in the working tree: don't pass it unverified
+            print("🔍 No changes found - running the full Godot check")
+            changed = None
+
+        if changed is not None:
+            if workdir == PROJECT_ROOT:
+                graph = DependencyGraph()
             else:
-                print(f"⚠️  Failed to create issue: {result.stderr}")
-                return None
-        except Exception as e:
-            print(f"⚠️  Error creating issue: {e}")
-            return None
+                graph = DependencyGraph(root=workdir, cache_file=workdir / ".ai_dep_graph.json")
+            affected, broken = graph.check_change(changed)
 
-    def update_github_issue(self, task: Task, status: str, message: str = ""):
-        """Update GitHub issue with progress"""
-        if task.github_issue:
-            status_emoji = {
-                "in_progress": "🔄",
-                "completed": "✅",
-                "failed": "❌"
-            }.get(status, "📝")
+            if broken:
+                diagnostics = parse_output(format_broken_references(broken))
+                self.diagnostics_store.save(commit, diagnostics, source="dependency_graph")
+                return False, format_diagnostics(diagnostics), diagnostics
 
-            comment = f"{status_emoji} **Status Update:** {status.replace('_', ' ').title()}\n\n{message}"
+            if not affected:
+                print("🔍 No scenes or scripts affected - skipping Godot check")
+                return True, "No scenes or scripts affected", []
 
-            try:
-                subprocess.run(
-                    ["gh", "issue", "comment", str(task.github_issue), "--body", comment],
-                    capture_output=True
-                )
-
-                if status == "completed":
-                    subprocess.run(
-                        ["gh", "issue", "close", str(task.github_issue)],
-                        capture_output=True
-                    )
-            except Exception as e:
-                print(f"⚠️  Error updating issue: {e}")
+            print(f"🔍 {len(affected)} scenes/scripts affected by this change")
 
-    def verify_godot_build(self) -> tuple[bool, str]:
-        """Run Godot headless verification"""
         print("🔍 Verifying GDScript with Godot headless...")
 
-        result = subprocess.run(
-            [GODOT_PATH, "--headless", "--check-only", "--quit"],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
+        with self.admission.hold("godot", should_stop=self.stopping.is_set):
+            returncode, diagnostics, _, _ = run_godot_check(
+                [GODOT_PATH, "--headless", "--path", str(workdir), "--check-only", "--quit"],
+                # A fresh worktree may still need to import assets
+                timeout=30 if workdir == PROJECT_ROOT else 300
+            )
+        self.diagnostics_store.save(commit, diagnostics)
 
-        if result.returncode != 0 and ("ERROR" in result.stderr or "SCRIPT ERROR" in result.stderr):
-            return False, result.stderr
+        if returncode != 0 and errors(diagnostics):
+            return False, format_diagnostics(diagnostics), diagnostics
 
-        return True, "Build verification passed"
+        return True, "Build verification passed", diagnostics
 
     def get_files_for_task(self, task: Task) -> List[str]:
         """Determine which specific files aider should work on for this task"""
@@ -517,8 +633,42 @@ class AgentOrchestrator:
 
         return files
 
-    def execute_task_with_aider(self, task: Task) -> bool:
-        """Execute a task using aider with appropriate model"""
+    def execute_task_with_aider(self, task: Task, workdir: Path = PROJECT_ROOT,
+                                integrate: Optional[Callable[[], Optional[str]]] = None,
+                                remote=None) -> bool:
+        """Execute a task using aider with appropriate model
+
+        The task holds a heartbeat lease while it runs. If the orchestrator is
+        stopped meanwhile, its partial work is checkpointed and the lease kept,
+        so the next run resumes it.
+
+        Args:
+            workdir: Checkout aider works in (a git worktree for parallel tasks)
+            integrate: Called once the build verifies to bring the worktree's
+                       commits onto the main branch; returns the main commit
+                       they were applied on top of
+            remote: Runs the attempt on a worker instead (task_coordinator.py)
+                    and brings its commits into `workdir`
+        """
+        log = TaskLog(task.id, task.model, task.stage, self.backend, index=self.log_index)
+        self.task_logs[task.id] = log
+        outcome = "error"
+        try:
+            success = self._execute_task(task, workdir, integrate, remote)
+            outcome = "completed" if success else "failed"
+            return success
+        except (KeyboardInterrupt, TaskInterrupted):
+            outcome = "interrupted"
+            self.leases.checkpoint(task.id, workdir)
+            raise
+        finally:
+            if task.id in self.leases.held:
+                self.leases.release(task.id)
+            self.log_runs[task.id] = log.close(outcome)
+            del self.task_logs[task.id]
+
+    def _execute_task(self, task: Task, workdir: Path,
+                      integrate: Optional[Callable[[], Optional[str]]], remote=None) -> bool:
         print(f"\n{'='*80}")
         print(f"🤖 Executing Task {task.id}: {task.title}")
         print(f"📊 Model: {task.model}")
@@ -526,7 +676,7 @@ class AgentOrchestrator:
             print(f"🔗 GitHub Issue: #{task.github_issue}")
         print(f"{'='*80}\n")
 
-        # Update or create GitHub issue
+        # Update or create GitHub issue (queued: no GitHub round-trips before the work starts)
         if not task.github_issue:
             task.github_issue = self.create_github_issue(task)
 
@@ -536,74 +686,100 @@ class AgentOrchestrator:
         task_files = self.get_files_for_task(task)
         print(f"📂 Working on {len(task_files)} specific files")
 
-        # Build aider command
-        is_backlog_task = task.id.startswith("GH")
-
-        if is_backlog_task:
-            prompt = f"""
-URGENT BACKLOG TASK - Missing Deliverables
+        # Task-specific part first; the shared rules are appended (or sent as
+        # the system prompt by the Ollama backend)
+        prompt = self.build_task_prompt(task)
+
+        base_commit = self.get_head_commit(workdir)
+
+        # Pick up where an interrupted or abandoned attempt stopped
+        previous = self.leases.acquire(task.id, base_commit, workdir)
+        if previous and previous.get("head"):
+            restored_base = self.leases.restore(previous, workdir)
+            if restored_base:
+                base_commit = restored_base
+                self.leases.update(task.id, base_commit=base_commit)
+                print(f"♻️  Resuming {task.id} after {previous.get('elapsed', 0) / 60:.1f} min of earlier work")
+                prompt += f"""
+RESUMING INTERRUPTED WORK:
+A previous attempt at this task was interrupted. Its partial work is already in the files
+({len(previous.get('commits', []))} commit(s){' plus uncommitted edits' if previous.get('snapshot') else ''}).
+Review what exists and finish the task from there; do not start over.
+"""
 
-{task.description}
+        prompt += self.retries.prompt_note(task.id)
+        self.task_logs[task.id].write_text("prompt", prompt + "\n")
 
-This task addresses missing files from a previous stage. You MUST create all the files listed above.
-Each file listed is a deliverable that was supposed to exist but is missing.
+        if remote is not None:
+            failure, message = remote.run_attempt(task, prompt, task_files, workdir, base_commit)
+        else:
+            failure, message = self.run_attempt(task, prompt, task_files, workdir, base_commit)
+        if failure is None or failure.step.startswith("build"):
+            self.metrics.record_verification(task.id, failure is None)
+        if failure is not None:
+            self.task_failures[task.id] = failure
+            self.update_github_issue(task, "failed", message)
+            return False
 
-CRITICAL REQUIREMENTS:
-1. CREATE all files mentioned in the task description above
-2. Use Godot 4.x / GDScript 2.0 syntax ONLY
-3. Use CharacterBody3D instead of KinematicBody3D
-4. Use proper typed GDScript with type hints
-5. Follow the architecture principles in development_plan.md:
-   - Modular scene composition
-   - Event bus for communication (EventBus autoload)
-   - Resource-based data for configs
-   - State machines where appropriate
-6. Create clean, well-commented code
-7. Use export variables for designer-facing parameters
+        # Worktree tasks land on the main branch here (raises IntegrationConflict);
+        # everything below then sees the task's files in PROJECT_ROOT
+        if integrate is not None:
+            base_commit = integrate()
 
-FILE CREATION RULES:
-- Create files exactly at the paths specified in the task description
-- NEVER create files with backticks, asterisks, or markdown formatting in the name
-- ALWAYS use proper GDScript/Godot file extensions (.gd, .tscn, .tres, .gdshader)
+        # Verify task completion by checking if expected files exist
+        print("🔍 Verifying task deliverables...")
+        verification_passed = self.verify_task_deliverables(task)
 
-Folder structure:
-- scenes/ for .tscn files (subdivided: player/, ui/, editor/, levels/)
-- scripts/ for .gd files (subdivided: autoloads/, player/, ui/, editor/, resources/)
-- assets/ for external resources (configs/, shaders/, textures/)
-"""
+        if not verification_passed:
+            print("⚠️  Task marked complete but some deliverables may be missing")
+            self.update_github_issue(task, "completed", "Task completed with warnings - some deliverables may need review")
         else:
-            prompt = f"""
-{task.description}
+            print(f"✅ Task {task.id} completed and verified!")
+            # For GitHub issue tasks, update checkboxes and ALWAYS close
+            if task.id.startswith("GH"):
+                # Close the issue even if not all deliverables are done to prevent loops
+                # If items remain, they should be caught by validation and create new issues
+                if task.github_issue:
+                    self.github.update_checkboxes(task.id, task.github_issue)
+                    self.github.close_issue(task.id, task.github_issue)
+                    print(f"✅ Closing GitHub issue #{task.github_issue} to prevent re-processing")
+            else:
+                self.update_github_issue(task, "completed", "Task completed and fully verified")
 
-CRITICAL REQUIREMENTS:
-1. Use Godot 4.x / GDScript 2.0 syntax ONLY
-2. Use CharacterBody3D instead of KinematicBody3D
-3. Use proper typed GDScript with type hints
-4. Follow the architecture principles in development_plan.md:
-   - Modular scene composition
-   - Event bus for communication (EventBus autoload)
-   - Resource-based data for configs
-   - State machines where appropriate
+        # Update progress and mark issue hash as processed
+        with self.progress_lock:
+            self.progress["completed_tasks"].append(task.id)
+            self.retries.on_success(task.id)
+            self.record_task_commits(task, base_commit, workdir)
+            if hasattr(task, 'issue_hash') and task.issue_hash:
+                if "processed_issue_hashes" not in self.progress:
+                    self.progress["processed_issue_hashes"] = []
+                self.progress["processed_issue_hashes"].append(task.issue_hash)
+        self.save_progress()
 
-5. Create clean, well-commented code
-6. Use export variables for designer-facing parameters
+        # Run cleanup after each task to catch any malformed files immediately
+        self.run_cleanup()
 
-FILE CREATION RULES:
-- ONLY create files in these directories: scenes/, scripts/, assets/
-- NEVER create files with backticks, asterisks, or markdown formatting in the name
-- NEVER create files in the project root unless it's a .md or .json file
-- ALWAYS use proper GDScript/Godot file extensions (.gd, .tscn, .tres, .gdshader)
+        return True
 
-Folder structure:
-- scenes/ for .tscn files (subdivided: player/, ui/, editor/, levels/)
-- scripts/ for .gd files (subdivided: autoloads/, player/, ui/, editor/, resources/)
-- assets/ for external resources (configs/, shaders/, textures/)
-"""
+    def run_attempt(self, task: Task, prompt: str, task_files: List[str], workdir: Path,
+                    base_commit: Optional[str]) -> tuple:
+        """Generate the task's changes in `workdir` and verify the build
+
+        Used for local tasks, and by worker_daemon.py for dispatched ones.
 
+        Returns:
+            (failure, message): failure is None when the build verified; the
+            message is the build result or what went wrong, for the issue comment
+
+        Raises:
+            TaskInterrupted if the orchestrator is shutting down
+        """
+        log = self.task_logs[task.id]
         aider_cmd = [
             "aider",
             "--model", task.model,
-            "--message", prompt,
+            "--message", prompt + TASK_RULES,
             "--yes-always",
             "--auto-commit",
             "--no-suggest-shell-commands"
@@ -614,141 +790,200 @@ Folder structure:
             aider_cmd.append(file_path)
 
         try:
-            result = subprocess.run(
-                aider_cmd,
-                stdin=subprocess.DEVNULL,
-                capture_output=True,
-                text=True,
-                timeout=600  # 10 minute timeout to prevent hanging
-            )
+            if self.ollama:
+                result = self.run_ollama(task, prompt, task_files, workdir)
+            else:
+                result = self.run_aider(task, aider_cmd, workdir)
         except subprocess.TimeoutExpired:
             print(f"❌ Aider timed out after 10 minutes")
-            self.update_github_issue(task, "failed", "Aider execution timed out after 10 minutes")
-            return False
+            return Failure("aider_timeout"), "Aider execution timed out after 10 minutes"
 
         if result.returncode != 0:
-            print(f"❌ Aider failed: {result.stderr}")
-            self.update_github_issue(task, "failed", f"Aider execution failed:\n```\n{result.stderr}\n```")
-            return False
-
-        # Verify build
-        build_ok, build_msg = self.verify_godot_build()
+            stderr = result.stderr[-COMMENT_CHARS:]
+            print(f"❌ Aider failed: {stderr}")
+            return (
+                Failure("aider", result.returncode, result.stderr + result.stdout, stderr=result.stderr),
+                f"Aider execution failed:\n```\n{stderr}\n```\nFull log: `{log.path.relative_to(PROJECT_ROOT)}`"
+            )
 
-        if not build_ok:
-            print(f"❌ Build verification failed!")
-            print(build_msg)
+        return self.verify_attempt(task, workdir, base_commit)
 
-            # Revert the commit
-            print("⏪ Reverting last commit...")
-            subprocess.run(["git", "reset", "--hard", "HEAD~1"])
+    def verify_attempt(self, task: Task, workdir: Path, base_commit: Optional[str]) -> tuple:
+        """Verify the build in `workdir` after an attempt; a failing commit is reverted
 
-            self.update_github_issue(task, "failed", f"Build verification failed:\n```\n{build_msg}\n```")
-            return False
+        Also run by the coordinator on commits that come back from a worker.
 
-        # Verify task completion by checking if expected files exist
-        print("🔍 Verifying task deliverables...")
-        verification_passed = self.verify_task_deliverables(task)
+        Returns:
+            (failure, message) as for run_attempt
+        """
+        log = self.task_logs[task.id]
+        # Verify build (only what this task's commits actually affect, plus any
+        # edits aider left uncommitted)
+        task_changes = None
+        if base_commit:
+            task_changes = sorted(set(changed_files(base_commit, cwd=workdir)) | set(uncommitted_files(workdir)))
+        failure = None
+        try:
+            build_ok, build_msg, diagnostics = self.verify_godot_build(task_changes, workdir)
+        except subprocess.TimeoutExpired:
+            build_ok, build_msg, diagnostics = False, "Godot check timed out", []
+            failure = Failure("build_timeout")
+        if self.stopping.is_set():
+            raise TaskInterrupted(task.id)
+        log.write_text("build", build_msg + "\n")
+        if build_ok:
+            return None, build_msg
+
+        for diagnostic in errors(diagnostics):
+            log.add_signature(f"godot {diagnostic.category}")
+        print(f"❌ Build verification failed!")
+        print(build_msg)
+
+        # Revert the commit
+        print("⏪ Reverting last commit...")
+        subprocess.run(["git", "reset", "--hard", "HEAD~1"], cwd=workdir)
+        failure = failure or Failure("build", output=build_msg, diagnostics=diagnostics)
+        return failure, f"Build verification failed:\n\n{build_msg}"
+
+    def build_task_prompt(self, task: Task) -> str:
+        """The task-specific part of the prompt (TASK_RULES follow it)"""
+        if task.id.startswith("GH"):
+            return f"""
+URGENT BACKLOG TASK - Missing Deliverables
 
-        if not verification_passed:
-            print("⚠️  Task marked complete but some deliverables may be missing")
-            self.update_github_issue(task, "completed", "Task completed with warnings - some deliverables may need review")
-        else:
-            print(f"✅ Task {task.id} completed and verified!")
-            # For GitHub issue tasks, update checkboxes and ALWAYS close
-            if task.id.startswith("GH"):
-                self.update_github_issue_checkboxes(task)
-                # Close the issue even if not all deliverables are done to prevent loops
-                # If items remain, they should be caught by validation and create new issues
-                if task.github_issue:
-                    subprocess.run(
-                        ["gh", "issue", "close", str(task.github_issue)],
-                        capture_output=True
-                    )
-                    print(f"✅ Closed GitHub issue #{task.github_issue} to prevent re-processing")
-            else:
-                self.update_github_issue(task, "completed", "Task completed and fully verified")
+{task.description}
 
-        # Update progress and mark issue hash as processed
-        self.progress["completed_tasks"].append(task.id)
-        if hasattr(task, 'issue_hash') and task.issue_hash:
-            if "processed_issue_hashes" not in self.progress:
-                self.progress["processed_issue_hashes"] = []
-            self.progress["processed_issue_hashes"].append(task.issue_hash)
-        self.save_progress()
+This task addresses missing files from a previous stage. You MUST create all the files listed above.
+Each file listed is a deliverable that was supposed to exist but is missing.
+- CREATE all files mentioned in the task description above
+- Create files exactly at the paths specified in the task description
+"""
+        return f"""
+{task.description}
 
-        # Run cleanup after each task to catch any malformed files immediately
-        self.run_cleanup()
+- ONLY create files in these directories: scenes/, scripts/, assets/
+- NEVER create files in the project root unless it's a .md or .json file
+"""
 
-        return True
+    def run_aider(self, task: Task, aider_cmd: List[str], workdir: Path) -> subprocess.CompletedProcess:
+        """Run aider as a tracked child process so shutdown() can stop it
 
-    def update_github_issue_checkboxes(self, task: Task):
-        """Update checkboxes in GitHub issue and close if all deliverables are done"""
-        if not task.github_issue:
-            return
+        Raises:
+            subprocess.TimeoutExpired after 10 minutes
+            TaskInterrupted if the orchestrator is shutting down
+        """
+        if self.stopping.is_set():
+            raise TaskInterrupted(task.id)
+        log = self.task_logs[task.id]
+        process = subprocess.Popen(
+            aider_cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            errors="replace",
+            cwd=workdir
+        )
 
-        try:
-            # Get current issue body
-            result = subprocess.run(
-                ["gh", "issue", "view", str(task.github_issue), "--json", "body"],
-                capture_output=True,
-                text=True
-            )
+        # Output goes straight to the task log; only its tail is kept in memory
+        def pump(stream, name: str):
+            for line in stream:
+                log.write(name, line)
 
-            if result.returncode != 0:
-                return
+        readers = [
+            threading.Thread(target=pump, args=(process.stdout, "out"), daemon=True),
+            threading.Thread(target=pump, args=(process.stderr, "err"), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
 
-            issue_data = json.loads(result.stdout)
-            body = issue_data.get("body", "")
-
-            # Check which deliverables now exist
-            updated_body = ""
-            all_complete = True
-
-            for line in body.split('\n'):
-                if '- [ ]' in line and '`' in line:
-                    # Extract file path
-                    match = re.search(r'`([^`]+)`', line)
-                    if match:
-                        file_path = match.group(1).strip()
-                        full_path = PROJECT_ROOT / file_path
-
-                        # Check if file exists
-                        if full_path.exists():
-                            # Mark as complete
-                            updated_body += line.replace('- [ ]', '- [x]') + '\n'
-                        else:
-                            # Still incomplete
-                            updated_body += line + '\n'
-                            all_complete = False
-                    else:
-                        updated_body += line + '\n'
-                else:
-                    updated_body += line + '\n'
-
-            # Update the issue body with checked boxes
-            subprocess.run(
-                ["gh", "issue", "edit", str(task.github_issue), "--body", updated_body],
-                capture_output=True
-            )
+        with self.progress_lock:
+            self.active_processes[task.id] = process
+        try:
+            process.wait(timeout=600)  # 10 minute timeout to prevent hanging
+        except BaseException:
+            # Timeout or Ctrl+C: never leave aider editing files behind our back
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+            raise
+        finally:
+            for reader in readers:
+                reader.join(timeout=5)
+            with self.progress_lock:
+                self.active_processes.pop(task.id, None)
+
+        if self.stopping.is_set():
+            raise TaskInterrupted(task.id)
+        return subprocess.CompletedProcess(aider_cmd, process.returncode, log.tail("out"), log.tail("err"))
+
+    def run_ollama(self, task: Task, prompt: str, task_files: List[str],
+                   workdir: Path) -> subprocess.CompletedProcess:
+        """Generate the task with the native Ollama client and commit its edits
+
+        Mirrors run_aider: failures come back as a non-zero returncode with the
+        reason in stderr, so they are reported and classified the same way.
+        """
+        args = ["ollama", task.model]
+        if self.stopping.is_set():
+            raise TaskInterrupted(task.id)
+        # The plan is part of the cached system prompt, so it is not resent per task
+        files = [f for f in task_files if f != DEV_PLAN.name]
+        log = self.task_logs[task.id]
+        try:
+            result = run_task(self.ollama, task.model, TASK_RULES, prompt, files, workdir,
+                              should_stop=self.stopping.is_set,
+                              on_token=lambda token: log.write_text("out", token))
+        except TimeoutError:
+            raise subprocess.TimeoutExpired(args, self.ollama.timeout)
+        except (OllamaError, PatchError, OSError) as e:
+            log.write_text("err", f"{e}\n")
+            return subprocess.CompletedProcess(args, 1, "", str(e))
+
+        if result["stopped"]:
+            raise TaskInterrupted(task.id)
+
+        self.metrics.record_generation(task.id, task.model, result)
+        print(f"⏱️  Prompt eval: {result['prompt_tokens']} tokens in {result['prompt_seconds']:.1f}s, "
+              f"output: {result['eval_tokens']} tokens in {result['eval_seconds']:.1f}s")
+
+        subprocess.run(["git", "add", "--", *result["changed"]], cwd=workdir, capture_output=True)
+        commit = subprocess.run(
+            ["git", "commit", "-m", f"{task.id}: {task.title}"],
+            cwd=workdir, capture_output=True, text=True
+        )
+        if commit.returncode != 0:
+            return subprocess.CompletedProcess(args, 1, commit.stdout, commit.stderr)
+        return subprocess.CompletedProcess(args, 0, f"Edited {', '.join(result['changed'])}", "")
+
+    def shutdown(self):
+        """Stop in-flight tasks; each one checkpoints itself as it unwinds"""
+        self.stopping.set()
+        with self.progress_lock:
+            processes = list(self.active_processes.values())
+        for process in processes:
+            process.terminate()
+
+    def record_task_commits(self, task: Task, base_commit: Optional[str], cwd: Path = PROJECT_ROOT):
+        """Remember which commits a task produced (used by auto-bisect to name culprits)"""
+        if not base_commit:
+            return
 
-            # Add comment (issue will be closed by caller to prevent re-processing)
-            if all_complete:
-                comment = "✅ **All Deliverables Completed**\n\nAll missing files have been created and verified."
-                subprocess.run(
-                    ["gh", "issue", "comment", str(task.github_issue), "--body", comment],
-                    capture_output=True
-                )
-                print(f"✅ All deliverables complete for GitHub issue #{task.github_issue}")
-            else:
-                comment = "🔄 **Progress Update**\n\nSome deliverables have been completed. Updated checkboxes above. Issue will be closed to prevent re-processing - remaining items should be caught by validation."
-                subprocess.run(
-                    ["gh", "issue", "comment", str(task.github_issue), "--body", comment],
-                    capture_output=True
-                )
-                print(f"📝 Partial progress on GitHub issue #{task.github_issue}")
+        result = subprocess.run(
+            ["git", "rev-list", f"{base_commit}..HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=cwd
+        )
+        if result.returncode != 0:
+            return
 
-        except Exception as e:
-            print(f"⚠️  Error updating GitHub issue checkboxes: {e}")
+        with self.progress_lock:
+            task_commits = self.progress.setdefault("task_commits", {})
+            for commit in result.stdout.split():
+                task_commits[commit] = task.id
 
     def verify_task_deliverables(self, task: Task) -> bool:
         """Verify that expected files for a task actually exist"""
@@ -771,6 +1006,46 @@ Folder structure:
 
         return True
 
+    def prefetch_stage_assets(self, stage: int):
+        """Fetch models for this stage and the next in the background, once per stage
+
+        A stage is recorded as prefetched only when the fetch exits cleanly, i.e.
+        every model was fetched or cached as unavailable; otherwise it is tried
+        again on a later call.
+        """
+        if not os.environ.get("POLY_PIZZA_TOKEN"):
+            return
+
+        done = self.progress.setdefault("asset_prefetch_stages", [])
+        if self.asset_prefetch:
+            process, fetching = self.asset_prefetch
+            if process.poll() is None:
+                return
+            self.asset_prefetch = None
+            if process.returncode == 0:
+                done.extend(s for s in fetching if s not in done)
+                self.save_progress()
+            else:
+                print(f"⚠️  Asset prefetch for stage(s) {fetching} incomplete "
+                      f"(see {ASSET_PREFETCH_LOG.name}); will retry")
+
+        stages = [s for s in (stage, stage + 1) if s <= 12 and s not in done]
+        if not stages:
+            return
+
+        print(f"📦 Prefetching assets for stage(s) {stages} in the background")
+        with open(ASSET_PREFETCH_LOG, "a") as log:
+            process = subprocess.Popen(
+                [sys.executable, str(Path(__file__).parent / "fetch_asset.py"),
+                 "--stage", ",".join(str(s) for s in stages)],
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                cwd=PROJECT_ROOT,
+                start_new_session=True
+            )
+        self.asset_prefetch = (process, stages)
+
     def display_progress_summary(self):
         """Display a summary of current progress"""
         print(f"\n{'='*80}")
@@ -782,18 +1057,9 @@ Folder structure:
         print(f"GitHub Issues Created: {len(self.progress.get('github_issues', {}))}")
 
         # Check for urgent backlog issues
-        try:
-            result = subprocess.run(
-                ["gh", "issue", "list", "--label", "urgent", "--state", "open", "--json", "number"],
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                urgent_issues = json.loads(result.stdout)
-                if urgent_issues:
-                    print(f"\n⚠️  URGENT BACKLOG: {len(urgent_issues)} open issues requiring attention")
-        except:
-            pass
+        urgent_count = issue_counts("urgent_open")["urgent_open"]
+        if urgent_count:
+            print(f"\n⚠️  URGENT BACKLOG: {urgent_count} open issues requiring attention")
 
         # Show recent completions
         recent = self.progress.get("completed_tasks", [])[-5:]
@@ -811,14 +1077,17 @@ Folder structure:
 
         print(f"{'='*80}\n")
 
-    def run_stage(self, max_tasks: int = 5, continuous: bool = False):
+    def run_stage(self, max_tasks: int = 5, continuous: bool = False, max_parallel: int = 1):
         """Run tasks for current stage
 
         Args:
             max_tasks: Maximum tasks to run per iteration
             continuous: If True, keep running until all stages complete
+            max_parallel: Independent tasks to run at once (each in its own worktree)
         """
         iteration = 0
+        # Sends GitHub updates in the background, starting with any an earlier run left queued
+        self.github.start()
 
         while True:
             iteration += 1
@@ -836,6 +1105,7 @@ Folder structure:
 
             # PRIORITY 2: Get new tasks from development plan
             plan_tasks = self.parse_development_plan()
+            self.prefetch_stage_assets(self.current_stage)
 
             # Sort urgent tasks by stage number (ascending) to ensure proper order
             # Stage 1 must be completed before Stage 4, etc.
@@ -896,28 +1166,62 @@ Folder structure:
 
             print(f"⏳ Pending tasks: {len(pending_tasks)}")
 
-            # Execute up to max_tasks
-            executed = 0
-            failed_count = 0
-
-            for task in pending_tasks[:max_tasks]:
-                success = self.execute_task_with_aider(task)
-                executed += 1
-
-                if not success:
-                    failed_count += 1
-                    print(f"⚠️  Task {task.id} failed. Continuing with next task...")
-                    self.progress["failed_tasks"].append(task.id)
-                    self.save_progress()
-
-                    # If too many failures in a row, stop
-                    if failed_count >= 3:
-                        print(f"❌ Too many failures ({failed_count}). Stopping for review.")
-                        print(f"💡 Check failed tasks in GitHub issues or .ai_progress.json")
-                        return
+            # Another orchestrator (e.g. a second tmux session) may be running some
+            pending_tasks = [t for t in pending_tasks if not self.leases.held_elsewhere(t.id)]
+            # Failed tasks wait out their backoff, and run on the model they were escalated to
+            waiting = [t for t in pending_tasks if not self.retries.due(t.id)]
+            pending_tasks = [t for t in pending_tasks if self.retries.due(t.id)]
+            for task in pending_tasks:
+                self.retries.apply(task)
+            if waiting:
+                print(f"🔁 Backing off before retrying: {', '.join(t.id for t in waiting)}")
+            if not pending_tasks:
+                if not continuous:
+                    print("💤 Every pending task is backing off. Run again later.")
+                    return
+                time.sleep(min(max(5, self.retries.next_due() - time.time()), 60))
+                continue
 
-                # Small delay between tasks
-                time.sleep(2)
+            resumable = self.leases.resumable()
+            if resumable:
+                print(f"♻️  Interrupted tasks to resume:\n{format_resumable(resumable)}")
+
+            # Execute up to max_tasks, in dependency / critical-path order
+            scheduler = TaskScheduler(self, pending_tasks, max_parallel=max_parallel,
+                                      resume={lease["task_id"] for lease in resumable}, remote=self.remote)
+
+            def on_result(task: Task, success: bool, seconds: float) -> bool:
+                """Returns True when a failed task will be retried"""
+                self.metrics.record_task(task.id, task.stage, task.model, success, seconds)
+                if success:
+                    return False
+
+                failure = self.task_failures.pop(task.id, Failure("aider"))
+                with self.progress_lock:
+                    decision = self.retries.on_failure(task, failure)
+                    if decision.action == "give_up":
+                        self.progress["failed_tasks"].append(task.id)
+                self.save_progress()
+                run_id = self.log_runs.pop(task.id, None)
+                if run_id:
+                    self.log_index.set_outcome(run_id, f"{decision.action} ({decision.kind})")
+
+                if decision.action == "give_up":
+                    print(f"⚠️  Task {task.id} failed: {decision.describe()}. Continuing with next task...")
+                    return False
+                print(f"🔁 Task {task.id}: {decision.describe()}")
+                self.update_github_issue(task, "retrying", decision.describe())
+                return True
+
+            outcome = scheduler.run(max_tasks, on_result)
+            executed = len(outcome["done"]) + len(outcome["failed"])
+            failed_count = len(outcome["failed"])
+
+            if failed_count >= MAX_FAILURES:
+                print(f"💡 Check failed tasks in GitHub issues or .ai_progress.json")
+                return
+            if outcome["deferred"]:
+                print(f"⏸️  Waiting for prerequisites, retries or re-integration: {', '.join(sorted(outcome['deferred']))}")
 
             print(f"\n✅ Iteration {iteration} complete: {executed - failed_count} succeeded, {failed_count} failed")
             print(f"📊 Total progress: {len(self.progress['completed_tasks'])} tasks completed")
@@ -928,17 +1232,35 @@ Folder structure:
                 return
 
             # In continuous mode, check if there are more pending tasks
-            if not pending_tasks[max_tasks:]:
+            if executed >= len(pending_tasks):
                 print(f"\n✨ All pending tasks in stage {self.current_stage} completed!")
                 print(f"🔄 Moving to next stage...")
                 time.sleep(5)  # Brief pause before next stage
 
 def main():
-    orchestrator = AgentOrchestrator()
-
     # Parse command line arguments
     max_tasks = 5
     continuous = False
+    max_parallel = None
+    distributed = None
+
+    backend = BACKEND
+    if "--backend" in sys.argv:
+        index = sys.argv.index("--backend")
+        backend = sys.argv[index + 1]
+        del sys.argv[index:index + 2]
+
+    if "--parallel" in sys.argv or "-j" in sys.argv:
+        index = sys.argv.index("--parallel" if "--parallel" in sys.argv else "-j")
+        max_parallel = int(sys.argv[index + 1])
+        del sys.argv[index:index + 2]
+
+    if "--distributed" in sys.argv:
+        index = sys.argv.index("--distributed")
+        distributed = parse_address(sys.argv[index + 1])
+        del sys.argv[index:index + 2]
+    if max_parallel is None:
+        max_parallel = DISTRIBUTED_PARALLEL if distributed else 1
 
     if len(sys.argv) > 1:
         if sys.argv[1] == "--continuous" or sys.argv[1] == "-c":
@@ -953,6 +1275,12 @@ Usage:
 
 Options:
     -c, --continuous    Run continuously until all stages complete
+    -j, --parallel N    Run up to N independent tasks at once in git worktrees
+    --backend NAME      aider (default) or ollama: call the Ollama API directly
+                        (also AI_BACKEND; server from OLLAMA_HOST)
+    --distributed [HOST:]PORT
+                        Run tasks on workers (worker_daemon.py) that connect
+                        to this address instead of locally (default -j 8)
     -h, --help         Show this help message
 
 Arguments:
@@ -971,6 +1299,12 @@ Examples:
     # Run continuously with 3 tasks per iteration
     python3 agent_orchestrator.py --continuous 3
 
+    # Run 6 tasks, up to 2 at a time where they don't touch the same files
+    python3 agent_orchestrator.py -j 2 6
+
+    # Hand tasks to workers on other machines (they run worker_daemon.py HOST:7821)
+    python3 agent_orchestrator.py --distributed 0.0.0.0:7821 --continuous
+
 Resume:
     Progress is automatically saved to .ai_progress.json
     Just run the script again to resume where it left off.
@@ -979,18 +1313,47 @@ Resume:
         else:
             max_tasks = int(sys.argv[1])
 
+    orchestrator = AgentOrchestrator(backend)
+    if distributed:
+        try:
+            orchestrator.remote = Coordinator(orchestrator, distributed)
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        orchestrator.remote.start()
+
     print(f"🚀 Starting orchestrator...")
     print(f"   Max tasks per iteration: {max_tasks}")
     print(f"   Continuous mode: {'ON' if continuous else 'OFF'}")
+    print(f"   Parallel tasks: {max_parallel}")
+    print(f"   Backend: {backend}")
     print(f"   Press Ctrl+C to stop gracefully\n")
 
+    # `kill` / closing the tmux pane shut down like Ctrl+C does
+    def raise_interrupt(signum, frame):
+        raise KeyboardInterrupt
+    signal.signal(signal.SIGTERM, raise_interrupt)
+    signal.signal(signal.SIGHUP, raise_interrupt)
+
     try:
-        orchestrator.run_stage(max_tasks=max_tasks, continuous=continuous)
+        orchestrator.run_stage(max_tasks=max_tasks, continuous=continuous, max_parallel=max_parallel)
     except KeyboardInterrupt:
+        # Ignore repeated signals while in-flight tasks checkpoint
+        for signum in (signal.SIGINT, signal.SIGTERM, signal.SIGHUP):
+            signal.signal(signum, signal.SIG_IGN)
         print("\n\n⏸️  Interrupted by user")
+        orchestrator.shutdown()
+        orchestrator.save_progress()
+        orchestrator.leases.stop()
         print("💾 Progress saved to .ai_progress.json")
+        interrupted = [lease for lease in orchestrator.leases.resumable() if lease.get("state") == "interrupted"]
+        if interrupted:
+            print(f"💾 In-flight work checkpointed:\n{format_resumable(interrupted)}")
         print("🔄 Run again to resume where you left off")
-        orchestrator.save_progress()
+    finally:
+        if orchestrator.remote:
+            orchestrator.remote.stop()
+        orchestrator.github.close()
 
 if __name__ == "__main__":
     main()
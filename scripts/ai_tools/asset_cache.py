@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Asset Cache - Content-addressed store for downloaded models
+Objects are keyed by SHA-256 and shared by every worktree on the machine; a
+manifest maps query -> asset ID -> hash -> project paths, and search responses
+(and queries with no usable model) are cached with a TTL
+"""
+
+import fcntl  # For file locking
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Optional
+
+# Shared by all worktrees/checkouts; override with AI_ASSET_CACHE
+CACHE_DIR = Path(os.environ.get(
+    "AI_ASSET_CACHE",
+    Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "the-unknown" / "assets"
+))
+
+# Seconds a cached search response is reused
+SEARCH_TTL = 7 * 24 * 3600
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def normalize_query(query: str) -> str:
+    return ' '.join(query.lower().split())
+
+
+def sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def asset_id(asset: dict) -> str:
+    """Stable ID of a search result (falls back to the download URL)"""
+    return str(asset.get("ID") or asset.get("Id") or asset["DownloadURL"])
+
+
+class AssetCache:
+    def __init__(self, root: Path = CACHE_DIR):
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.search_dir = self.root / "search"
+        self.tmp_dir = self.root / "tmp"
+        self.manifest_path = self.root / "manifest.json"
+        for directory in (self.objects_dir, self.search_dir, self.tmp_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+
+    # Manifest
+
+    @contextmanager
+    def _locked_manifest(self):
+        """Read-modify-write the manifest under an exclusive lock"""
+        with open(self.root / ".lock", "w") as lock:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            manifest = self.load_manifest()
+            yield manifest
+            temp_file = self.manifest_path.with_suffix(f".json.{os.getpid()}.tmp")
+            with open(temp_file, "w") as f:
+                json.dump(manifest, f, indent=2)
+            temp_file.replace(self.manifest_path)
+
+    def load_manifest(self) -> dict:
+        manifest = {"queries": {}, "assets": {}, "paths": {}, "unavailable": {}}
+        if self.manifest_path.exists():
+            try:
+                with open(self.manifest_path) as f:
+                    manifest.update(json.load(f))
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"⚠️  Error loading asset manifest: {e}")
+        return manifest
+
+    # Search cache
+
+    def _search_path(self, query: str) -> Path:
+        key = hashlib.sha1(normalize_query(query).encode()).hexdigest()
+        return self.search_dir / f"{key}.json"
+
+    def get_search(self, query: str, ttl: float = SEARCH_TTL) -> Optional[List[dict]]:
+        path = self._search_path(query)
+        try:
+            with open(path) as f:
+                cached = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if time.time() - cached["time"] > ttl:
+            return None
+        return cached["results"]
+
+    def put_search(self, query: str, results: List[dict]):
+        path = self._search_path(query)
+        temp_file = path.with_suffix(f".json.{os.getpid()}.tmp")
+        with open(temp_file, "w") as f:
+            json.dump({"query": query, "time": time.time(), "results": results}, f)
+        temp_file.replace(path)
+
+    # Objects
+
+    def object_path(self, sha: str) -> Path:
+        return self.objects_dir / sha[:2] / f"{sha}.glb"
+
+    def lookup_query(self, query: str) -> Optional[dict]:
+        """Cached asset record for a query whose object is still in the store"""
+        manifest = self.load_manifest()
+        entry = manifest["queries"].get(normalize_query(query))
+        if not entry:
+            return None
+        return self.lookup_asset(entry["asset_id"], manifest)
+
+    def lookup_asset(self, asset_key: str, manifest: Optional[dict] = None) -> Optional[dict]:
+        manifest = manifest or self.load_manifest()
+        record = manifest["assets"].get(asset_key)
+        if record and self.object_path(record["sha256"]).exists():
+            return record
+        return None
+
+    def temp_path(self, asset_key: str) -> Path:
+        """Download location inside the store (same filesystem as objects/)"""
+        return self.tmp_dir / (hashlib.sha1(asset_key.encode()).hexdigest() + ".glb")
+
+    @contextmanager
+    def asset_lock(self, asset_key: str):
+        """Held while one process/thread downloads an asset"""
+        with open(self.temp_path(asset_key).with_suffix(".lock"), "w") as lock:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            yield
+
+    def add(self, downloaded: Path, asset: dict, query: Optional[str] = None) -> dict:
+        """Move a finished download into the store and record it"""
+        sha = sha256_file(downloaded)
+        target = self.object_path(sha)
+        if target.exists():
+            downloaded.unlink()
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(downloaded, target)
+            # Objects are shared through hardlinks; keep them immutable
+            os.chmod(target, 0o444)
+
+        key = asset_id(asset)
+        record = {
+            "asset_id": key,
+            "title": asset.get("Title", ""),
+            "url": asset.get("DownloadURL"),
+            "sha256": sha,
+            "size": target.stat().st_size,
+        }
+        with self._locked_manifest() as manifest:
+            manifest["assets"][key] = record
+            if query:
+                self._record_query(manifest, query, key)
+        return record
+
+    def _record_query(self, manifest: dict, query: str, key: str):
+        manifest["queries"][normalize_query(query)] = {"asset_id": key, "time": time.time()}
+        manifest["unavailable"].pop(normalize_query(query), None)
+
+    def record_query(self, query: str, key: str):
+        with self._locked_manifest() as manifest:
+            self._record_query(manifest, query, key)
+
+    def mark_unavailable(self, query: str):
+        """Remember that no search result for `query` was usable"""
+        with self._locked_manifest() as manifest:
+            manifest["unavailable"][normalize_query(query)] = time.time()
+
+    def is_unavailable(self, query: str, ttl: float = SEARCH_TTL) -> bool:
+        marked = self.load_manifest()["unavailable"].get(normalize_query(query))
+        return marked is not None and time.time() - marked <= ttl
+
+    def materialize(self, record: dict, dest: Path) -> Path:
+        """Place the object at `dest` (hardlink, or copy across filesystems)
+
+        An existing file with different content is never overwritten: the hash
+        is appended to the name instead. Returns the path actually used.
+        """
+        source = self.object_path(record["sha256"])
+        dest = Path(dest)
+        if dest.exists():
+            if dest.stat().st_ino == source.stat().st_ino or sha256_file(dest) == record["sha256"]:
+                self._record_path(record, dest)
+                return dest
+            dest = dest.with_name(f"{dest.stem}_{record['sha256'][:8]}{dest.suffix}")
+            if dest.exists():
+                self._record_path(record, dest)
+                return dest
+
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(source, dest)
+        except FileExistsError:
+            # Another thread or worktree placed a file there since the check
+            return self.materialize(record, dest)
+        except OSError:
+            shutil.copyfile(source, dest)
+        self._record_path(record, dest)
+        return dest
+
+    def _record_path(self, record: dict, dest: Path):
+        with self._locked_manifest() as manifest:
+            paths = manifest["paths"].setdefault(record["sha256"], [])
+            if str(dest.resolve()) not in paths:
+                paths.append(str(dest.resolve()))
+
+    def prune_search(self, ttl: float = SEARCH_TTL) -> int:
+        """Delete expired search responses"""
+        removed = 0
+        for path in self.search_dir.glob("*.json"):
+            if time.time() - path.stat().st_mtime > ttl:
+                path.unlink()
+                removed += 1
+        return removed
+
+
+def main():
+    cache = AssetCache()
+    if "--prune" in sys.argv:
+        print(f"🧹 Removed {cache.prune_search()} expired search response(s)")
+
+    manifest = cache.load_manifest()
+    objects = list(cache.objects_dir.glob("*/*.glb"))
+    size = sum(p.stat().st_size for p in objects)
+    print(f"📦 Asset cache: {cache.root}")
+    print(f"   Objects: {len(objects)} ({size / 1024 / 1024:.1f} MiB)")
+    print(f"   Assets: {len(manifest['assets'])}, queries: {len(manifest['queries'])}")
+    for query, entry in sorted(manifest["queries"].items()):
+        record = manifest["assets"].get(entry["asset_id"], {})
+        print(f"   {query:<30} → {record.get('title', '?')} ({record.get('sha256', '?')[:12]})")
+
+
+if __name__ == "__main__":
+    main()
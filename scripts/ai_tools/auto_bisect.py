@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Auto Bisect - Finds the commit (and agent task) that broke the build
+Checks several candidate commits at once in separate git worktrees, so each
+round narrows the range k-ways instead of halving it. A commit counts as bad
+only for broken references or Godot errors the good commit did not have
+"""
+
+import json
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from dependency_graph import DependencyGraph, format_broken_references
+from godot_diagnostics import Diagnostic, errors, format_diagnostics, parse_output, run_godot_check
+from validation_log import ValidationLog
+
+GODOT_PATH = "/Applications/Godot.app/Contents/MacOS/Godot"
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+PROGRESS_FILE = PROJECT_ROOT / ".ai_progress.json"
+
+# Candidate commits checked concurrently per round
+DEFAULT_PARALLEL = 4
+# Headless checks in a fresh worktree include the initial import
+CHECK_TIMEOUT = 300
+
+TASK_ID_RE = re.compile(r'\b(S\d+T[\w-]+|GH\d+)\b')
+
+
+@dataclass
+class BisectResult:
+    good: str
+    bad: str
+    culprit: Optional[str] = None
+    task_id: Optional[str] = None
+    subject: str = ""
+    rounds: int = 0
+    checked: Dict[str, bool] = field(default_factory=dict)
+    error_output: str = ""
+
+
+def git(*args: str, cwd: Path = PROJECT_ROOT) -> subprocess.CompletedProcess:
+    return subprocess.run(["git", *args], capture_output=True, text=True, cwd=cwd)
+
+
+class AutoBisector:
+    def __init__(self, parallel: int = DEFAULT_PARALLEL, godot_path: str = GODOT_PATH):
+        self.parallel = max(1, parallel)
+        self.godot_path = godot_path
+        self.workspace = Path(tempfile.mkdtemp(prefix="ai-bisect-"))
+        # `git worktree add` takes repository-wide locks; create them one at a time
+        self._worktree_lock = threading.Lock()
+        self.errors: Dict[str, str] = {}
+        # Problems already present at the known-good commit; probes are judged on new ones only
+        self.baseline: Set[str] = set()
+
+    def commits_between(self, good: str, bad: str) -> List[str]:
+        """Commits after `good` up to and including `bad`, oldest first"""
+        result = git("rev-list", "--ancestry-path", "--reverse", f"{good}..{bad}")
+        if result.returncode != 0:
+            raise RuntimeError(f"git rev-list failed: {result.stderr.strip()}")
+        return [line for line in result.stdout.split('\n') if line]
+
+    def problems(self, commit: str, ignore: Optional[Set[str]] = None) -> Dict[str, Diagnostic]:
+        """Broken references and Godot errors at one commit, checked in its own
+        detached worktree and keyed by Diagnostic.key()
+
+        Godot is not launched when there are broken references outside `ignore`.
+        """
+        worktree = self.workspace / commit[:12]
+
+        with self._worktree_lock:
+            added = git("worktree", "add", "--detach", "--force", str(worktree), commit)
+        if added.returncode != 0:
+            raise RuntimeError(f"Could not create worktree for {commit[:12]}: {added.stderr.strip()}")
+
+        try:
+            # Static reference check first: no Godot launch needed to catch these
+            graph = DependencyGraph(root=worktree, cache_file=worktree / ".ai_dep_graph.json")
+            graph.refresh()
+            found = {d.key(): d for d in parse_output(format_broken_references(graph.broken_references()))}
+            if ignore is not None and set(found) - ignore:
+                return found
+
+            try:
+                returncode, diagnostics, _, _ = run_godot_check(
+                    [self.godot_path, "--headless", "--path", str(worktree), "--check-only", "--quit"],
+                    timeout=CHECK_TIMEOUT
+                )
+            except subprocess.TimeoutExpired:
+                timeout = Diagnostic("error", "timeout", f"Godot check timed out after {CHECK_TIMEOUT}s")
+                found[timeout.key()] = timeout
+                return found
+
+            if returncode != 0:
+                found.update((d.key(), d) for d in errors(diagnostics))
+            return found
+        finally:
+            with self._worktree_lock:
+                git("worktree", "remove", "--force", str(worktree))
+
+    def check_commit(self, commit: str) -> bool:
+        """A commit is bad if it has problems the good end of the range did not have"""
+        new = [d for key, d in self.problems(commit, self.baseline).items() if key not in self.baseline]
+        if new:
+            self.errors[commit] = format_diagnostics(new)
+            return False
+        return True
+
+    def pick_probes(self, lo: int, hi: int) -> List[int]:
+        """Evenly spaced indexes strictly between lo (good) and hi (bad)"""
+        span = hi - lo - 1
+        count = min(self.parallel, span)
+        return sorted({lo + 1 + (span * (i + 1)) // (count + 1) for i in range(count)})
+
+    def bisect(self, good: str, bad: str) -> BisectResult:
+        """k-ary search for the first bad commit between a good and a bad commit"""
+        result = BisectResult(good=good, bad=bad)
+        commits = self.commits_between(good, bad)
+        if not commits:
+            raise RuntimeError(f"{bad[:12]} is not a descendant of {good[:12]}")
+
+        # Invariant: commits[lo] is good (lo == -1 means `good` itself), commits[hi] is bad
+        lo, hi = -1, len(commits) - 1
+        print(f"🔎 Bisecting {len(commits)} commits with {self.parallel} parallel checks")
+
+        try:
+            self.baseline = set(self.problems(good))
+            if self.baseline:
+                print(f"   {good[:12]} already has {len(self.baseline)} problem(s); only new ones count")
+            with ThreadPoolExecutor(max_workers=self.parallel) as pool:
+                while hi - lo > 1:
+                    result.rounds += 1
+                    probes = self.pick_probes(lo, hi)
+                    outcomes = dict(zip(probes, pool.map(lambda i: self.check_commit(commits[i]), probes)))
+
+                    for index, ok in sorted(outcomes.items()):
+                        result.checked[commits[index]] = ok
+                        print(f"   Round {result.rounds}: {commits[index][:12]} {'✅ good' if ok else '❌ bad'}")
+
+                    bad_probes = [i for i, ok in outcomes.items() if not ok]
+                    if bad_probes:
+                        hi = min(bad_probes)
+                    good_probes = [i for i, ok in outcomes.items() if ok and i < hi]
+                    if good_probes:
+                        lo = max(good_probes)
+        finally:
+            shutil.rmtree(self.workspace, ignore_errors=True)
+            git("worktree", "prune")
+
+        result.culprit = commits[hi]
+        result.subject = git("log", "-1", "--format=%s", result.culprit).stdout.strip()
+        result.task_id = self.find_task_id(result.culprit, result.subject)
+        result.error_output = self.errors.get(result.culprit, "")
+        return result
+
+    def find_task_id(self, commit: str, subject: str) -> Optional[str]:
+        """Map a commit back to the orchestrator task that produced it"""
+        if PROGRESS_FILE.exists():
+            try:
+                with open(PROGRESS_FILE) as f:
+                    task_commits = json.load(f).get("task_commits", {})
+                if commit in task_commits:
+                    return task_commits[commit]
+            except Exception:
+                pass
+
+        match = TASK_ID_RE.search(subject)
+        return match.group(1) if match else None
+
+
+def format_bisect_result(result: BisectResult) -> str:
+    """Markdown summary suitable for an issue comment"""
+    lines = [
+        "🔎 **Auto-bisect result**",
+        "",
+        f"**Breaking commit:** `{result.culprit}` - {result.subject}",
+        f"**Task:** {result.task_id or 'unknown'}",
+        f"**Range:** `{result.good[:12]}`..`{result.bad[:12]}` "
+        f"({len(result.checked)} commits checked in {result.rounds} rounds)",
+    ]
+    if result.error_output:
+        lines += ["", result.error_output.strip()[:3000]]
+    return '\n'.join(lines)
+
+
+def bisect_from_log(parallel: int = DEFAULT_PARALLEL) -> Optional[BisectResult]:
+    """Bisect between the last good and first bad commits recorded by the validator"""
+    log = ValidationLog()
+    good = log.summary.get("last_good_commit")
+    bad = log.summary.get("first_bad_commit")
+
+    if not good or not bad:
+        print("ℹ️  Validation log has no good → bad transition to bisect")
+        return None
+
+    result = AutoBisector(parallel).bisect(good, bad)
+    log.record_event("bisect", {
+        "timestamp": datetime.now().isoformat(),
+        "good": result.good,
+        "bad": result.bad,
+        "culprit": result.culprit,
+        "task_id": result.task_id,
+        "rounds": result.rounds,
+    })
+    return result
+
+
+def main():
+    parallel = DEFAULT_PARALLEL
+    args = sys.argv[1:]
+    if "-j" in args:
+        index = args.index("-j")
+        parallel = int(args[index + 1])
+        del args[index:index + 2]
+
+    if len(args) >= 2:
+        result = AutoBisector(parallel).bisect(args[0], args[1])
+    else:
+        result = bisect_from_log(parallel)
+
+    if result:
+        print()
+        print(format_bisect_result(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Dependency Graph - Tracks which scenes, resources and scripts reference each other
+Lets verification check only what a change actually affects and report broken
+references without launching Godot
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DEP_GRAPH_FILE = PROJECT_ROOT / ".ai_dep_graph.json"
+GRAPH_VERSION = 1
+
+# Directories (relative to the project root) that make up the graph
+GRAPH_ROOTS = ["scenes", "scripts", "assets", "materials"]
+# Loose files at the project root that also reference resources
+GRAPH_FILES = ["project.godot"]
+# File types that are parsed for outgoing references
+PARSED_SUFFIXES = {".tscn", ".tres", ".gd", ".gdshader", ".godot"}
+# File types Godot actually loads and checks (anything else is a leaf asset)
+CHECKED_SUFFIXES = {".tscn", ".tres", ".gd", ".gdshader"}
+SKIP_DIRS = {".godot", ".git", "__pycache__", ".import"}
+
+EXT_RESOURCE_RE = re.compile(r'^\[ext_resource\b(?P<attrs>[^\]]*)\]', re.MULTILINE)
+ATTR_RE = re.compile(r'(\w+)\s*=\s*"([^"]*)"')
+HEADER_UID_RE = re.compile(r'^\[gd_(?:scene|resource)\b[^\]]*\buid="(uid://[^"]+)"', re.MULTILINE)
+RES_STRING_RE = re.compile(r'"(res://[^"]+)"')
+SHADER_INCLUDE_RE = re.compile(r'^\s*#include\s+"([^"]+)"', re.MULTILINE)
+
+
+def res_to_rel(res_path: str, referrer: str = "") -> Optional[str]:
+    """Convert a res:// (or referrer-relative) path to a project-relative path"""
+    if res_path.startswith("uid://"):
+        return None
+    if res_path.startswith("res://"):
+        return res_path[len("res://"):].lstrip("/")
+    # Relative references are resolved against the referring file's directory
+    base = os.path.dirname(referrer)
+    return os.path.normpath(os.path.join(base, res_path))
+
+
+def changed_files(base: Optional[str], head: str = "HEAD", cwd: Path = PROJECT_ROOT) -> List[str]:
+    """List files changed between two commits (or by the head commit alone)"""
+    if base:
+        cmd = ["git", "diff", "--name-only", f"{base}..{head}"]
+    else:
+        cmd = ["git", "diff-tree", "--no-commit-id", "--name-only", "-r", "--root", head]
+
+    result = subprocess.run(cmd, capture_output=True, text=True, cwd=cwd)
+    if result.returncode != 0:
+        return []
+    return [line for line in result.stdout.split('\n') if line]
+
+
+def uncommitted_files(cwd: Path = PROJECT_ROOT) -> List[str]:
+    """Tracked files with uncommitted edits plus untracked (not ignored) files,
+    leaving out the tools' own state files"""
+    pathspec = ["--", ".", ":(exclude).ai_*", ":(exclude).validation_log", ":(exclude).godot"]
+    files = []
+    for cmd in (["git", "diff", "--name-only", "HEAD"], ["git", "ls-files", "--others", "--exclude-standard"]):
+        result = subprocess.run(cmd + pathspec, capture_output=True, text=True, cwd=cwd)
+        if result.returncode == 0:
+            files.extend(line for line in result.stdout.split('\n') if line)
+    return files
+
+
+def in_graph(rel: str) -> bool:
+    """Whether a project-relative path belongs to the tracked part of the tree"""
+    return rel in GRAPH_FILES or rel.split("/", 1)[0] in GRAPH_ROOTS
+
+
+def is_checked_file(rel: str) -> bool:
+    """Whether Godot loads this file as a scene, resource, script or shader"""
+    return rel in GRAPH_FILES or Path(rel).suffix in CHECKED_SUFFIXES
+
+
+class DependencyGraph:
+    def __init__(self, root: Path = PROJECT_ROOT, cache_file: Path = DEP_GRAPH_FILE):
+        self.root = Path(root)
+        self.cache_file = Path(cache_file)
+        # {rel_path: {"mtime": int, "size": int, "deps": [rel], "uid": str|None}}
+        self.files: Dict[str, dict] = {}
+        self._dependents: Optional[Dict[str, Set[str]]] = None
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        """Load the persisted graph (a missing or stale cache just means a full scan)"""
+        if not self.cache_file.exists():
+            return
+        try:
+            with open(self.cache_file) as f:
+                data = json.load(f)
+            if data.get("version") == GRAPH_VERSION:
+                self.files = data.get("files", {})
+        except Exception as e:
+            print(f"⚠️  Error loading dependency graph (will rebuild): {e}")
+            self.files = {}
+
+    def save(self):
+        """Persist the graph with an atomic rename"""
+        if not self.dirty:
+            return
+        temp_file = self.cache_file.with_suffix('.json.tmp')
+        with open(temp_file, 'w') as f:
+            json.dump({"version": GRAPH_VERSION, "files": self.files}, f)
+        temp_file.replace(self.cache_file)
+        self.dirty = False
+
+    def iter_project_files(self) -> Iterable[str]:
+        """Yield every tracked file relative to the project root"""
+        for name in GRAPH_FILES:
+            if (self.root / name).is_file():
+                yield name
+
+        for top in GRAPH_ROOTS:
+            stack = [self.root / top]
+            while stack:
+                directory = stack.pop()
+                try:
+                    entries = list(os.scandir(directory))
+                except OSError:
+                    continue
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS:
+                            stack.append(Path(entry.path))
+                    elif entry.is_file() and not entry.name.endswith(('.import', '.uid')):
+                        yield Path(entry.path).relative_to(self.root).as_posix()
+
+    def parse_references(self, rel: str, text: str) -> dict:
+        """Extract outgoing references and the file's own uid"""
+        deps: Set[str] = set()
+        uid_refs: Set[str] = set()
+        own_uid = None
+        suffix = Path(rel).suffix
+
+        if suffix in (".tscn", ".tres"):
+            header = HEADER_UID_RE.search(text)
+            own_uid = header.group(1) if header else None
+            for match in EXT_RESOURCE_RE.finditer(text):
+                attrs = dict(ATTR_RE.findall(match.group("attrs")))
+                path = attrs.get("path")
+                dep = res_to_rel(path, rel) if path else None
+                if dep:
+                    deps.add(dep)
+                # Godot resolves by uid first, so remember it for broken-path fallback
+                if attrs.get("uid") and dep:
+                    uid_refs.add(f"{dep}|{attrs['uid']}")
+        elif suffix == ".gdshader":
+            for path in SHADER_INCLUDE_RE.findall(text):
+                dep = res_to_rel(path, rel)
+                if dep:
+                    deps.add(dep)
+        else:
+            # .gd scripts and project.godot: preload()/load()/extends/autoload strings
+            for path in RES_STRING_RE.findall(text):
+                dep = res_to_rel(path.lstrip("*"), rel)
+                if dep:
+                    deps.add(dep)
+
+        uid_file = self.root / f"{rel}.uid"
+        if own_uid is None and uid_file.exists():
+            try:
+                own_uid = uid_file.read_text().strip() or None
+            except OSError:
+                pass
+
+        return {"deps": sorted(deps), "uid_refs": sorted(uid_refs), "uid": own_uid}
+
+    def refresh(self, paths: Optional[Iterable[str]] = None) -> Set[str]:
+        """Re-parse files whose size or mtime changed
+
+        Args:
+            paths: Only look at these project-relative paths. When omitted the
+                   whole tree is stat-ed (cheap) and only changed files re-read.
+
+        Returns:
+            The set of paths that were added, modified or removed
+        """
+        if paths is not None:
+            candidates = {rel for rel in paths if in_graph(rel)}
+        else:
+            candidates = set(self.iter_project_files())
+            # Files that disappeared since the last scan
+            candidates |= set(self.files)
+
+        changed = set()
+        for rel in candidates:
+            full_path = self.root / rel
+            try:
+                stat = full_path.stat()
+            except OSError:
+                if self.files.pop(rel, None) is not None:
+                    changed.add(rel)
+                continue
+
+            if not full_path.is_file():
+                continue
+
+            entry = self.files.get(rel)
+            if entry and entry["mtime"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                continue
+
+            refs = {"deps": [], "uid_refs": [], "uid": None}
+            if Path(rel).suffix in PARSED_SUFFIXES:
+                try:
+                    refs = self.parse_references(rel, full_path.read_text(errors="replace"))
+                except OSError as e:
+                    print(f"⚠️  Could not read {rel}: {e}")
+
+            self.files[rel] = {"mtime": stat.st_mtime_ns, "size": stat.st_size, **refs}
+            changed.add(rel)
+
+        if changed:
+            self._dependents = None
+            self.dirty = True
+        return changed
+
+    def dependents(self) -> Dict[str, Set[str]]:
+        """Reverse index: file -> files that reference it"""
+        if self._dependents is None:
+            reverse: Dict[str, Set[str]] = {}
+            for rel, entry in self.files.items():
+                for dep in entry.get("deps", []):
+                    reverse.setdefault(dep, set()).add(rel)
+            self._dependents = reverse
+        return self._dependents
+
+    def affected_by(self, changed: Iterable[str]) -> Set[str]:
+        """Changed files plus every scene/resource/script that transitively uses them"""
+        reverse = self.dependents()
+        affected: Set[str] = set()
+        stack = list(changed)
+
+        while stack:
+            rel = stack.pop()
+            if rel in affected:
+                continue
+            affected.add(rel)
+            stack.extend(reverse.get(rel, ()))
+
+        return {rel for rel in affected if is_checked_file(rel)}
+
+    def broken_references(self, files: Optional[Iterable[str]] = None) -> Dict[str, List[str]]:
+        """Map each file to the references it makes that don't resolve"""
+        known_uids = {entry["uid"] for entry in self.files.values() if entry.get("uid")}
+        broken: Dict[str, List[str]] = {}
+
+        for rel in (files if files is not None else list(self.files)):
+            entry = self.files.get(rel)
+            if not entry:
+                continue
+
+            uid_for = dict(ref.split("|", 1) for ref in entry.get("uid_refs", []))
+            missing = []
+            for dep in entry.get("deps", []):
+                if dep in self.files or (self.root / dep).exists():
+                    continue
+                if uid_for.get(dep) in known_uids:
+                    continue
+                missing.append(dep)
+
+            if missing:
+                broken[rel] = missing
+
+        return broken
+
+    def check_change(self, changed: Iterable[str]) -> tuple[Set[str], Dict[str, List[str]]]:
+        """Refresh the changed files and return (affected files, broken references)"""
+        changed = list(changed)
+        # A stat-only walk is cheap and keeps the reverse index complete;
+        # only files whose mtime/size moved are actually re-parsed
+        self.refresh()
+        affected = self.affected_by(changed)
+        broken = self.broken_references(affected)
+        self.save()
+        return affected, broken
+
+
+def format_broken_references(broken: Dict[str, List[str]]) -> str:
+    """Render broken references in the same shape Godot reports load errors"""
+    lines = []
+    for rel, missing in sorted(broken.items()):
+        for dep in missing:
+            lines.append(f"ERROR: Broken reference in res://{rel}: res://{dep} does not exist")
+    return '\n'.join(lines)
+
+
+def main():
+    graph = DependencyGraph()
+    changed = graph.refresh()
+    graph.save()
+    print(f"🕸️  Dependency graph: {len(graph.files)} files ({len(changed)} re-scanned)")
+
+    if len(sys.argv) > 2 and sys.argv[1] == "--changed":
+        files = changed_files(sys.argv[2])
+        affected = graph.affected_by(files)
+        print(f"\n📂 {len(files)} changed files affect {len(affected)} scenes/scripts:")
+        for rel in sorted(affected):
+            print(f"   {rel}")
+        broken = graph.broken_references(affected)
+    else:
+        broken = graph.broken_references()
+
+    if broken:
+        print(f"\n❌ Broken references:")
+        print(format_broken_references(broken))
+        sys.exit(1)
+
+    print("\n✅ No broken references")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Error Fingerprint - Normalizes Godot error output and clusters near-duplicates
+The same error at a different line, path or time maps to the same fingerprint;
+slightly different wordings are grouped with MinHash over token shingles
+"""
+
+import hashlib
+import json
+import random
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+CLUSTERS_FILE = PROJECT_ROOT / ".validation_log" / "clusters.json"
+
+NUM_PERMUTATIONS = 64
+LSH_BANDS = 16  # 16 bands x 4 rows: candidates from roughly 50% similarity
+SHINGLE_SIZE = 3
+# Estimated Jaccard similarity needed to attach an error to an existing cluster
+SIMILARITY_THRESHOLD = 0.8
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(0x6D696E68)  # Fixed seed: signatures must be stable across runs
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+# Ordered normalization rules applied to every line
+NORMALIZERS = [
+    (re.compile(r'\x1b\[[0-9;]*m'), ''),                                     # ANSI colours
+    (re.compile(r'\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(\.\d+)?'), '<time>'),
+    (re.compile(r'\b\d{1,2}:\d{2}:\d{2}(\.\d+)?\b'), '<time>'),
+    (re.compile(r'(res|user)://[^\s:)"\']+'), '<path>'),
+    (re.compile(r'(?:[A-Za-z]:)?[\w.@-]*(?:[/\\][\w.@-]+){2,}'), '<path>'),  # file system paths
+    (re.compile(r'0x[0-9a-fA-F]+'), '<addr>'),
+    (re.compile(r'\b(?=[0-9a-f]*\d)[0-9a-f]{7,40}\b'), '<sha>'),
+    (re.compile(r'<path>:\d+(:\d+)?'), '<path>:<line>'),
+    (re.compile(r'\bline \d+\b', re.IGNORECASE), 'line <n>'),
+    (re.compile(r'\b\d+\b'), '<n>'),
+    (re.compile(r'\s+'), ' '),
+]
+
+TOKEN_RE = re.compile(r'<\w+>|[\w.]+|[^\w\s]')
+
+
+def normalize_error_text(error_text: str) -> str:
+    """Reduce Godot output to the parts that identify the error"""
+    lines = []
+    for raw in error_text.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        for pattern, replacement in NORMALIZERS:
+            line = pattern.sub(replacement, line)
+        line = line.strip()
+        if line and line not in lines:
+            lines.append(line)
+
+    # Keep the diagnostic lines; fall back to everything if none are marked
+    relevant = [l for l in lines if "ERROR" in l or "WARNING" in l or l.startswith("at:")]
+    return '\n'.join(sorted(relevant or lines))
+
+
+def fingerprint(error_text: str) -> str:
+    """Stable hash of the normalized error (exact-duplicate key)"""
+    return hashlib.sha256(normalize_error_text(error_text).encode()).hexdigest()[:16]
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+    tokens = TOKEN_RE.findall(text)
+    if len(tokens) < size:
+        return {' '.join(tokens)} if tokens else set()
+    return {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def minhash(text: str) -> List[int]:
+    """MinHash signature of the normalized text's token shingles"""
+    hashes = [
+        int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big")
+        for s in shingles(text)
+    ]
+    if not hashes:
+        return [0] * NUM_PERMUTATIONS
+    return [
+        min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def similarity(sig_a: List[int], sig_b: List[int]) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / NUM_PERMUTATIONS
+
+
+def band_keys(signature: List[int]) -> List[str]:
+    rows = NUM_PERMUTATIONS // LSH_BANDS
+    return [
+        f"{band}:" + hashlib.blake2b(
+            json.dumps(signature[band * rows:(band + 1) * rows]).encode(), digest_size=8
+        ).hexdigest()
+        for band in range(LSH_BANDS)
+    ]
+
+
+class ErrorClusters:
+    """Persistent near-duplicate clusters of build errors"""
+
+    def __init__(self, path: Path = CLUSTERS_FILE):
+        self.path = Path(path)
+        self.clusters: Dict[str, dict] = {}
+        self.bands: Dict[str, set] = {}
+        self.load()
+
+    def load(self):
+        if self.path.exists():
+            try:
+                with open(self.path) as f:
+                    self.clusters = json.load(f)
+            except Exception as e:
+                print(f"⚠️  Error loading error clusters: {e}")
+                self.clusters = {}
+        for cluster_id, cluster in self.clusters.items():
+            self._index(cluster_id, cluster["signature"])
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.path.with_suffix('.json.tmp')
+        with open(temp_file, 'w') as f:
+            json.dump(self.clusters, f)
+        temp_file.replace(self.path)
+
+    def _index(self, cluster_id: str, signature: List[int]):
+        for key in band_keys(signature):
+            self.bands.setdefault(key, set()).add(cluster_id)
+
+    def match(self, error_text: str) -> Optional[dict]:
+        """Find the most similar existing cluster above the threshold"""
+        fp = fingerprint(error_text)
+        if fp in self.clusters:
+            return self.clusters[fp]
+
+        signature = minhash(normalize_error_text(error_text))
+        candidates = set()
+        for key in band_keys(signature):
+            candidates |= self.bands.get(key, set())
+
+        best, best_score = None, SIMILARITY_THRESHOLD
+        for cluster_id in candidates:
+            score = similarity(signature, self.clusters[cluster_id]["signature"])
+            if score >= best_score:
+                best, best_score = self.clusters[cluster_id], score
+        return best
+
+    def add(self, error_text: str, issue_url: str, commit: str) -> dict:
+        """Start a new cluster for an error that has its own issue"""
+        fp = fingerprint(error_text)
+        normalized = normalize_error_text(error_text)
+        cluster = {
+            "id": fp,
+            "issue_url": issue_url,
+            "signature": minhash(normalized),
+            "sample": normalized[:500],
+            "occurrences": 1,
+            "commits": [commit],
+            "first_seen": datetime.now().isoformat(),
+            "last_seen": datetime.now().isoformat(),
+        }
+        self.clusters[fp] = cluster
+        self._index(fp, cluster["signature"])
+        self.save()
+        return cluster
+
+    def reassign(self, cluster: dict, issue_url: str, commit: str):
+        """Point a cluster at a new issue (its old one was closed and the error came back)"""
+        cluster["issue_url"] = issue_url
+        self.record_occurrence(cluster, commit)
+
+    def record_occurrence(self, cluster: dict, commit: str):
+        cluster["occurrences"] += 1
+        cluster["last_seen"] = datetime.now().isoformat()
+        if commit not in cluster["commits"]:
+            cluster["commits"] = (cluster["commits"] + [commit])[-20:]
+        self.save()
+
+
+def main():
+    if len(sys.argv) > 1:
+        with open(sys.argv[1]) as f:
+            text = f.read()
+        print(f"Fingerprint: {fingerprint(text)}")
+        print(normalize_error_text(text))
+        match = ErrorClusters().match(text)
+        print(f"\nCluster: {match['issue_url'] if match else 'none'}")
+        return
+
+    clusters = ErrorClusters().clusters
+    print(f"🧬 {len(clusters)} error cluster(s)")
+    for cluster in sorted(clusters.values(), key=lambda c: -c["occurrences"]):
+        print(f"   {cluster['occurrences']:>4}x  {cluster['issue_url']}")
+        print(f"         {cluster['sample'].splitlines()[0][:90] if cluster['sample'] else ''}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,37 +1,426 @@
-import requests
-import sys
+#!/usr/bin/env python3
+"""
+Fetch Asset - Downloads low-poly models from Poly Pizza
+Searches and downloads run concurrently over one pooled session; downloads
+stream to a .part file, resume with HTTP Range and land in the shared
+content-addressed asset cache, from which project files are hardlinked
+Bulk mode fetches every model listed under "### Assets Needed" in the plan
+"""
+
 import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import quote
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from asset_cache import AssetCache, asset_id, normalize_query
+from glb_inspector import BUDGETS, GLBError, inspect as inspect_model
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+SAVE_DIR = PROJECT_ROOT / "assets" / "models"
+DEV_PLAN = PROJECT_ROOT / "development_plan.md"
+
+# Get a token from poly.pizza; the base URL can point at a local stand-in server
+AUTH_TOKEN = os.environ.get("POLY_PIZZA_TOKEN", "YOUR_POLY_PIZZA_TOKEN")
+API_BASE = os.environ.get("POLY_PIZZA_API", "https://api.poly.pizza/v1.1").rstrip("/")
+
+# Concurrent searches/downloads (also the connection pool size)
+MAX_WORKERS = 4
+CHUNK_SIZE = 1024 * 1024
+# (connect, read) timeouts in seconds; the read timeout applies per chunk
+REQUEST_TIMEOUT = (10, 60)
+# Full download attempts, each resuming from the bytes already on disk
+DOWNLOAD_ATTEMPTS = 3
+# Requests started per second across all workers (searches and downloads)
+MAX_REQUESTS_PER_SECOND = 2.0
+
+# Search results tried per query when earlier ones exceed the model budgets
+MAX_CANDIDATES = 3
+
+# "Assets Needed" categories Poly Pizza can satisfy; the rest are sourced by hand
+MODEL_CATEGORIES = {"model", "models"}
+
+
+class RateLimiter:
+    """Spaces request starts evenly across threads"""
+
+    def __init__(self, per_second: float = MAX_REQUESTS_PER_SECOND):
+        self.interval = 1.0 / per_second if per_second > 0 else 0.0
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def make_session(pool_size: int = MAX_WORKERS) -> requests.Session:
+    """Session with a connection pool sized for the worker count and retries on 5xx"""
+    session = requests.Session()
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=("GET",), respect_retry_after_header=True)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["x-auth-token"] = AUTH_TOKEN
+    return session
+
+
+def iter_received(response: requests.Response, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Body data as it arrives, up to `chunk_size` at a time
+
+    Unlike iter_content, bytes read before a dropped connection are yielded
+    too, so the .part file keeps everything that was received.
+    """
+    while True:
+        try:
+            chunk = response.raw.read1(chunk_size, decode_content=True)
+        except urllib3.exceptions.HTTPError as e:
+            raise IOError(f"connection broken: {e}") from e
+        if not chunk:
+            return
+        yield chunk
+
+
+def asset_file_name(asset: dict) -> str:
+    """Project file name for a search result or cache record"""
+    title = asset.get("Title") or asset.get("title")
+    return f"{title.replace(' ', '_')}.glb"
+
+
+class AssetFetcher:
+    def __init__(self, save_dir: Path = SAVE_DIR, max_workers: int = MAX_WORKERS,
+                 session: Optional[requests.Session] = None,
+                 cache: Optional[AssetCache] = None, use_cache: bool = True,
+                 budgets: Optional[Dict[str, float]] = BUDGETS):
+        self.save_dir = Path(save_dir)
+        self.max_workers = max(1, max_workers)
+        self.session = session or make_session(self.max_workers)
+        self.cache = cache or AssetCache()
+        self.use_cache = use_cache
+        self.rate_limiter = RateLimiter()
+        # None disables the budget gate
+        self.budgets = budgets
+
+    def search(self, query: str) -> Optional[List[dict]]:
+        """Search results for a query (empty on no match, None on API error)"""
+        if self.use_cache:
+            cached = self.cache.get_search(query)
+            if cached is not None:
+                return cached
+
+        print(f"🔍 Searching Poly Pizza for: {query}...")
+        self.rate_limiter.wait()
+        try:
+            response = self.session.get(f"{API_BASE}/search/{quote(query)}",
+                                        timeout=REQUEST_TIMEOUT)
+        except requests.RequestException as e:
+            print(f"❌ Search failed for '{query}': {e}")
+            return None
+
+        if response.status_code != 200:
+            print(f"❌ API error {response.status_code} for '{query}'")
+            return None
+
+        try:
+            data = response.json()
+        except ValueError as e:
+            print(f"❌ Malformed search response for '{query}': {e}")
+            return None
+        # v1.1 wraps results in {"total", "results"}; older responses are a bare list
+        results = data.get("results", []) if isinstance(data, dict) else data
+        if not isinstance(results, list):
+            print(f"❌ Malformed search response for '{query}'")
+            return None
+        self.cache.put_search(query, results)
+        return results
+
+    def download(self, url: str, dest: Path) -> Path:
+        """Stream `url` to `dest`, resuming an interrupted .part file
+
+        Raises:
+            requests.RequestException / IOError if every attempt fails
+        """
+        dest = Path(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        part = dest.with_name(dest.name + ".part")
+
+        for attempt in range(1, DOWNLOAD_ATTEMPTS + 1):
+            offset = part.stat().st_size if part.exists() else 0
+            headers = {"Range": f"bytes={offset}-"} if offset else {}
+            self.rate_limiter.wait()
+            try:
+                with self.session.get(url, headers=headers, stream=True, timeout=REQUEST_TIMEOUT) as response:
+                    if response.status_code == 416:
+                        # Nothing past our offset; the .part file is only complete if it is
+                        # exactly the asset's size, otherwise it is stale or corrupt
+                        total = self.remote_size(url, response)
+                        if total == offset:
+                            break
+                        part.unlink()
+                        raise IOError(f"partial file of {offset} bytes does not match the "
+                                      f"asset ({total if total is not None else 'unknown'} bytes)")
+                    response.raise_for_status()
+
+                    # 206 continues the partial file; a plain 200 means the server restarted it
+                    mode = "ab" if response.status_code == 206 else "wb"
+                    expected = response.headers.get("Content-Length")
+                    written = 0
+                    with open(part, mode) as f:
+                        for chunk in iter_received(response):
+                            f.write(chunk)
+                            written += len(chunk)
 
-# replace with your actual token from poly.pizza
-AUTH_TOKEN = "YOUR_POLY_PIZZA_TOKEN" 
-SAVE_DIR = "assets/models"
-
-def fetch_model(query):
-    if not os.path.exists(SAVE_DIR):
-        os.makedirs(SAVE_DIR)
-        
-    headers = {"x-auth-token": AUTH_TOKEN}
-    url = f"https://api.poly.pizza/v1.1/search/{query}"
-    
-    print(f"🔍 Searching Poly Pizza for: {query}...")
-    response = requests.get(url, headers=headers)
-    
-    if response.status_code == 200 and len(response.json()) > 0:
-        asset = response.json()[0]
-        download_url = asset["DownloadURL"]
-        file_name = f"{asset['Title'].replace(' ', '_')}.glb"
-        dest = os.path.join(SAVE_DIR, file_name)
-        
-        print(f"📦 Found '{asset['Title']}'. Downloading...")
-        file_data = requests.get(download_url).content
-        with open(dest, "wb") as f:
-            f.write(file_data)
-        print(f"✅ Saved to {dest}")
+                    if expected is not None and written < int(expected):
+                        raise IOError(f"connection closed after {written} of {expected} bytes")
+                break
+            except (requests.RequestException, IOError) as e:
+                if attempt == DOWNLOAD_ATTEMPTS:
+                    raise
+                print(f"⚠️  Download interrupted ({e}); resuming (attempt {attempt + 1}/{DOWNLOAD_ATTEMPTS})")
+
+        os.replace(part, dest)
         return dest
-    else:
-        print("❌ No models found or API error.")
+
+    def remote_size(self, url: str, response: requests.Response) -> Optional[int]:
+        """Full size of the asset at `url`: from a 416's "Content-Range: bytes */N",
+        else from a HEAD request (None if the server doesn't say)"""
+        match = re.match(r'bytes \*/(\d+)$', response.headers.get("Content-Range", ""))
+        if match:
+            return int(match.group(1))
+        self.rate_limiter.wait()
+        try:
+            head = self.session.head(url, allow_redirects=True, timeout=REQUEST_TIMEOUT)
+        except requests.RequestException:
+            return None
+        length = head.headers.get("Content-Length")
+        return int(length) if head.ok and length and length.isdigit() else None
+
+    def budget_problems(self, path: Path) -> List[str]:
+        """Exceeded budgets for a model file (unreadable files fail too)"""
+        if self.budgets is None:
+            return []
+        try:
+            return inspect_model(path).over_budget(self.budgets)
+        except (GLBError, OSError) as e:
+            return [f"unreadable model: {e}"]
+
+    def fetch(self, query: str) -> Optional[Path]:
+        """Search for `query` and download the best match within budget
+
+        Queries and assets fetched before (by any worktree) are served from the
+        asset cache without touching the network. Results over the model
+        budgets are skipped in favour of the next candidate. A query with no
+        usable result is cached as unavailable; one that failed on the network
+        is not, so it is retried next time.
+        """
+        if self.use_cache:
+            record = self.cache.lookup_query(query)
+            if record and not self.budget_problems(self.cache.object_path(record["sha256"])):
+                dest = self.cache.materialize(record, self.save_dir / asset_file_name(record))
+                print(f"♻️  '{query}' served from cache: {dest}")
+                return dest
+            if self.cache.is_unavailable(query):
+                print(f"🚫 '{query}' has no usable model (cached)")
+                return None
+
+        results = self.search(query)
+        if results is None:
+            return None
+        if not results:
+            print(f"❌ No models found for '{query}'.")
+            self.cache.mark_unavailable(query)
+            return None
+
+        failed = False
+        for asset in results[:MAX_CANDIDATES]:
+            key = asset_id(asset)
+
+            # One download per asset, even when several queries resolve to it
+            with self.cache.asset_lock(key):
+                record = self.cache.lookup_asset(key) if self.use_cache else None
+                if record:
+                    problems = self.budget_problems(self.cache.object_path(record["sha256"]))
+                    if not problems:
+                        self.cache.record_query(query, key)
+                else:
+                    print(f"📦 Found '{asset['Title']}'. Downloading...")
+                    try:
+                        downloaded = self.download(asset["DownloadURL"], self.cache.temp_path(key))
+                    except (requests.RequestException, IOError) as e:
+                        print(f"❌ Download failed for '{query}': {e}")
+                        failed = True
+                        continue
+                    problems = self.budget_problems(downloaded)
+                    if problems:
+                        downloaded.unlink()
+                    else:
+                        record = self.cache.add(downloaded, asset, query)
+
+            if problems:
+                print(f"⚠️  Skipping '{asset['Title']}': {'; '.join(problems)}")
+                continue
+
+            dest = self.cache.materialize(record, self.save_dir / asset_file_name(asset))
+            print(f"✅ Saved to {dest}")
+            return dest
+
+        if failed:
+            print(f"❌ Could not fetch '{query}'.")
+        else:
+            print(f"❌ No model within budget for '{query}'.")
+            self.cache.mark_unavailable(query)
         return None
 
+    def fetch_many(self, queries: List[str]) -> Dict[str, Optional[Path]]:
+        """Fetch several queries concurrently (bounded by max_workers)"""
+        # Queries differing only in case/spacing are fetched once
+        unique = {}
+        for query in queries:
+            unique.setdefault(normalize_query(query), ' '.join(query.split()))
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            fetched = dict(zip(unique, pool.map(self.fetch, unique.values())))
+        return {query: fetched[normalize_query(query)] for query in queries}
+
+
+def iter_plan_assets(content: str) -> Iterator[dict]:
+    """Yield {stage, category, name, query} for each "### Assets Needed" table row"""
+    stage = None
+    in_assets = False
+
+    for line in content.split('\n'):
+        stage_match = re.match(r'^## Stage (\d+)', line)
+        if stage_match:
+            stage = int(stage_match.group(1))
+            in_assets = False
+            continue
+        if line.startswith('###'):
+            in_assets = line.startswith('### Assets Needed')
+            continue
+        if not in_assets or not stage or not line.startswith('|'):
+            continue
+
+        cells = [cell.strip() for cell in line.strip().strip('|').split('|')]
+        if len(cells) < 2 or cells[0] in ("Category", "") or set(cells[0]) <= set("-: "):
+            continue
+
+        name = cells[1]
+        # "Dart/arrow projectile" -> "Dart arrow projectile"; drop "(rigged, ...)" notes
+        query = ' '.join(re.sub(r'\(.*?\)', '', name).replace('/', ' ').split())
+        yield {"stage": stage, "category": cells[0], "name": name, "query": query}
+
+
+def plan_assets(stages: Optional[List[int]] = None) -> List[dict]:
+    if not DEV_PLAN.exists():
+        print("❌ development_plan.md not found!")
+        return []
+    return [
+        asset for asset in iter_plan_assets(DEV_PLAN.read_text())
+        if stages is None or asset["stage"] in stages
+    ]
+
+
+def fetch_plan_assets(stages: Optional[List[int]] = None, max_workers: int = MAX_WORKERS,
+                      use_cache: bool = True, budgets: Optional[Dict[str, float]] = BUDGETS) -> dict:
+    """Fetch every model listed in the plan's "Assets Needed" tables
+
+    Returns:
+        {"satisfied": [...], "unavailable": [...], "missing": [...], "manual": [...]}
+        where each entry is an asset row; satisfied ones carry the project
+        "path", unavailable ones have no usable model on Poly Pizza and missing
+        ones failed to fetch (worth retrying)
+    """
+    assets = plan_assets(stages)
+    models = [a for a in assets if a["category"].lower() in MODEL_CATEGORIES]
+    report = {
+        "satisfied": [],
+        "unavailable": [],
+        "missing": [],
+        "manual": [a for a in assets if a["category"].lower() not in MODEL_CATEGORIES],
+    }
+    if models:
+        fetcher = AssetFetcher(max_workers=max_workers, use_cache=use_cache, budgets=budgets)
+        results = fetcher.fetch_many([a["query"] for a in models])
+        for asset in models:
+            path = results.get(asset["query"])
+            if path:
+                report["satisfied"].append({**asset, "path": str(path.relative_to(PROJECT_ROOT))
+                                            if path.is_relative_to(PROJECT_ROOT) else str(path)})
+            elif fetcher.cache.is_unavailable(asset["query"]):
+                report["unavailable"].append(asset)
+            else:
+                report["missing"].append(asset)
+    return report
+
+
+def format_plan_report(report: dict) -> str:
+    lines = [f"\n📋 Assets Needed: {len(report['satisfied'])} satisfied, "
+             f"{len(report['unavailable'])} unavailable, {len(report['missing'])} missing, "
+             f"{len(report['manual'])} to source by hand"]
+    for asset in report["satisfied"]:
+        lines.append(f"   ✅ S{asset['stage']} {asset['name']} → {asset['path']}")
+    for asset in report["unavailable"]:
+        lines.append(f"   🚫 S{asset['stage']} {asset['name']}")
+    for asset in report["missing"]:
+        lines.append(f"   ❌ S{asset['stage']} {asset['name']}")
+    for asset in report["manual"]:
+        lines.append(f"   ✋ S{asset['stage']} [{asset['category']}] {asset['name']}")
+    return '\n'.join(lines)
+
+
+def fetch_model(query: str) -> Optional[str]:
+    """Fetch a single model (kept for existing callers)"""
+    dest = AssetFetcher(max_workers=1).fetch(query)
+    return str(dest) if dest else None
+
+
+def main():
+    args = sys.argv[1:]
+    max_workers = MAX_WORKERS
+    use_cache = "--no-cache" not in args
+    budgets = None if "--no-budget" in args else BUDGETS
+    args = [a for a in args if a not in ("--no-cache", "--no-budget")]
+    if "-j" in args:
+        index = args.index("-j")
+        max_workers = int(args[index + 1])
+        del args[index:index + 2]
+
+    if "--all-stages" in args or "--stage" in args:
+        stages = None
+        if "--stage" in args:
+            index = args.index("--stage")
+            stages = [int(s) for s in args[index + 1].split(",")]
+        report = fetch_plan_assets(stages, max_workers=max_workers, use_cache=use_cache, budgets=budgets)
+        print(format_plan_report(report))
+        if report["missing"]:
+            sys.exit(1)
+        return
+
+    if not args:
+        print("Usage: fetch_asset.py [-j N] [--no-cache] [--no-budget] QUERY [QUERY ...]")
+        print("       fetch_asset.py [-j N] [--no-cache] [--no-budget] --stage N[,M] | --all-stages")
+        return
+
+    results = AssetFetcher(max_workers=max_workers, use_cache=use_cache, budgets=budgets).fetch_many(args)
+    missing = [query for query, path in results.items() if path is None]
+    print(f"\n📦 {len(results) - len(missing)}/{len(results)} assets fetched")
+    if missing:
+        print(f"❌ Missing: {', '.join(missing)}")
+        sys.exit(1)
+
+
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        fetch_model(sys.argv[1])
+    main()
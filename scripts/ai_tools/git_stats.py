@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Git Stats - Incremental commit statistics for reporting
+Remembers the last commit it processed and only reads `git log` for newer
+commits, so reporting cost stays flat as agent history grows
+"""
+
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+from git_watch import read_head_commit
+from task_leases import is_ancestor
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+GIT_STATS_FILE = PROJECT_ROOT / ".ai_git_stats.json"
+PROGRESS_FILE = PROJECT_ROOT / ".ai_progress.json"
+
+# Commits whose files make up "recent files" (previously HEAD~5..HEAD)
+RECENT_COMMITS = 5
+
+TASK_ID_RE = re.compile(r'\b(S\d+T[\w-]+|GH\d+)\b')
+
+# Record and field separators for the parsed `git log` format
+RECORD_SEP = "\x1e"
+FIELD_SEP = "\x1f"
+
+EMPTY_STATS = {
+    "last_seen": None,
+    "total_commits": 0,
+    "lines_added": 0,
+    "lines_deleted": 0,
+    "files_by_task": {},
+    "churn_by_dir": {},
+    "recent": [],  # [{"commit", "files"}] for the last RECENT_COMMITS commits
+}
+
+
+def git(*args: str, cwd: Path = PROJECT_ROOT) -> subprocess.CompletedProcess:
+    return subprocess.run(["git", *args], capture_output=True, text=True, cwd=cwd)
+
+
+class GitStats:
+    def __init__(self, root: Path = PROJECT_ROOT, stats_file: Path = GIT_STATS_FILE):
+        self.root = Path(root)
+        self.stats_file = Path(stats_file)
+        self.stats = self.load()
+
+    def load(self) -> dict:
+        if self.stats_file.exists():
+            try:
+                with open(self.stats_file) as f:
+                    return {**json.loads(json.dumps(EMPTY_STATS)), **json.load(f)}
+            except Exception as e:
+                print(f"⚠️  Error loading git stats: {e}")
+        return json.loads(json.dumps(EMPTY_STATS))
+
+    def save(self):
+        temp_file = self.stats_file.with_suffix('.json.tmp')
+        with open(temp_file, 'w') as f:
+            json.dump(self.stats, f)
+        temp_file.replace(self.stats_file)
+
+    def load_task_commits(self) -> Dict[str, str]:
+        """commit -> task id, as recorded by the orchestrator"""
+        try:
+            with open(PROGRESS_FILE) as f:
+                return json.load(f).get("task_commits", {})
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def update(self) -> dict:
+        """Fold commits made since the last update into the running totals"""
+        head = read_head_commit(self.root)
+        last_seen = self.stats["last_seen"]
+        if not head or head == last_seen:
+            return self.stats
+
+        if last_seen and is_ancestor(last_seen, head, self.root):
+            revision_range = f"{last_seen}..{head}"
+        elif last_seen and is_ancestor(head, last_seen, self.root):
+            # HEAD moved back (a rolled-back task): take the dropped commits out
+            if self._rewind(head, last_seen):
+                self.stats["last_seen"] = head
+                self.save()
+            return self.stats
+        else:
+            # First run, or history was rewritten (rebase, reset elsewhere): start over
+            if last_seen:
+                print("♻️  Git history changed - rebuilding git stats")
+            self.stats = json.loads(json.dumps(EMPTY_STATS))
+            revision_range = head
+
+        result = git(
+            "log", "--reverse", "--no-renames", "--numstat",
+            f"--format={RECORD_SEP}%H{FIELD_SEP}%s", revision_range,
+            cwd=self.root
+        )
+        if result.returncode != 0:
+            print(f"⚠️  git log failed: {result.stderr.strip()}")
+            return self.stats
+
+        task_commits = self.load_task_commits()
+        for record in result.stdout.split(RECORD_SEP)[1:]:
+            self._add_commit(record, task_commits)
+
+        self.stats["last_seen"] = head
+        self.save()
+        return self.stats
+
+    def _rewind(self, head: str, last_seen: str) -> bool:
+        """Subtract the commits in head..last_seen from the totals"""
+        result = git(
+            "log", "--no-renames", "--numstat",
+            f"--format={RECORD_SEP}%H{FIELD_SEP}%s", f"{head}..{last_seen}",
+            cwd=self.root
+        )
+        if result.returncode != 0:
+            print(f"⚠️  git log failed: {result.stderr.strip()}")
+            return False
+
+        task_commits = self.load_task_commits()
+        # task id -> files its dropped commits touched
+        dropped: Dict[str, set] = {}
+        for record in result.stdout.split(RECORD_SEP)[1:]:
+            task_id, files = self._remove_commit(record, task_commits)
+            if task_id:
+                dropped.setdefault(task_id, set()).update(files)
+
+        files_by_task = self.stats["files_by_task"]
+        for task_id, files in dropped.items():
+            files_by_task[task_id] = [f for f in files_by_task.get(task_id, []) if f not in files]
+        # Put back the files those tasks also touched in commits that remain
+        paths = sorted(set().union(*dropped.values()))
+        if paths:
+            kept = git(
+                "log", "--reverse", "--no-renames", "--full-history", "--name-only",
+                f"--format={RECORD_SEP}%H{FIELD_SEP}%s", head, "--", *paths,
+                cwd=self.root
+            )
+            for record in kept.stdout.split(RECORD_SEP)[1:]:
+                header, _, names = record.partition('\n')
+                commit, _, subject = header.partition(FIELD_SEP)
+                task_id = self._task_of(commit, subject, task_commits)
+                if task_id in dropped:
+                    touched = files_by_task[task_id]
+                    touched.extend(f for f in names.split('\n') if f and f not in touched)
+        for task_id in dropped:
+            if not files_by_task.get(task_id):
+                files_by_task.pop(task_id, None)
+
+        recent = git(
+            "log", "--reverse", "--no-renames", "--name-only", f"-n{RECENT_COMMITS}",
+            f"--format={RECORD_SEP}%H", head,
+            cwd=self.root
+        )
+        self.stats["recent"] = []
+        for record in recent.stdout.split(RECORD_SEP)[1:]:
+            commit, _, names = record.partition('\n')
+            self.stats["recent"].append({"commit": commit.strip(), "files": [f for f in names.split('\n') if f]})
+        return True
+
+    @staticmethod
+    def _parse_record(record: str) -> tuple:
+        """(commit, subject, [(added, deleted, path)]) of one `git log --numstat` record"""
+        header, _, numstat = record.partition('\n')
+        commit, _, subject = header.partition(FIELD_SEP)
+        rows = []
+        for line in numstat.split('\n'):
+            parts = line.split('\t')
+            if len(parts) != 3:
+                continue
+            added, deleted, path = parts
+            # Binary files report "-" for both counts
+            rows.append((int(added) if added.isdigit() else 0, int(deleted) if deleted.isdigit() else 0, path))
+        return commit, subject, rows
+
+    @staticmethod
+    def _task_of(commit: str, subject: str, task_commits: Dict[str, str]):
+        match = TASK_ID_RE.search(subject)
+        return task_commits.get(commit) or (match.group(1) if match else None)
+
+    def _remove_commit(self, record: str, task_commits: Dict[str, str]) -> tuple:
+        """Undo _add_commit for one record; returns (task id, files)"""
+        commit, subject, rows = self._parse_record(record)
+        stats = self.stats
+
+        for added, deleted, path in rows:
+            stats["lines_added"] -= added
+            stats["lines_deleted"] -= deleted
+            churn = stats["churn_by_dir"].get(str(Path(path).parent))
+            if churn:
+                churn["added"] -= added
+                churn["deleted"] -= deleted
+
+        for directory in {str(Path(path).parent) for _, _, path in rows}:
+            churn = stats["churn_by_dir"].get(directory)
+            if churn:
+                churn["commits"] -= 1
+                if churn["commits"] <= 0:
+                    del stats["churn_by_dir"][directory]
+
+        stats["total_commits"] -= 1
+        return self._task_of(commit, subject, task_commits), [path for _, _, path in rows]
+
+    def _add_commit(self, record: str, task_commits: Dict[str, str]):
+        commit, subject, rows = self._parse_record(record)
+        stats = self.stats
+
+        files = []
+        for added, deleted, path in rows:
+            files.append(path)
+
+            stats["lines_added"] += added
+            stats["lines_deleted"] += deleted
+            directory = str(Path(path).parent)
+            churn = stats["churn_by_dir"].setdefault(directory, {"added": 0, "deleted": 0, "commits": 0})
+            churn["added"] += added
+            churn["deleted"] += deleted
+
+        for directory in {str(Path(f).parent) for f in files}:
+            stats["churn_by_dir"][directory]["commits"] += 1
+
+        task_id = self._task_of(commit, subject, task_commits)
+        if task_id:
+            touched = stats["files_by_task"].setdefault(task_id, [])
+            touched.extend(f for f in files if f not in touched)
+
+        stats["total_commits"] += 1
+        stats["recent"] = (stats["recent"] + [{"commit": commit, "files": files}])[-RECENT_COMMITS:]
+
+    def recent_files(self) -> List[str]:
+        files = []
+        for entry in self.stats["recent"]:
+            files.extend(f for f in entry["files"] if f not in files)
+        return files
+
+    def top_directories(self, limit: int = 10) -> List[tuple]:
+        """(directory, churn) pairs, highest churn first"""
+        churn = [(d, c["added"] + c["deleted"]) for d, c in self.stats["churn_by_dir"].items()]
+        return sorted(churn, key=lambda item: -item[1])[:limit]
+
+
+def main():
+    stats = GitStats()
+    if "--rebuild" in sys.argv:
+        stats.stats["last_seen"] = None
+    data = stats.update()
+
+    print("📝 Git Stats")
+    print(f"   Commits: {data['total_commits']} (through {(data['last_seen'] or '-')[:12]})")
+    print(f"   Lines: +{data['lines_added']} / -{data['lines_deleted']}")
+    print(f"   Tasks with commits: {len(data['files_by_task'])}")
+    print("\n   Churn by directory:")
+    for directory, churn in stats.top_directories():
+        print(f"   {churn:>8}  {directory}")
+
+
+if __name__ == "__main__":
+    main()
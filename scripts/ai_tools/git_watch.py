@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Git Watch - Detects new commits by watching .git/HEAD and refs directly
+Uses inotify (Linux) or kqueue (macOS) when available and falls back to
+stat polling; never spawns git while idle
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+# How long the refs must stay quiet before a change is reported
+DEBOUNCE_SECONDS = 0.25
+# Upper bound between the first ref event and reporting it, even mid-burst
+MAX_DELAY_SECONDS = 1.0
+# Interval for the stat-polling fallback
+POLL_SECONDS = 0.2
+
+# inotify constants from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+INOTIFY_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+INOTIFY_EVENT = struct.Struct("iIII")
+
+# Names inside the git dir whose changes can move HEAD
+REF_FILE_NAMES = {"HEAD", "packed-refs"}
+
+
+def find_git_dirs(root: Path = PROJECT_ROOT) -> tuple[Path, Path]:
+    """Return (git_dir, common_dir), following worktree `.git` files"""
+    git_path = Path(root) / ".git"
+
+    if git_path.is_file():
+        content = git_path.read_text().strip()
+        if content.startswith("gitdir:"):
+            git_dir = Path(content[len("gitdir:"):].strip())
+            if not git_dir.is_absolute():
+                git_dir = (Path(root) / git_dir).resolve()
+        else:
+            git_dir = git_path
+    else:
+        git_dir = git_path
+
+    common_dir = git_dir
+    commondir_file = git_dir / "commondir"
+    if commondir_file.exists():
+        common_dir = (git_dir / commondir_file.read_text().strip()).resolve()
+
+    return git_dir, common_dir
+
+
+def read_packed_ref(common_dir: Path, ref: str) -> Optional[str]:
+    """Look a ref up in packed-refs"""
+    packed = common_dir / "packed-refs"
+    try:
+        with open(packed) as f:
+            for line in f:
+                if line.startswith(("#", "^")):
+                    continue
+                parts = line.split()
+                if len(parts) == 2 and parts[1] == ref:
+                    return parts[0]
+    except OSError:
+        pass
+    return None
+
+
+def read_head_commit(root: Path = PROJECT_ROOT) -> Optional[str]:
+    """Resolve HEAD to a commit hash by reading ref files (no subprocess)"""
+    git_dir, common_dir = find_git_dirs(root)
+
+    try:
+        head = (git_dir / "HEAD").read_text().strip()
+    except OSError:
+        return None
+
+    # Follow symbolic refs (a few levels is plenty in practice)
+    for _ in range(5):
+        if not head.startswith("ref:"):
+            return head or None
+
+        ref = head[len("ref:"):].strip()
+        for base in (git_dir, common_dir):
+            try:
+                head = (base / ref).read_text().strip()
+                break
+            except OSError:
+                continue
+        else:
+            return read_packed_ref(common_dir, ref)
+
+    return None
+
+
+class GitHeadWatcher:
+    """Blocks until HEAD points at a different commit"""
+
+    def __init__(self, root: Path = PROJECT_ROOT,
+                 debounce: float = DEBOUNCE_SECONDS,
+                 max_delay: float = MAX_DELAY_SECONDS):
+        self.root = Path(root)
+        self.git_dir, self.common_dir = find_git_dirs(self.root)
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.last_commit = read_head_commit(self.root)
+        self.backend = "poll"
+        self._inotify_fd: Optional[int] = None
+        self._watch_dirs: Dict[int, Path] = {}
+        self._kqueue = None
+        self._kqueue_fds: List[int] = []
+        self._setup()
+
+    def watched_dirs(self) -> List[Path]:
+        """Directories whose entries can change what HEAD resolves to"""
+        dirs = {self.git_dir, self.common_dir}
+        for base in (self.git_dir, self.common_dir):
+            refs = base / "refs"
+            if refs.is_dir():
+                for current, subdirs, _ in os.walk(refs):
+                    dirs.add(Path(current))
+        return sorted(dirs)
+
+    def _setup(self):
+        if sys.platform.startswith("linux") and self._setup_inotify():
+            self.backend = "inotify"
+        elif hasattr(select, "kqueue") and self._setup_kqueue():
+            self.backend = "kqueue"
+
+    def _setup_inotify(self) -> bool:
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd < 0:
+                return False
+            for directory in self.watched_dirs():
+                wd = libc.inotify_add_watch(fd, os.fsencode(directory), INOTIFY_MASK)
+                if wd >= 0:
+                    self._watch_dirs[wd] = directory
+            self._inotify_fd = fd
+            self._libc = libc
+            return bool(self._watch_dirs)
+        except (OSError, AttributeError):
+            return False
+
+    def _setup_kqueue(self) -> bool:
+        try:
+            self._kqueue = select.kqueue()
+            events = []
+            for directory in self.watched_dirs():
+                fd = os.open(directory, os.O_RDONLY)
+                self._kqueue_fds.append(fd)
+                events.append(select.kevent(
+                    fd,
+                    filter=select.KQ_FILTER_VNODE,
+                    flags=select.KQ_EV_ADD | select.KQ_EV_CLEAR,
+                    fflags=select.KQ_NOTE_WRITE | select.KQ_NOTE_DELETE | select.KQ_NOTE_RENAME
+                ))
+            self._kqueue.control(events, 0, 0)
+            return True
+        except OSError:
+            self.close()
+            return False
+
+    def close(self):
+        if self._inotify_fd is not None:
+            os.close(self._inotify_fd)
+            self._inotify_fd = None
+        for fd in self._kqueue_fds:
+            os.close(fd)
+        self._kqueue_fds = []
+        if self._kqueue is not None:
+            self._kqueue.close()
+            self._kqueue = None
+
+    def _ref_stat_signature(self) -> tuple:
+        """mtimes of everything HEAD resolution reads (used by the poll backend)"""
+        paths = [self.git_dir / "HEAD", self.common_dir / "packed-refs"]
+        try:
+            head = (self.git_dir / "HEAD").read_text().strip()
+            if head.startswith("ref:"):
+                ref = head[len("ref:"):].strip()
+                paths += [self.git_dir / ref, self.common_dir / ref]
+        except OSError:
+            pass
+
+        signature = []
+        for path in paths:
+            try:
+                signature.append(path.stat().st_mtime_ns)
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _drain_inotify(self) -> bool:
+        """Read pending inotify events; True if any touched HEAD or refs"""
+        relevant = False
+        while True:
+            try:
+                data = os.read(self._inotify_fd, 64 * 1024)
+            except BlockingIOError:
+                return relevant
+            if not data:
+                return relevant
+
+            offset = 0
+            while offset + INOTIFY_EVENT.size <= len(data):
+                wd, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+                offset += INOTIFY_EVENT.size
+                name = data[offset:offset + length].rstrip(b"\0").decode(errors="replace")
+                offset += length
+
+                directory = self._watch_dirs.get(wd)
+                if directory is None:
+                    continue
+                if directory in (self.git_dir, self.common_dir) and name not in REF_FILE_NAMES:
+                    continue  # index, index.lock, ORIG_HEAD, ...
+
+                relevant = True
+                # New branch namespaces (refs/heads/feature/...) need their own watch
+                if mask & IN_CREATE and "refs" in directory.parts:
+                    new_dir = directory / name
+                    if new_dir.is_dir():
+                        wd = self._libc.inotify_add_watch(self._inotify_fd, os.fsencode(new_dir), INOTIFY_MASK)
+                        if wd >= 0:
+                            self._watch_dirs[wd] = new_dir
+
+    def _wait_event(self, timeout: Optional[float]) -> bool:
+        """Wait for a possibly relevant ref event"""
+        if self.backend == "inotify":
+            readable, _, _ = select.select([self._inotify_fd], [], [], timeout)
+            return bool(readable) and self._drain_inotify()
+
+        if self.backend == "kqueue":
+            return bool(self._kqueue.control(None, 16, timeout))
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        signature = self._ref_stat_signature()
+        while deadline is None or time.monotonic() < deadline:
+            time.sleep(POLL_SECONDS)
+            if self._ref_stat_signature() != signature:
+                return True
+        return False
+
+    def wait_for_change(self, timeout: Optional[float] = None) -> Optional[str]:
+        """Block until HEAD resolves to a new commit
+
+        Bursts of ref updates are debounced: the new commit is reported once refs
+        have been quiet for `debounce` seconds, and never later than `max_delay`
+        after the first event.
+
+        Returns:
+            The new commit hash, or None if `timeout` elapsed first
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if remaining == 0.0:
+                return None
+
+            if not self._wait_event(remaining):
+                # Also covers missed events: a plain file read is cheap
+                commit = read_head_commit(self.root)
+                if commit and commit != self.last_commit:
+                    self.last_commit = commit
+                    return commit
+                continue
+
+            first_event = last_event = time.monotonic()
+            while True:
+                now = time.monotonic()
+                quiet_for = min(last_event + self.debounce, first_event + self.max_delay) - now
+                if quiet_for <= 0:
+                    break
+                if self._wait_event(quiet_for):
+                    last_event = time.monotonic()
+
+            commit = read_head_commit(self.root)
+            if commit and commit != self.last_commit:
+                self.last_commit = commit
+                return commit
+
+
+def main():
+    watcher = GitHeadWatcher()
+    print(f"👁️  Watching {watcher.git_dir} for commits ({watcher.backend} backend)")
+    print(f"   HEAD: {watcher.last_commit}")
+
+    try:
+        while True:
+            commit = watcher.wait_for_change()
+            print(f"📝 [{time.strftime('%H:%M:%S')}] HEAD -> {commit}")
+    except KeyboardInterrupt:
+        watcher.close()
+
+
+if __name__ == "__main__":
+    main()
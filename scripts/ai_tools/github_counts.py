@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+GitHub Counts - Issue counts via one GraphQL totalCount query
+Replaces counting the entries of `gh issue list` (capped at its --limit) with
+exact counts, cached briefly on disk so every tool shares one request
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+COUNTS_CACHE_FILE = PROJECT_ROOT / ".ai_gh_counts.json"
+
+# Seconds a cached count is reused before GitHub is asked again
+COUNT_TTL = 60
+
+# name -> (state, labels); state is OPEN, CLOSED or None for both
+COUNT_QUERIES = {
+    "open": ("OPEN", []),
+    "closed": ("CLOSED", []),
+    "urgent_open": ("OPEN", ["urgent"]),
+    "ai_generated_open": ("OPEN", ["ai-generated"]),
+}
+
+_memory_cache: Dict[str, dict] = {}
+
+
+def _load_cache() -> Dict[str, dict]:
+    if COUNTS_CACHE_FILE.exists():
+        try:
+            with open(COUNTS_CACHE_FILE) as f:
+                _memory_cache.update(json.load(f))
+        except (OSError, json.JSONDecodeError):
+            pass
+    return _memory_cache
+
+
+def _save_cache():
+    # Per-process temp name: several tools may refresh the cache at once
+    temp_file = COUNTS_CACHE_FILE.with_suffix(f".json.{os.getpid()}.tmp")
+    try:
+        with open(temp_file, 'w') as f:
+            json.dump(_memory_cache, f, indent=2)
+        temp_file.replace(COUNTS_CACHE_FILE)
+    except OSError as e:
+        print(f"⚠️  Could not save issue count cache: {e}")
+
+
+def build_count_query(names: List[str]) -> str:
+    """One GraphQL query with an aliased totalCount field per count"""
+    fields = []
+    for name in names:
+        state, labels = COUNT_QUERIES[name]
+        args = []
+        if state:
+            args.append(f"states: {state}")
+        if labels:
+            args.append(f"labels: {json.dumps(labels)}")
+        filters = f"({', '.join(args)})" if args else ""
+        fields.append(f"{name}: issues{filters} {{ totalCount }}")
+
+    return (
+        "query($owner: String!, $name: String!) {\n"
+        "  repository(owner: $owner, name: $name) {\n    "
+        + "\n    ".join(fields)
+        + "\n  }\n}"
+    )
+
+
+def fetch_counts(names: List[str]) -> Optional[Dict[str, int]]:
+    """Query GitHub for the given counts; None if gh fails"""
+    try:
+        result = subprocess.run(
+            ["gh", "api", "graphql",
+             "-f", f"query={build_count_query(names)}",
+             # gh fills {owner}/{repo} from the current repository
+             "-F", "owner={owner}", "-F", "name={repo}"],
+            capture_output=True,
+            text=True,
+            timeout=30
+        )
+        if result.returncode != 0:
+            return None
+        repository = json.loads(result.stdout)["data"]["repository"]
+        return {name: repository[name]["totalCount"] for name in names}
+    except (subprocess.TimeoutExpired, OSError, KeyError, TypeError, json.JSONDecodeError):
+        return None
+
+
+def issue_counts(*names: str, max_age: float = COUNT_TTL) -> Dict[str, int]:
+    """Exact issue counts by name (see COUNT_QUERIES)
+
+    Counts younger than `max_age` come from the cache; the rest are fetched in a
+    single request. If GitHub is unreachable, stale counts (or 0) are returned.
+    """
+    names = list(names) or list(COUNT_QUERIES)
+    cache = _load_cache()
+    now = time.time()
+
+    stale = [n for n in names if n not in cache or now - cache[n]["time"] >= max_age]
+    if stale:
+        fetched = fetch_counts(stale)
+        if fetched is not None:
+            for name, count in fetched.items():
+                cache[name] = {"count": count, "time": now}
+            _save_cache()
+
+    return {name: cache.get(name, {}).get("count", 0) for name in names}
+
+
+def main():
+    counts = issue_counts(max_age=0 if "--refresh" in sys.argv else COUNT_TTL)
+    for name, count in counts.items():
+        print(f"   {name:<20} {count}")
+
+
+if __name__ == "__main__":
+    main()
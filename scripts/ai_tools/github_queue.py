@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+GitHub Queue - Write-behind queue for issue creates, comments, edits and closes
+Tasks append tracker mutations to a durable queue on disk instead of calling
+gh inline; a background thread drains it. Pending writes for one issue are
+coalesced (an in-progress and a completed update become one comment and a
+close), calls are spaced out, and failures back off and retry, surviving
+restarts. Issue creation is deferred too: updates for a task whose issue does
+not exist yet wait behind its create
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+QUEUE_FILE = PROJECT_ROOT / ".ai_github_queue.json"
+
+# Seconds a write waits before it is sent, so updates that follow in quick
+# succession (failed, retrying, in progress) go out as one comment
+WRITE_DELAY = 15
+# Minimum seconds between gh calls (GitHub's secondary rate limit is
+# triggered by bursts of content-creating requests)
+MIN_INTERVAL = float(os.environ.get("AI_GH_MIN_INTERVAL", "1.0"))
+# Backoff after a failed call: doubles per attempt up to the cap
+RETRY_DELAY = 30
+MAX_RETRY_DELAY = 900
+MAX_ATTEMPTS = 10
+# Pause for the whole queue when GitHub reports a rate limit
+RATE_LIMIT_PAUSE = 60
+# Seconds close() keeps draining before leaving the rest for the next run
+FLUSH_SECONDS = 30
+# Dropped writes kept in the queue file for inspection
+MAX_DROPPED = 50
+
+REQUIRED_LABELS = [
+    ("ai-generated", "AI generated task", "0366d6"),
+    ("build-error", "Build validation failure", "d73a4a"),
+    ("urgent", "Requires immediate attention", "b60205"),
+] + [(f"stage-{stage}", f"Development stage {stage}", "fbca04") for stage in range(1, 13)]
+
+RATE_LIMIT_RE = re.compile(r'rate limit|submitted too quickly|abuse detection', re.I)
+# Errors retrying will not fix
+PERMANENT_RE = re.compile(r'could not resolve to an? |not found|HTTP 404|HTTP 410|HTTP 422', re.I)
+
+# Order of a coalesced batch for one issue
+KIND_ORDER = ["create", "checkboxes", "comment", "close"]
+
+
+def check_deliverables(body: str, root: Path = PROJECT_ROOT) -> tuple:
+    """Tick `- [ ] `path`` lines whose file exists; returns (body, all complete)"""
+    lines = []
+    all_complete = True
+    for line in body.split('\n'):
+        if '- [ ]' in line and '`' in line:
+            match = re.search(r'`([^`]+)`', line)
+            if match:
+                if (root / match.group(1).strip()).exists():
+                    line = line.replace('- [ ]', '- [x]')
+                else:
+                    all_complete = False
+        lines.append(line)
+    return '\n'.join(lines), all_complete
+
+
+class GhError(Exception):
+    def __init__(self, message: str, rate_limited: bool = False, permanent: bool = False):
+        super().__init__(message)
+        self.rate_limited = rate_limited
+        self.permanent = permanent
+
+
+class GitHubQueue:
+    """Durable queue of issue writes for tasks, drained by a background thread
+
+    Writes are keyed by task ID. `lookup(task_id)` returns the task's issue
+    number once known; `on_created(task_id, number)` records a new issue.
+    """
+
+    def __init__(self, lookup: Callable[[str], Optional[int]], on_created: Callable[[str, int], None],
+                 queue_file: Path = QUEUE_FILE):
+        self.lookup = lookup
+        self.on_created = on_created
+        self.queue_file = queue_file
+        self.changed = threading.Condition()
+        self.state = self.load()
+        self.thread: Optional[threading.Thread] = None
+        self.running = False
+        self.flushing = False
+        self.busy = False
+        self.last_call = 0.0
+        self.paused_until = 0.0
+        self.labels_ensured = False
+
+    def load(self) -> dict:
+        if self.queue_file.exists():
+            try:
+                with open(self.queue_file) as f:
+                    state = json.load(f)
+                state.setdefault("ops", [])
+                state.setdefault("next_seq", len(state["ops"]) + 1)
+                state.setdefault("dropped", [])
+                return state
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"⚠️  Could not read GitHub queue, starting empty: {e}")
+        return {"ops": [], "next_seq": 1, "dropped": []}
+
+    def save(self):
+        """Write the queue (caller holds self.changed)"""
+        temp_file = self.queue_file.with_suffix(".json.tmp")
+        try:
+            with open(temp_file, 'w') as f:
+                json.dump(self.state, f, indent=2)
+            temp_file.replace(self.queue_file)
+        except OSError as e:
+            print(f"⚠️  Could not save GitHub queue: {e}")
+
+    # Enqueueing
+
+    def enqueue(self, kind: str, task_id: str, issue: Optional[int] = None, **payload):
+        with self.changed:
+            if kind == "create" and any(op["kind"] == "create" and op["task_id"] == task_id
+                                        for op in self.state["ops"]):
+                return
+            self.state["ops"].append({
+                "seq": self.state["next_seq"], "kind": kind, "task_id": task_id, "issue": issue,
+                "queued": time.time(), "attempts": 0, "not_before": 0.0, **payload,
+            })
+            self.state["next_seq"] += 1
+            self.save()
+            self.changed.notify_all()
+
+    def create_issue(self, task_id: str, title: str, body: str, labels: List[str]):
+        self.enqueue("create", task_id, title=title, body=body, labels=labels)
+
+    def comment(self, task_id: str, issue: Optional[int], body: str):
+        self.enqueue("comment", task_id, issue, body=body)
+
+    def update_checkboxes(self, task_id: str, issue: Optional[int]):
+        self.enqueue("checkboxes", task_id, issue)
+
+    def close_issue(self, task_id: str, issue: Optional[int]):
+        self.enqueue("close", task_id, issue)
+
+    def has_issue(self, task_id: str) -> bool:
+        """Whether the task has an issue, or one is queued for creation"""
+        if self.lookup(task_id):
+            return True
+        with self.changed:
+            return any(op["kind"] == "create" and op["task_id"] == task_id for op in self.state["ops"])
+
+    def pending(self) -> int:
+        with self.changed:
+            return len(self.state["ops"])
+
+    # Draining
+
+    def start(self):
+        if self.thread:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._drain_loop, daemon=True)
+        self.thread.start()
+
+    def close(self, timeout: float = FLUSH_SECONDS):
+        """Send what can be sent within `timeout`; the rest stays queued on disk"""
+        if not self.thread:
+            return
+        deadline = time.time() + timeout
+        with self.changed:
+            self.flushing = True
+            self.changed.notify_all()
+            while (self.state["ops"] or self.busy) and time.time() < deadline:
+                if not self.busy and self.next_ready() > deadline:
+                    break  # everything left is backing off past the deadline
+                self.changed.wait(min(1.0, max(0.0, deadline - time.time())))
+            self.running = False
+            self.changed.notify_all()
+            left = len(self.state["ops"])
+        self.thread.join(timeout=5)
+        self.thread = None
+        if left:
+            print(f"📮 {left} GitHub update(s) left queued for the next run")
+
+    def next_ready(self) -> float:
+        """When the next write may be sent, ignoring the write delay (caller holds the lock)"""
+        if not self.state["ops"]:
+            return float("inf")
+        return max(self.paused_until, min(op["not_before"] for op in self.state["ops"]))
+
+    def next_batch(self) -> Optional[List[dict]]:
+        """Oldest ready write and every other write queued for its task (caller holds the lock)"""
+        now = time.time()
+        if now < self.paused_until:
+            return None
+        delay = 0 if self.flushing else WRITE_DELAY
+        for op in self.state["ops"]:
+            if op["queued"] + delay <= now and op["not_before"] <= now:
+                return [o for o in self.state["ops"] if o["task_id"] == op["task_id"] and o["not_before"] <= now]
+        return None
+
+    def _drain_loop(self):
+        while True:
+            with self.changed:
+                batch = self.next_batch()
+                while batch is None and self.running:
+                    self.changed.wait(1.0)
+                    batch = self.next_batch()
+                if not self.running:
+                    return
+                self.busy = True
+            try:
+                self.send(batch)
+            finally:
+                with self.changed:
+                    self.busy = False
+                    self.save()
+                    self.changed.notify_all()
+
+    def send(self, batch: List[dict]):
+        """Apply one task's coalesced writes, removing each part once GitHub has it"""
+        task_id = batch[0]["task_id"]
+        by_kind = {kind: [op for op in batch if op["kind"] == kind] for kind in KIND_ORDER}
+        step = None
+        try:
+            issue = self.lookup(task_id) or next((op["issue"] for op in batch if op["issue"]), None)
+            if by_kind["create"] and not issue:
+                step = by_kind["create"]
+                issue = self.send_create(task_id, step[0])
+            self.done(by_kind["create"])
+
+            if not issue:
+                # No issue and none to create (it failed for good): nothing to update
+                self.drop(batch, "no issue to update")
+                return
+
+            comments = [op["body"] for op in by_kind["comment"]]
+            if by_kind["checkboxes"]:
+                step = by_kind["checkboxes"]
+                comments.append(self.send_checkboxes(issue))
+                self.done(step)
+            if comments:
+                step = by_kind["comment"]
+                # Successive updates for the issue read as one comment
+                self.gh("issue", "comment", str(issue), "--body", "\n\n---\n\n".join(c for c in comments if c))
+                self.done(step)
+            if by_kind["close"]:
+                step = by_kind["close"]
+                self.gh("issue", "close", str(issue))
+                self.done(step)
+        except GhError as e:
+            self.failed(batch, step, e)
+        except (ValueError, KeyError) as e:
+            self.failed(batch, step, GhError(f"unexpected gh output: {e}"))
+
+    def failed(self, batch: List[dict], step: Optional[List[dict]], error: GhError):
+        if error.rate_limited:
+            self.paused_until = time.time() + RATE_LIMIT_PAUSE
+            print(f"⏳ GitHub rate limit; pausing updates for {RATE_LIMIT_PAUSE}s")
+            return
+        with self.changed:
+            remaining = [op for op in batch if op in self.state["ops"]]
+        if error.permanent:
+            self.drop(step or remaining, str(error))
+            return
+        with self.changed:
+            for op in remaining:
+                op["attempts"] += 1
+                op["not_before"] = time.time() + min(MAX_RETRY_DELAY, RETRY_DELAY * 2 ** (op["attempts"] - 1))
+        if any(op["attempts"] >= MAX_ATTEMPTS for op in remaining):
+            self.drop(remaining, f"gave up after {MAX_ATTEMPTS} attempts: {error}")
+        else:
+            print(f"⚠️  GitHub update for {batch[0]['task_id']} failed, will retry: {error}")
+
+    def send_create(self, task_id: str, op: dict) -> int:
+        self.ensure_labels()
+        result = self.gh("issue", "create", "--title", op["title"], "--body", op["body"],
+                         "--label", ",".join(op["labels"]))
+        issue = int(result.stdout.strip().split('/')[-1])
+        self.on_created(task_id, issue)
+        print(f"✅ Created issue #{issue}: {op['title']}")
+        return issue
+
+    def send_checkboxes(self, issue: int) -> str:
+        """Tick delivered files in the issue body; returns the comment to post"""
+        body = json.loads(self.gh("issue", "view", str(issue), "--json", "body").stdout).get("body", "")
+        updated, all_complete = check_deliverables(body)
+        if updated != body:
+            self.gh("issue", "edit", str(issue), "--body", updated)
+        if all_complete:
+            print(f"✅ All deliverables complete for GitHub issue #{issue}")
+            return "✅ **All Deliverables Completed**\n\nAll missing files have been created and verified."
+        print(f"📝 Partial progress on GitHub issue #{issue}")
+        return ("🔄 **Progress Update**\n\nSome deliverables have been completed. Updated checkboxes above. "
+                "Issue will be closed to prevent re-processing - remaining items should be caught by validation.")
+
+    def ensure_labels(self):
+        """Create missing labels, once per run (one list call instead of one per label)"""
+        if self.labels_ensured:
+            return
+        result = self.gh("label", "list", "--json", "name", "--limit", "200")
+        existing = {label["name"] for label in json.loads(result.stdout)}
+        for name, description, color in REQUIRED_LABELS:
+            if name not in existing:
+                self.gh("label", "create", name, "--description", description, "--color", color)
+                print(f"📋 Created label: {name}")
+        self.labels_ensured = True
+
+    def gh(self, *args: str) -> subprocess.CompletedProcess:
+        wait = self.last_call + MIN_INTERVAL - time.time()
+        if wait > 0:
+            time.sleep(wait)
+        self.last_call = time.time()
+        try:
+            result = subprocess.run(["gh", *args], capture_output=True, text=True, timeout=60)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            raise GhError(f"gh {args[0]} {args[1]}: {e}")
+        if result.returncode != 0:
+            error = result.stderr.strip() or result.stdout.strip()
+            raise GhError(f"gh {args[0]} {args[1]}: {error[:300]}",
+                          rate_limited=bool(RATE_LIMIT_RE.search(error)),
+                          permanent=bool(PERMANENT_RE.search(error)))
+        return result
+
+    def done(self, ops: List[dict]):
+        with self.changed:
+            for op in ops:
+                if op in self.state["ops"]:
+                    self.state["ops"].remove(op)
+            self.save()
+
+    def drop(self, ops: List[dict], reason: str):
+        with self.changed:
+            for op in ops:
+                if op in self.state["ops"]:
+                    self.state["ops"].remove(op)
+                    self.state["dropped"].append({**op, "reason": reason, "dropped": time.time()})
+            self.state["dropped"] = self.state["dropped"][-MAX_DROPPED:]
+            self.save()
+        if ops:
+            print(f"⚠️  Dropped {len(ops)} GitHub update(s) for {ops[0]['task_id']}: {reason}")
+
+
+def describe(op: dict) -> str:
+    target = f"#{op['issue']}" if op.get("issue") else op["task_id"]
+    detail = op.get("title") or (op.get("body") or "").split('\n')[0]
+    retry = f" (attempt {op['attempts'] + 1})" if op["attempts"] else ""
+    return f"{op['kind']:<10} {target:<16} {detail[:60]}{retry}"
+
+
+def main():
+    progress_file = PROJECT_ROOT / ".ai_progress.json"
+
+    def load_progress() -> dict:
+        return json.loads(progress_file.read_text()) if progress_file.exists() else {}
+
+    def record(task_id: str, issue: int):
+        progress = load_progress()
+        progress.setdefault("github_issues", {})[task_id] = issue
+        temp_file = progress_file.with_suffix(".json.tmp")
+        temp_file.write_text(json.dumps(progress, indent=2))
+        temp_file.replace(progress_file)
+
+    queue = GitHubQueue(lambda task_id: load_progress().get("github_issues", {}).get(task_id), record)
+    if "--flush" in sys.argv:
+        # Only while the orchestrator is stopped: it owns the queue file when running
+        queue.start()
+        queue.close(timeout=float(sys.argv[sys.argv.index("--flush") + 1])
+                    if len(sys.argv) > sys.argv.index("--flush") + 1 else 300)
+        return
+
+    ops = queue.state["ops"]
+    print(f"📮 {len(ops)} GitHub update(s) queued")
+    for op in ops:
+        print(f"   {describe(op)}")
+    if "-v" in sys.argv and queue.state["dropped"]:
+        print("\n🗑️  Recently dropped:")
+        for op in queue.state["dropped"]:
+            print(f"   {describe(op)}: {op['reason']}")
+
+
+if __name__ == "__main__":
+    main()
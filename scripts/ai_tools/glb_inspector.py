@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+GLB Inspector - Reads glTF/GLB model stats without loading buffers
+Memory-maps the file and parses only the JSON chunk plus image headers, so a
+whole asset library can be audited against polygon/texture budgets in seconds
+"""
+
+import base64
+import json
+import mmap
+import struct
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+ASSETS_DIR = PROJECT_ROOT / "assets"
+
+GLB_MAGIC = b"glTF"
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+
+# Per-asset budgets; anything larger slows every Godot import and headless check
+BUDGETS = {
+    "max_file_mb": 20.0,
+    "max_triangles": 50000,
+    "max_vertices": 100000,
+    "max_texture_size": 2048,  # longest side, pixels
+}
+
+# glTF primitive modes
+MODE_TRIANGLES, MODE_TRIANGLE_STRIP, MODE_TRIANGLE_FAN = 4, 5, 6
+
+
+class GLBError(Exception):
+    """The file is not a readable glTF/GLB"""
+
+
+@dataclass
+class ModelStats:
+    path: str
+    file_size: int = 0
+    meshes: int = 0
+    vertices: int = 0
+    triangles: int = 0
+    textures: List[Tuple[int, int]] = field(default_factory=list)  # (width, height)
+    materials: int = 0
+    animations: int = 0
+
+    @property
+    def max_texture_size(self) -> int:
+        return max((max(size) for size in self.textures), default=0)
+
+    def over_budget(self, budgets: Dict[str, float] = BUDGETS) -> List[str]:
+        """Human-readable list of exceeded budgets (empty if within budget)"""
+        problems = []
+        if self.file_size / 1024 / 1024 > budgets["max_file_mb"]:
+            problems.append(f"file {self.file_size / 1024 / 1024:.1f} MB > {budgets['max_file_mb']} MB")
+        if self.triangles > budgets["max_triangles"]:
+            problems.append(f"{self.triangles} triangles > {budgets['max_triangles']}")
+        if self.vertices > budgets["max_vertices"]:
+            problems.append(f"{self.vertices} vertices > {budgets['max_vertices']}")
+        if self.max_texture_size > budgets["max_texture_size"]:
+            problems.append(f"{self.max_texture_size}px texture > {budgets['max_texture_size']}px")
+        return problems
+
+
+def image_size(header: bytes) -> Optional[Tuple[int, int]]:
+    """(width, height) from the first bytes of a PNG or JPEG"""
+    if header[:8] == b"\x89PNG\r\n\x1a\n" and header[12:16] == b"IHDR":
+        return struct.unpack(">II", header[16:24])
+
+    if header[:2] == b"\xff\xd8":
+        offset = 2
+        while offset + 9 < len(header):
+            if header[offset] != 0xFF:
+                offset += 1
+                continue
+            marker = header[offset + 1]
+            if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+                offset += 2
+                continue
+            length = struct.unpack(">H", header[offset + 2:offset + 4])[0]
+            # SOF0-SOF15 except DHT (C4), JPG (C8) and DAC (CC)
+            if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                height, width = struct.unpack(">HH", header[offset + 5:offset + 9])
+                return width, height
+            offset += 2 + length
+    return None
+
+
+def read_glb_chunks(mm) -> Tuple[dict, int, int]:
+    """Parse a mapped GLB: returns (json, bin_offset, bin_length)"""
+    magic, version, length = struct.unpack_from("<4sII", mm, 0)
+    if magic != GLB_MAGIC or version != 2:
+        raise GLBError("not a glTF 2.0 binary")
+
+    offset, document, bin_offset, bin_length = 12, None, 0, 0
+    while offset + 8 <= min(length, len(mm)):
+        chunk_length, chunk_type = struct.unpack_from("<II", mm, offset)
+        data_start = offset + 8
+        if chunk_type == CHUNK_JSON:
+            document = json.loads(mm[data_start:data_start + chunk_length])
+        elif chunk_type == CHUNK_BIN:
+            bin_offset, bin_length = data_start, chunk_length
+        offset = data_start + chunk_length
+
+    if document is None:
+        raise GLBError("GLB has no JSON chunk")
+    return document, bin_offset, bin_length
+
+
+def primitive_triangles(document: dict, primitive: dict) -> Tuple[int, int]:
+    """(vertices, triangles) of one mesh primitive, from accessor counts only"""
+    accessors = document.get("accessors", [])
+    position = primitive.get("attributes", {}).get("POSITION")
+    vertices = accessors[position]["count"] if position is not None else 0
+    indices = primitive.get("indices")
+    count = accessors[indices]["count"] if indices is not None else vertices
+
+    mode = primitive.get("mode", MODE_TRIANGLES)
+    if mode == MODE_TRIANGLES:
+        return vertices, count // 3
+    if mode in (MODE_TRIANGLE_STRIP, MODE_TRIANGLE_FAN):
+        return vertices, max(0, count - 2)
+    return vertices, 0  # points / lines
+
+
+def mesh_instances(document: dict) -> Dict[int, int]:
+    """How many nodes instance each mesh (meshes not placed in a node count once)"""
+    counts: Dict[int, int] = {}
+    for node in document.get("nodes", []):
+        if "mesh" in node:
+            counts[node["mesh"]] = counts.get(node["mesh"], 0) + 1
+    for index in range(len(document.get("meshes", []))):
+        counts.setdefault(index, 1)
+    return counts
+
+
+def inspect(path: Path) -> ModelStats:
+    """Stats for a .glb or .gltf file
+
+    Raises:
+        GLBError if the file cannot be parsed or its JSON does not describe a
+        valid model (bad indices, missing counts, wrong types)
+    """
+    path = Path(path)
+    stats = ModelStats(path=str(path), file_size=path.stat().st_size)
+    if stats.file_size == 0:
+        raise GLBError("empty file")
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        try:
+            if mm[:4] == GLB_MAGIC:
+                document, bin_offset, bin_length = read_glb_chunks(mm)
+            else:
+                document, bin_offset, bin_length = json.loads(mm[:]), 0, 0
+        except (struct.error, ValueError) as e:
+            raise GLBError(str(e))
+
+        # Indices, counts and types come straight from the file; any of them can be wrong
+        try:
+            meshes = document.get("meshes", [])
+            stats.meshes = len(meshes)
+            stats.materials = len(document.get("materials", []))
+            stats.animations = len(document.get("animations", []))
+            for index, instances in mesh_instances(document).items():
+                for primitive in meshes[index].get("primitives", []):
+                    vertices, triangles = primitive_triangles(document, primitive)
+                    stats.vertices += vertices * instances
+                    stats.triangles += triangles * instances
+
+            buffer_views = document.get("bufferViews", [])
+            for image in document.get("images", []):
+                header = b""
+                if "bufferView" in image and bin_length:
+                    view = buffer_views[image["bufferView"]]
+                    start = bin_offset + view.get("byteOffset", 0)
+                    header = mm[start:start + min(view["byteLength"], 64 * 1024)]
+                elif image.get("uri", "").startswith("data:"):
+                    encoded = image["uri"].split(",", 1)[1][:64 * 1024]
+                    header = base64.b64decode(encoded[:len(encoded) // 4 * 4])
+                elif image.get("uri"):
+                    image_path = path.parent / image["uri"]
+                    if image_path.exists():
+                        with open(image_path, "rb") as img:
+                            header = img.read(64 * 1024)
+                size = image_size(header)
+                if size:
+                    stats.textures.append(size)
+        except (AttributeError, IndexError, KeyError, TypeError, ValueError, struct.error) as e:
+            raise GLBError(f"malformed glTF: {type(e).__name__}: {e}")
+
+    return stats
+
+
+def iter_models(paths: List[Path]):
+    for path in paths:
+        if path.is_dir():
+            yield from sorted(p for p in path.rglob("*") if p.suffix.lower() in (".glb", ".gltf"))
+        else:
+            yield path
+
+
+def main():
+    args = sys.argv[1:]
+    budgets = dict(BUDGETS)
+    for name in BUDGETS:
+        flag = "--" + name.replace("_", "-")
+        if flag in args:
+            index = args.index(flag)
+            budgets[name] = float(args[index + 1])
+            del args[index:index + 2]
+
+    paths = [Path(a) for a in args] or [ASSETS_DIR]
+    over = 0
+    count = 0
+    print(f"{'Triangles':>10} {'Vertices':>10} {'Texture':>8} {'MB':>6}  Model")
+    for model in iter_models(paths):
+        count += 1
+        try:
+            stats = inspect(model)
+        except (GLBError, OSError) as e:
+            print(f"{'-':>10} {'-':>10} {'-':>8} {'-':>6}  {model}  ❌ {e}")
+            over += 1
+            continue
+
+        problems = stats.over_budget(budgets)
+        over += bool(problems)
+        flag = f"  ⚠️  {'; '.join(problems)}" if problems else ""
+        print(f"{stats.triangles:>10} {stats.vertices:>10} {stats.max_texture_size:>8} "
+              f"{stats.file_size / 1024 / 1024:>6.1f}  {model}{flag}")
+
+    print(f"\n🔍 {count} model(s) inspected, {over} over budget or unreadable")
+    if over:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Godot Diagnostics - Streaming parser for Godot headless output
+Turns stderr into structured diagnostics (file, line, severity, category,
+message) that are stored per commit and shared by the validator, the
+orchestrator and issue reporting
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DIAGNOSTICS_DIR = PROJECT_ROOT / ".validation_log" / "diagnostics"
+
+# "SCRIPT ERROR: ...", "ERROR: ...", "USER WARNING: ...", ...
+HEADER_RE = re.compile(r'^(?P<kind>SCRIPT ERROR|SCRIPT WARNING|USER ERROR|USER WARNING|ERROR|WARNING):\s*(?P<message>.*)$')
+# "   at: GDScript::reload (res://scripts/player.gd:42)"
+AT_RE = re.compile(r'^\s*at:\s*(?P<where>.*?)\s*\((?P<file>[^()]+?)(?::(?P<line>\d+))?\)\s*$')
+# Godot 3 / --check-only style: "res://scripts/player.gd:42 - Parse Error: ..."
+INLINE_RE = re.compile(r'^(?P<file>res://[^\s:]+):(?P<line>\d+)\s*-\s*(?P<message>.*)$')
+RES_PATH_RE = re.compile(r'(res://[^\s"\':)]+)(?::(\d+))?')
+
+# (message pattern, category), first match wins
+CATEGORY_RULES = [
+    (re.compile(r'Broken reference', re.I), "broken_reference"),
+    (re.compile(r'Failed to load script', re.I), "script_load"),
+    (re.compile(r'Pars(e|er) Error', re.I), "parse_error"),
+    (re.compile(r'(Failed loading resource|Cannot open file|does not exist|not found|Can\'t open)', re.I), "missing_resource"),
+    (re.compile(r'(Invalid (call|get|set|operands|access)|Attempt to call|null instance)', re.I), "runtime_error"),
+    (re.compile(r'(Identifier|Function|Signal) .* not (declared|found)', re.I), "undeclared_identifier"),
+    (re.compile(r'import', re.I), "import"),
+    (re.compile(r'shader', re.I), "shader"),
+]
+
+
+@dataclass
+class Diagnostic:
+    severity: str  # "error" or "warning"
+    category: str
+    message: str
+    file: Optional[str] = None  # project-relative path when the source is in the project
+    line: Optional[int] = None
+    where: Optional[str] = None  # engine function / source location from the "at:" line
+
+    def location(self) -> str:
+        if not self.file:
+            return "(engine)"
+        return f"{self.file}:{self.line}" if self.line else self.file
+
+    def key(self) -> str:
+        """Canonical one-line form used for deduplication"""
+        return f"{self.severity} {self.category} {self.file or '-'}: {self.message}"
+
+
+def categorize(kind: str, message: str) -> str:
+    for pattern, category in CATEGORY_RULES:
+        if pattern.search(message):
+            return category
+    return "script_error" if kind.startswith("SCRIPT") else "engine_error"
+
+
+def res_to_project(path: str) -> Optional[str]:
+    return path[len("res://"):] if path.startswith("res://") else None
+
+
+class GodotOutputParser:
+    """Incremental parser: feed lines as they arrive, collect diagnostics"""
+
+    def __init__(self):
+        self.pending: Optional[Diagnostic] = None
+        self.diagnostics: List[Diagnostic] = []
+
+    def _emit(self) -> Optional[Diagnostic]:
+        done, self.pending = self.pending, None
+        if done:
+            if done.file is None:
+                # No project frame in "at:"; fall back to a path in the message
+                match = RES_PATH_RE.search(done.message)
+                if match:
+                    done.file = res_to_project(match.group(1))
+                    done.line = int(match.group(2)) if match.group(2) else None
+            self.diagnostics.append(done)
+        return done
+
+    def feed(self, line: str) -> Optional[Diagnostic]:
+        """Consume one output line; returns a diagnostic once it is complete"""
+        line = line.rstrip('\n')
+
+        at = AT_RE.match(line)
+        if at and self.pending:
+            path = res_to_project(at.group("file"))
+            if path and self.pending.file is None:
+                self.pending.file = path
+                self.pending.line = int(at.group("line")) if at.group("line") else None
+            self.pending.where = self.pending.where or at.group("where")
+            return None
+
+        finished = self._emit()
+
+        header = HEADER_RE.match(line.strip())
+        inline = INLINE_RE.match(line.strip())
+        if header:
+            kind, message = header.group("kind"), header.group("message").strip()
+            self.pending = Diagnostic(
+                severity="error" if "ERROR" in kind else "warning",
+                category=categorize(kind, message),
+                message=message,
+            )
+        elif inline:
+            message = inline.group("message").strip()
+            self.pending = Diagnostic(
+                severity="warning" if message.lower().startswith("warning") else "error",
+                category=categorize("SCRIPT", message),
+                message=message,
+                file=res_to_project(inline.group("file")),
+                line=int(inline.group("line")),
+            )
+        return finished
+
+    def close(self) -> List[Diagnostic]:
+        self._emit()
+        return self.diagnostics
+
+
+def parse_lines(lines: Iterable[str]) -> Iterator[Diagnostic]:
+    """Stream diagnostics from an iterable of output lines"""
+    parser = GodotOutputParser()
+    for line in lines:
+        diagnostic = parser.feed(line)
+        if diagnostic:
+            yield diagnostic
+    last = parser._emit()
+    if last:
+        yield last
+
+
+def parse_output(text: str) -> List[Diagnostic]:
+    parser = GodotOutputParser()
+    for line in text.splitlines():
+        parser.feed(line)
+    return parser.close()
+
+
+def errors(diagnostics: Iterable[Diagnostic]) -> List[Diagnostic]:
+    return [d for d in diagnostics if d.severity == "error"]
+
+
+def files_with_errors(diagnostics: Iterable[Diagnostic]) -> List[str]:
+    """Project files that have at least one error, in first-seen order"""
+    files = []
+    for d in errors(diagnostics):
+        if d.file and d.file not in files:
+            files.append(d.file)
+    return files
+
+
+def diagnostics_text(diagnostics: Iterable[Diagnostic]) -> str:
+    """Canonical, deduplicated text of the errors (input for fingerprinting)"""
+    seen = []
+    for d in errors(diagnostics):
+        key = d.key()
+        if key not in seen:
+            seen.append(key)
+    return '\n'.join(seen)
+
+
+def format_diagnostics(diagnostics: List[Diagnostic], limit: int = 20) -> str:
+    """Compact markdown table for issues, comments and retry prompts"""
+    if not diagnostics:
+        return "No diagnostics"
+
+    ordered = errors(diagnostics) + [d for d in diagnostics if d.severity != "error"]
+    lines = ["| Severity | Location | Category | Message |", "|---|---|---|---|"]
+    for d in ordered[:limit]:
+        message = d.message.replace("|", "\\|")[:200]
+        lines.append(f"| {d.severity} | `{d.location()}` | {d.category} | {message} |")
+    if len(ordered) > limit:
+        lines.append(f"\n_... and {len(ordered) - limit} more_")
+    return '\n'.join(lines)
+
+
+def run_godot_check(cmd: List[str], timeout: int = 30, cwd: Optional[Path] = None):
+    """Run a Godot command, parsing stderr as it streams
+
+    Returns:
+        (returncode, diagnostics, stderr, stdout)
+
+    Raises:
+        subprocess.TimeoutExpired if Godot does not exit in time
+    """
+    process = subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, cwd=cwd
+    )
+    stdout_chunks: List[str] = []
+    reader = threading.Thread(target=lambda: stdout_chunks.append(process.stdout.read()), daemon=True)
+    reader.start()
+
+    timed_out = threading.Event()
+
+    def kill():
+        timed_out.set()
+        process.kill()
+
+    timer = threading.Timer(timeout, kill)
+    timer.start()
+    parser = GodotOutputParser()
+    stderr_lines = []
+    try:
+        for line in process.stderr:
+            stderr_lines.append(line)
+            parser.feed(line)
+        process.wait()
+    finally:
+        timer.cancel()
+        reader.join(timeout=5)
+
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(cmd, timeout)
+
+    return process.returncode, parser.close(), ''.join(stderr_lines), ''.join(stdout_chunks)
+
+
+class DiagnosticsStore:
+    """Diagnostics persisted per commit so every consumer reuses one parse"""
+
+    def __init__(self, directory: Path = DIAGNOSTICS_DIR):
+        self.directory = Path(directory)
+
+    def save(self, commit: str, diagnostics: List[Diagnostic], source: str = "godot"):
+        if not commit:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{commit}.json"
+        # Parallel tasks and worktrees can record the same commit at once
+        temp_file = path.with_suffix(f'.json.{os.getpid()}.{threading.get_ident()}.tmp')
+        with open(temp_file, 'w') as f:
+            json.dump({
+                "commit": commit,
+                "source": source,
+                "diagnostics": [asdict(d) for d in diagnostics],
+            }, f, indent=2)
+        temp_file.replace(path)
+
+    def load(self, commit: str) -> Optional[List[Diagnostic]]:
+        path = self.directory / f"{commit}.json"
+        if not path.exists():
+            return None
+        with open(path) as f:
+            return [Diagnostic(**d) for d in json.load(f).get("diagnostics", [])]
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] != "-":
+        store = DiagnosticsStore()
+        diagnostics = store.load(sys.argv[1])
+        if diagnostics is None:
+            print(f"No diagnostics stored for {sys.argv[1]}")
+            return
+    else:
+        diagnostics = parse_output(sys.stdin.read())
+
+    print(format_diagnostics(diagnostics, limit=100))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Ollama Client - Native generation backend for orchestrator tasks
+Streams /api/chat from the local Ollama server with a fixed system prompt (edit
+format, shared task rules and the development plan) so the server's prompt
+cache covers that prefix across tasks, and applies the model's SEARCH/REPLACE
+edits to the checkout
+"""
+
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DEV_PLAN = PROJECT_ROOT / "development_plan.md"
+
+# Same variable the ollama CLI uses ("127.0.0.1:11434" or a full URL)
+OLLAMA_HOST = os.environ.get("OLLAMA_HOST", "http://127.0.0.1:11434")
+# Changing num_ctx reloads the model (and drops its cache), so it is fixed per run
+NUM_CTX = int(os.environ.get("OLLAMA_NUM_CTX", "16384"))
+KEEP_ALIVE = "30m"
+TEMPERATURE = 0.2
+GENERATION_TIMEOUT = 600  # same budget as an aider run
+
+EDIT_FORMAT = """You are an expert Godot 4 game developer working in an existing project.
+Reply with the changes to make as SEARCH/REPLACE blocks, one per edit:
+
+path/to/file.gd
+<<<<<<< SEARCH
+exact existing lines to replace
+=======
+new lines
+>>>>>>> REPLACE
+
+- Put the file path, relative to the project root, alone on the line before each block
+- SEARCH must match the current file exactly, including indentation; keep it short but unique
+- To create a new file, or append to one, leave SEARCH empty
+- Only edit files you were shown or that the task asks you to create
+"""
+
+SEARCH_MARK = "<<<<<<< SEARCH"
+DIVIDER = "======="
+REPLACE_MARK = ">>>>>>> REPLACE"
+
+
+class OllamaError(Exception):
+    """The server rejected the request or the stream ended with an error"""
+
+
+class PatchError(Exception):
+    """An edit could not be applied; nothing was written"""
+
+
+def base_url(host: str = OLLAMA_HOST) -> str:
+    host = host.strip().rstrip("/")
+    return host if "://" in host else f"http://{host}"
+
+
+def ollama_model(model: str) -> str:
+    """Ollama tag from an aider/litellm model name ("ollama_chat/qwen2.5-coder:7b")"""
+    for prefix in ("ollama_chat/", "ollama/"):
+        if model.startswith(prefix):
+            return model[len(prefix):]
+    return model
+
+
+def build_system_prompt(rules: str, plan: Path = DEV_PLAN) -> str:
+    """Identical for every task of a run (the plan only changes between runs)"""
+    prompt = EDIT_FORMAT + rules
+    if plan.exists():
+        prompt += f"\nPROJECT PLAN ({plan.name}):\n{plan.read_text()}\n"
+    return prompt
+
+
+def render_files(paths: List[str], root: Path) -> str:
+    """Current contents of the task's files, as the model should see them"""
+    parts = []
+    for path in paths:
+        file_path = root / path
+        if file_path.is_file():
+            parts.append(f"{path}\n```\n{file_path.read_text(errors='replace')}\n```")
+        else:
+            parts.append(f"{path} (does not exist yet)")
+    return '\n\n'.join(parts)
+
+
+# Edits
+
+@dataclass
+class Edit:
+    path: str
+    search: str
+    replace: str
+
+
+def clean_path(line: str) -> str:
+    return line.strip().strip("`*#:").strip()
+
+
+def parse_edits(text: str) -> List[Edit]:
+    """SEARCH/REPLACE blocks from a model response (code fences are ignored)"""
+    edits = []
+    lines = text.splitlines()
+    path = None
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if line.strip() == SEARCH_MARK:
+            search, replace = [], []
+            i += 1
+            while i < len(lines) and lines[i].strip() != DIVIDER:
+                search.append(lines[i])
+                i += 1
+            i += 1
+            while i < len(lines) and lines[i].strip() != REPLACE_MARK:
+                replace.append(lines[i])
+                i += 1
+            if path:
+                edits.append(Edit(path, '\n'.join(search), '\n'.join(replace)))
+        elif line.strip() and not line.strip().startswith("```"):
+            path = clean_path(line)
+        i += 1
+    return edits
+
+
+def safe_path(root: Path, path: str) -> Path:
+    """Resolve an edit's path, refusing anything outside the checkout or misnamed"""
+    if not path or any(c in path for c in "`*<>|") or Path(path).is_absolute():
+        raise PatchError(f"Refusing to write {path!r}")
+    resolved = (root / path).resolve()
+    if root.resolve() not in resolved.parents:
+        raise PatchError(f"Refusing to write outside the project: {path}")
+    return resolved
+
+
+def apply_edit(content: Optional[str], edit: Edit) -> str:
+    if not edit.search.strip():
+        if content is None:
+            return edit.replace.rstrip('\n') + '\n'
+        return content.rstrip('\n') + '\n' + edit.replace.rstrip('\n') + '\n'
+    if content is None:
+        raise PatchError(f"{edit.path}: file does not exist")
+
+    if edit.search in content:
+        return content.replace(edit.search, edit.replace, 1)
+
+    # Models often get trailing whitespace wrong; match line by line without it
+    lines = content.split('\n')
+    wanted = [line.rstrip() for line in edit.search.split('\n')]
+    for start in range(len(lines) - len(wanted) + 1):
+        if [line.rstrip() for line in lines[start:start + len(wanted)]] == wanted:
+            return '\n'.join(lines[:start] + edit.replace.split('\n') + lines[start + len(wanted):])
+    raise PatchError(f"{edit.path}: SEARCH block does not match the file:\n{edit.search[:300]}")
+
+
+def apply_edits(edits: List[Edit], root: Path) -> List[str]:
+    """Apply all edits or none; returns the changed paths"""
+    contents: Dict[str, Optional[str]] = {}
+    for edit in edits:
+        target = safe_path(root, edit.path)
+        if edit.path not in contents:
+            contents[edit.path] = target.read_text() if target.is_file() else None
+        contents[edit.path] = apply_edit(contents[edit.path], edit)
+
+    for path, content in contents.items():
+        target = safe_path(root, path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(content)
+    return list(contents)
+
+
+# Generation
+
+class OllamaClient:
+    def __init__(self, host: str = OLLAMA_HOST, timeout: float = GENERATION_TIMEOUT):
+        self.url = base_url(host)
+        self.timeout = timeout
+
+    def chat(self, model: str, messages: List[dict],
+             should_stop: Optional[Callable[[], bool]] = None,
+             on_token: Optional[Callable[[str], None]] = None) -> dict:
+        """Stream one chat completion
+
+        Returns:
+            {"content", "stopped", "prompt_tokens", "prompt_seconds",
+             "eval_tokens", "eval_seconds", "load_seconds"}
+
+        Raises:
+            OllamaError, TimeoutError, urllib.error.URLError
+        """
+        payload = {
+            "model": ollama_model(model),
+            "messages": messages,
+            "stream": True,
+            "keep_alive": KEEP_ALIVE,
+            "options": {"num_ctx": NUM_CTX, "temperature": TEMPERATURE},
+        }
+        request = urllib.request.Request(
+            f"{self.url}/api/chat", data=json.dumps(payload).encode(),
+            headers={"Content-Type": "application/json"}
+        )
+        deadline = time.time() + self.timeout
+        content: List[str] = []
+        result = {"stopped": False}
+        try:
+            response = urllib.request.urlopen(request, timeout=60)
+        except urllib.error.HTTPError as e:
+            raise OllamaError(f"HTTP {e.code}: {e.read().decode(errors='replace')}")
+
+        with response:
+            for line in response:
+                if not line.strip():
+                    continue
+                try:
+                    chunk = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise OllamaError(f"Malformed stream line ({e}): {line[:200]!r}")
+                if "error" in chunk:
+                    raise OllamaError(chunk["error"])
+                token = chunk.get("message", {}).get("content", "")
+                if token:
+                    content.append(token)
+                    if on_token:
+                        on_token(token)
+                if chunk.get("done"):
+                    result.update(
+                        prompt_tokens=chunk.get("prompt_eval_count", 0),
+                        prompt_seconds=chunk.get("prompt_eval_duration", 0) / 1e9,
+                        eval_tokens=chunk.get("eval_count", 0),
+                        eval_seconds=chunk.get("eval_duration", 0) / 1e9,
+                        load_seconds=chunk.get("load_duration", 0) / 1e9,
+                    )
+                    break
+                if should_stop and should_stop():
+                    result["stopped"] = True
+                    break
+                if time.time() > deadline:
+                    raise TimeoutError(f"generation exceeded {self.timeout}s")
+            else:
+                raise OllamaError("The stream ended before the response was done")
+
+        result["content"] = ''.join(content)
+        return result
+
+
+def run_task(client: OllamaClient, model: str, rules: str, task_prompt: str, files: List[str],
+             root: Path, should_stop: Optional[Callable[[], bool]] = None,
+             on_token: Optional[Callable[[str], None]] = None) -> dict:
+    """Generate and apply one task's edits
+
+    Returns the chat result plus "changed" (paths written)
+
+    Raises:
+        PatchError if the response has no applicable edits
+    """
+    messages = [
+        {"role": "system", "content": build_system_prompt(rules)},
+        {"role": "user", "content": f"{render_files(files, root)}\n\nTASK:\n{task_prompt}"},
+    ]
+    dots = {"count": 0}
+
+    def progress(token: str):
+        if on_token:
+            on_token(token)
+        dots["count"] += 1
+        if dots["count"] % 200 == 0:
+            print(".", end="", flush=True)
+
+    result = client.chat(model, messages, should_stop=should_stop, on_token=progress)
+    if dots["count"] >= 200:
+        print()
+    result["changed"] = []
+    if result["stopped"]:
+        return result
+
+    edits = parse_edits(result["content"])
+    if not edits:
+        raise PatchError("The model returned no SEARCH/REPLACE edits")
+    result["changed"] = apply_edits(edits, root)
+    return result
+
+
+def main():
+    """Quick check: python3 ollama_client.py MODEL "prompt" (prints the stream and timings)"""
+    if len(sys.argv) < 3:
+        print("Usage: python3 ollama_client.py MODEL PROMPT")
+        sys.exit(1)
+    client = OllamaClient()
+    result = client.chat(sys.argv[1], [{"role": "user", "content": sys.argv[2]}],
+                         on_token=lambda t: print(t, end="", flush=True))
+    print(f"\n\n⏱️  prompt: {result.get('prompt_tokens', 0)} tokens in {result.get('prompt_seconds', 0):.2f}s, "
+          f"output: {result.get('eval_tokens', 0)} tokens in {result.get('eval_seconds', 0):.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Plan Tasks - Parses the task bullets of development_plan.md
+Shared by the orchestrator and the reporting tools; the parsed plan is cached
+and only re-read when the file's mtime changes
+"""
+
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from task_ids import content_id
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DEV_PLAN = PROJECT_ROOT / "development_plan.md"
+
+# path -> (mtime_ns, size, parsed tasks)
+_cache: Dict[Path, Tuple[int, int, List[tuple]]] = {}
+
+
+def iter_plan_tasks(content: str, positional: bool = False):
+    """Yield (stage, task_id, description) for every task in development_plan.md
+
+    IDs are content hashes (see task_ids.py); `positional` gives the old
+    S{stage}T{n} numbering instead, for migrating progress files.
+    """
+    current_stage = None
+    in_tasks_section = False
+    stage_counts: Dict[int, int] = {}
+    seen: Dict[str, int] = {}
+
+    for line in content.split('\n'):
+        # Detect stage header
+        stage_match = re.match(r'^## Stage (\d+)', line)
+        if stage_match:
+            current_stage = int(stage_match.group(1))
+            in_tasks_section = False
+            continue
+
+        # Detect tasks section
+        if line.startswith('### Tasks'):
+            in_tasks_section = True
+            continue
+
+        # Stop at next section
+        if line.startswith('###') and not line.startswith('### Tasks'):
+            in_tasks_section = False
+
+        # Parse task items
+        if in_tasks_section and line.startswith('- ') and current_stage:
+            task_desc = line[2:].strip()
+            if task_desc:
+                stage_counts[current_stage] = stage_counts.get(current_stage, 0) + 1
+                if positional:
+                    yield current_stage, f"S{current_stage}T{stage_counts[current_stage]}", task_desc
+                    continue
+                # Repeated bullets in a stage are numbered so their IDs stay distinct
+                task_id = content_id(current_stage, task_desc)
+                seen[task_id] = seen.get(task_id, 0) + 1
+                if seen[task_id] > 1:
+                    task_id += f"-{seen[task_id]}"
+                yield current_stage, task_id, task_desc
+
+
+def load_plan_tasks(path: Path = DEV_PLAN) -> Optional[List[tuple]]:
+    """(stage, task_id, description) for every plan task, or None without a plan"""
+    path = Path(path)
+    try:
+        stat = path.stat()
+    except OSError:
+        _cache.pop(path, None)
+        return None
+
+    cached = _cache.get(path)
+    if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+
+    tasks = list(iter_plan_tasks(path.read_text()))
+    _cache[path] = (stat.st_mtime_ns, stat.st_size, tasks)
+    return tasks
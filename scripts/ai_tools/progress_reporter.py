@@ -1,21 +1,56 @@
 #!/usr/bin/env python3
 """
 Progress Reporter - Generates status reports and updates GitHub
+Run with --daemon for a live dashboard that keeps its state in memory
 """
 
 import json
-import subprocess
+import sys
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
+
+from git_stats import GitStats
+from git_watch import read_head_commit
+from throughput import format_throughput_report
+from github_counts import issue_counts
+from validation_log import SUMMARY_FILE, VALIDATION_LOG_DIR, load_summary
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 PROGRESS_FILE = PROJECT_ROOT / ".ai_progress.json"
-VALIDATION_LOG = PROJECT_ROOT / ".validation_log.json"
+VALIDATION_SUMMARY_FILE = VALIDATION_LOG_DIR / SUMMARY_FILE
+
+# Dashboard redraw interval
+REFRESH_SECONDS = 1.0
+# How long GitHub counts are reused before gh is called again
+GITHUB_STATS_TTL = 120
+
+
+def file_mtime(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
 
 class ProgressReporter:
     def __init__(self):
         self.progress = self.load_progress()
-        self.validation_history = self.load_validation_history()
+        self.validation_summary = load_summary()
+        self._mtimes = {
+            PROGRESS_FILE: file_mtime(PROGRESS_FILE),
+            VALIDATION_SUMMARY_FILE: file_mtime(VALIDATION_SUMMARY_FILE),
+        }
+        # Git stats are cached per HEAD commit, GitHub stats for GITHUB_STATS_TTL
+        self.git_stats = GitStats()
+        self._git_stats = None
+        self._git_stats_head = None
+        self._github_stats = None
+        self._github_stats_time = float("-inf")
+        self.github_max_age = GITHUB_STATS_TTL
+        self._github_lock = threading.Lock()
 
     def load_progress(self):
         if PROGRESS_FILE.exists():
@@ -28,69 +63,66 @@ class ProgressReporter:
             "github_issues": {}
         }
 
-    def load_validation_history(self):
-        if VALIDATION_LOG.exists():
-            with open(VALIDATION_LOG) as f:
-                return json.load(f)
-        return {"validations": [], "errors": []}
+    def reload_changed(self) -> bool:
+        """Reload progress/validation state whose files changed on disk"""
+        changed = False
+        for path in (PROGRESS_FILE, VALIDATION_SUMMARY_FILE):
+            mtime = file_mtime(path)
+            if mtime == self._mtimes.get(path):
+                continue
+            self._mtimes[path] = mtime
+            changed = True
+            try:
+                if path == PROGRESS_FILE:
+                    self.progress = self.load_progress()
+                else:
+                    self.validation_summary = load_summary()
+            except (OSError, json.JSONDecodeError):
+                # Caught mid-write; retry on the next tick
+                self._mtimes[path] = None
+        return changed
 
     def get_git_stats(self):
-        """Get git statistics"""
-        # Total commits
-        commits = subprocess.run(
-            ["git", "rev-list", "--count", "HEAD"],
-            capture_output=True,
-            text=True
-        ).stdout.strip()
-
-        # Files changed
-        files_changed = subprocess.run(
-            ["git", "diff", "--name-only", "HEAD~5..HEAD"],
-            capture_output=True,
-            text=True
-        ).stdout.strip().split('\n')
-
+        """Get git statistics (only commits new since the last call are read)"""
+        head = read_head_commit(PROJECT_ROOT)
+        if self._git_stats is None or head != self._git_stats_head:
+            self.git_stats.update()
+            self._git_stats = {
+                "total_commits": self.git_stats.stats["total_commits"],
+                "recent_files": self.git_stats.recent_files()
+            }
+            self._git_stats_head = head
+        return self._git_stats
+
+    def get_github_stats(self, max_age: Optional[float] = None):
+        """Get GitHub issue statistics, reusing a recent result"""
+        max_age = self.github_max_age if max_age is None else max_age
+        with self._github_lock:
+            if self._github_stats is not None and time.monotonic() - self._github_stats_time < max_age:
+                return self._github_stats
+
+        stats = self._fetch_github_stats()
+        with self._github_lock:
+            self._github_stats = stats
+            self._github_stats_time = time.monotonic()
+        return stats
+
+    def _fetch_github_stats(self):
+        counts = issue_counts("open", "closed")
         return {
-            "total_commits": commits,
-            "recent_files": [f for f in files_changed if f]
+            "open": counts["open"],
+            "closed": counts["closed"],
+            "total": counts["open"] + counts["closed"]
         }
 
-    def get_github_stats(self):
-        """Get GitHub issue statistics"""
-        try:
-            # Open issues
-            open_result = subprocess.run(
-                ["gh", "issue", "list", "--state", "open", "--json", "number"],
-                capture_output=True,
-                text=True
-            )
-            open_issues = len(json.loads(open_result.stdout)) if open_result.returncode == 0 else 0
-
-            # Closed issues
-            closed_result = subprocess.run(
-                ["gh", "issue", "list", "--state", "closed", "--json", "number"],
-                capture_output=True,
-                text=True
-            )
-            closed_issues = len(json.loads(closed_result.stdout)) if closed_result.returncode == 0 else 0
-
-            return {
-                "open": open_issues,
-                "closed": closed_issues,
-                "total": open_issues + closed_issues
-            }
-        except:
-            return {"open": 0, "closed": 0, "total": 0}
-
     def generate_report(self):
         """Generate comprehensive progress report"""
         git_stats = self.get_git_stats()
         github_stats = self.get_github_stats()
 
         # Validation stats
-        total_validations = len(self.validation_history.get("validations", []))
-        successful_validations = sum(1 for v in self.validation_history.get("validations", [])
-                                    if v.get("success", False))
+        total_validations = self.validation_summary["total_validations"]
+        successful_validations = self.validation_summary["successful_validations"]
         validation_rate = (successful_validations / total_validations * 100) if total_validations > 0 else 0
 
         report = f"""
@@ -115,7 +147,9 @@ class ProgressReporter:
 🔍 BUILD VALIDATION
   Total Validations: {total_validations}
   Success Rate: {validation_rate:.1f}%
-  Build Errors: {len(self.validation_history.get('errors', []))}
+  Build Errors: {self.validation_summary['error_count']}
+
+{format_throughput_report(self.progress)}
 
 ⏰ LAST UPDATED
   {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
@@ -129,6 +163,37 @@ class ProgressReporter:
         """Display progress report in terminal"""
         print(self.generate_report())
 
+    def run_daemon(self, refresh: float = REFRESH_SECONDS):
+        """Redraw the report every `refresh` seconds until interrupted
+
+        State stays in memory: files are only re-read when their mtime changes,
+        git is only queried when HEAD moves and GitHub counts are refreshed in
+        the background once they are older than GITHUB_STATS_TTL.
+        """
+        stop = threading.Event()
+
+        def refresh_github():
+            while not stop.is_set():
+                self.get_github_stats(max_age=0)
+                stop.wait(GITHUB_STATS_TTL)
+
+        # Redraws only ever read the cache; gh runs on the background thread.
+        # Show zeros until the first result lands.
+        self.github_max_age = float("inf")
+        self._github_stats = {"open": 0, "closed": 0, "total": 0}
+        threading.Thread(target=refresh_github, daemon=True).start()
+
+        try:
+            while True:
+                self.reload_changed()
+                # Home + clear to end of screen avoids the flicker of a full clear
+                sys.stdout.write("\033[H\033[J" + self.generate_report())
+                sys.stdout.flush()
+                time.sleep(refresh)
+        except KeyboardInterrupt:
+            stop.set()
+            print()
+
     def update_readme(self):
         """Update README.md with progress badge/section"""
         readme_path = PROJECT_ROOT / "README.md"
@@ -184,10 +249,14 @@ class ProgressReporter:
 
 def main():
     reporter = ProgressReporter()
+
+    if "--daemon" in sys.argv:
+        reporter.run_daemon()
+        return
+
     reporter.display()
 
-    # Also update README if requested
-    import sys
+    # Also update README if requested (reuses the stats fetched for the report)
     if len(sys.argv) > 1 and sys.argv[1] == "--update-readme":
         reporter.update_readme()
 
@@ -8,9 +8,13 @@ import subprocess
 from pathlib import Path
 from datetime import datetime
 
+from github_counts import issue_counts
+from task_leases import LEASE_DIR, LeaseManager, format_resumable
+from throughput import format_throughput_report
+from validation_log import load_summary
+
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 PROGRESS_FILE = PROJECT_ROOT / ".ai_progress.json"
-VALIDATION_LOG = PROJECT_ROOT / ".validation_log.json"
 
 def load_progress():
     if PROGRESS_FILE.exists():
@@ -18,18 +22,12 @@ def load_progress():
             return json.load(f)
     return None
 
-def load_validation():
-    if VALIDATION_LOG.exists():
-        with open(VALIDATION_LOG) as f:
-            return json.load(f)
-    return None
-
-def get_github_issues():
-    """Get open GitHub issues"""
+def get_github_issues(limit: int = 5):
+    """Get the most recent open GitHub issues (see issue_counts for totals)"""
     try:
         result = subprocess.run(
             ["gh", "issue", "list", "--state", "open", "--label", "ai-generated",
-             "--json", "number,title,state"],
+             "--limit", str(limit), "--json", "number,title,state"],
             capture_output=True,
             text=True
         )
@@ -44,7 +42,7 @@ def main():
     print("=" * 80)
 
     progress = load_progress()
-    validation = load_validation()
+    validation = load_summary()
 
     if not progress:
         print("❌ No progress file found (.ai_progress.json)")
@@ -80,22 +78,42 @@ def main():
             print(f"   {task_id} (Issue #{issue_num})")
         print()
 
+    # Tasks stopped mid-run (checkpointed, or abandoned by a crashed run)
+    if LEASE_DIR.exists():
+        resumable = LeaseManager().resumable()
+        if resumable:
+            print("♻️  Interrupted Tasks (resume from their checkpoint on the next run):")
+            print(format_resumable(resumable))
+            print()
+
+    retries = progress.get("task_retries", {})
+    if retries:
+        print("🔁 Retrying Tasks:")
+        for task_id, entry in sorted(retries.items()):
+            last = entry["history"][-1] if entry["history"] else {}
+            print(f"   {task_id}: attempt {entry['attempts'] + 1} on {entry['model']} "
+                  f"(last: {last.get('kind')} - {last.get('reason')})")
+        print()
+
     # Validation history
-    if validation:
-        validations = validation.get("validations", [])
-        if validations:
-            recent = validations[-5:]
+    if validation["total_validations"]:
+        recent = validation["recent"][-5:]
+        if recent:
             success_count = sum(1 for v in recent if v.get("success", False))
             print(f"🔍 Recent Build Validations: {success_count}/{len(recent)} successful\n")
 
+    print(format_throughput_report(progress))
+    print()
+
     # GitHub status
     open_issues = get_github_issues()
     if open_issues:
-        print(f"🐙 Open GitHub Issues ({len(open_issues)}):")
-        for issue in open_issues[:5]:
+        open_count = max(issue_counts("ai_generated_open")["ai_generated_open"], len(open_issues))
+        print(f"🐙 Open GitHub Issues ({open_count}):")
+        for issue in open_issues:
             print(f"   #{issue['number']}: {issue['title']}")
-        if len(open_issues) > 5:
-            print(f"   ... and {len(open_issues) - 5} more")
+        if open_count > len(open_issues):
+            print(f"   ... and {open_count - len(open_issues)} more")
         print()
 
     # Resume instructions
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Retry Policy - Classifies task failures and decides how to retry them
+Transient failures (Ollama out of memory, network/gh timeouts, a Godot import
+race) are retried with jittered exponential backoff; capability failures are
+retried on the next larger model. A task is only given up on when it fails on
+the largest model or a transient cause persists
+"""
+
+import json
+import random
+import re
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from godot_diagnostics import Diagnostic, errors, format_diagnostics
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+TRANSIENT = "transient"
+CAPABILITY = "capability"
+
+# Transient retries in a row before giving up (a larger model would not help an
+# Ollama outage or OOM, so these never escalate)
+MAX_TRANSIENT_RETRIES = 5
+# Backoff ceiling doubles per retry: 30s, 60s, 120s ... capped; the delay is
+# drawn from the upper half of it so retries of different tasks spread out
+BACKOFF_BASE = 30
+BACKOFF_CAP = 15 * 60
+HISTORY_LIMIT = 10
+
+# (stderr signature, reason); first match wins. Only matched against process
+# errors, never the model's output, which quotes code such as `$Timer.timeout`
+TRANSIENT_SIGNATURES = [
+    (re.compile(r'out of memory|model requires more system memory|cudaMalloc failed|insufficient memory', re.I),
+     "Ollama out of memory"),
+    (re.compile(r'llama runner process (has )?terminated|server busy|model is (still )?loading', re.I),
+     "Ollama runner unavailable"),
+    (re.compile(r'connection (refused|reset|aborted)|APIConnectionError|Remote end closed|Max retries exceeded', re.I),
+     "connection error"),
+    (re.compile(r'error connecting to api\.github\.com|secondary rate limit|API rate limit exceeded', re.I),
+     "GitHub API unavailable"),
+    (re.compile(r'\b(HTTP|status code:?) ?(429|502|503|504)\b|Service Unavailable|Bad Gateway', re.I),
+     "server overloaded"),
+    (re.compile(r'\b(read|connect(ion)?|operation|request) timed out\b|urlopen error timed out|deadline exceeded', re.I),
+     "timeout"),
+    (re.compile(r"index\.lock'?:? File exists|Unable to create '.*\.lock'", re.I), "git lock held"),
+]
+# Killed by a signal (Popen reports -N, shells 128+N): OOM killer, shutdown of ollama
+SIGNAL_EXIT_CODES = {-9, -15, 137, 143}
+
+
+@dataclass
+class Failure:
+    """What went wrong in one task attempt"""
+    step: str  # "aider", "aider_timeout", "build", "build_timeout" or "worker_lost"
+    returncode: Optional[int] = None
+    output: str = ""  # everything the step printed, for reports and the retry prompt
+    stderr: str = ""  # the process's own error stream; the only text matched for transient causes
+    diagnostics: Optional[List[Diagnostic]] = None
+
+
+@dataclass
+class Decision:
+    action: str  # "retry", "escalate" or "give_up"
+    kind: str  # TRANSIENT or CAPABILITY
+    reason: str
+    model: str
+    delay: float = 0.0
+
+    def describe(self) -> str:
+        if self.action == "retry":
+            return f"{self.kind} failure ({self.reason}); retrying in {self.delay:.0f}s"
+        if self.action == "escalate":
+            return f"{self.kind} failure ({self.reason}); retrying with {self.model}"
+        if self.kind == TRANSIENT:
+            return f"{self.kind} failure ({self.reason}); giving up"
+        return f"{self.kind} failure ({self.reason}); no larger model left"
+
+
+def is_import_race(diagnostic: Diagnostic) -> bool:
+    """Errors caused by assets still being imported, not by the task's code"""
+    text = f"{diagnostic.file or ''} {diagnostic.message}"
+    return diagnostic.category == "import" or ".godot/imported" in text or ".import" in text
+
+
+def classify(failure: Failure) -> tuple:
+    """(TRANSIENT or CAPABILITY, reason)"""
+    if failure.step == "build_timeout":
+        return TRANSIENT, "Godot check timed out"
+    if failure.step == "worker_lost":
+        return TRANSIENT, "worker disconnected"
+    if failure.returncode in SIGNAL_EXIT_CODES:
+        return TRANSIENT, f"killed by signal (exit {failure.returncode})"
+
+    if failure.step == "build" and failure.diagnostics is not None:
+        build_errors = errors(failure.diagnostics)
+        if build_errors and all(is_import_race(d) for d in build_errors):
+            return TRANSIENT, "Godot import race"
+        if build_errors:
+            return CAPABILITY, f"{len(build_errors)} build error(s): {build_errors[0].message[:80]}"
+
+    for pattern, reason in TRANSIENT_SIGNATURES:
+        if pattern.search(failure.stderr):
+            return TRANSIENT, reason
+    if failure.step == "aider_timeout":
+        return TRANSIENT, "aider timed out"
+    if failure.step == "aider":
+        return CAPABILITY, f"aider exited with {failure.returncode}"
+    return CAPABILITY, "build verification failed"
+
+
+def model_size(model: str) -> float:
+    """Parameter count in billions from an Ollama tag ("qwen2.5-coder:14b" -> 14)"""
+    match = re.search(r':(\d+(?:\.\d+)?)b\b', model)
+    return float(match.group(1)) if match else 0.0
+
+
+def next_model(model: str, models: Dict[str, str]) -> Optional[str]:
+    """Smallest configured model larger than `model`"""
+    larger = [m for m in set(models.values()) if model_size(m) > model_size(model)]
+    return min(larger, key=model_size) if larger else None
+
+
+def backoff_delay(retry: int) -> float:
+    ceiling = min(BACKOFF_CAP, BACKOFF_BASE * 2 ** (retry - 1))
+    return random.uniform(ceiling / 2, ceiling)
+
+
+class RetryPolicy:
+    """Per-task retry state, kept in progress["task_retries"]"""
+
+    def __init__(self, progress: dict, models: Dict[str, str]):
+        self.state: Dict[str, dict] = progress.setdefault("task_retries", {})
+        self.models = models
+
+    def apply(self, task):
+        """Run a retried task on the model it was escalated to"""
+        entry = self.state.get(task.id)
+        if entry:
+            task.model = entry["model"]
+
+    def due(self, task_id: str, now: Optional[float] = None) -> bool:
+        entry = self.state.get(task_id)
+        return not entry or entry.get("next_attempt", 0) <= (time.time() if now is None else now)
+
+    def next_due(self) -> Optional[float]:
+        return min((e.get("next_attempt", 0) for e in self.state.values()), default=None)
+
+    def prompt_note(self, task_id: str) -> str:
+        """What went wrong last time, for the retry prompt"""
+        entry = self.state.get(task_id)
+        if not entry or not entry.get("last_error"):
+            return ""
+        return f"""
+PREVIOUS ATTEMPT FAILED ({entry['attempts']} attempt(s) so far):
+{entry['last_error']}
+Fix these problems as part of this task.
+"""
+
+    def on_failure(self, task, failure: Failure, now: Optional[float] = None) -> Decision:
+        now = time.time() if now is None else now
+        kind, reason = classify(failure)
+        entry = self.state.setdefault(task.id, {"attempts": 0, "transient": 0, "model": task.model, "history": []})
+        entry["attempts"] += 1
+        entry["history"] = (entry["history"] + [{
+            "ts": now, "model": entry["model"], "kind": kind, "reason": reason
+        }])[-HISTORY_LIMIT:]
+        if failure.step == "build" and failure.diagnostics:
+            entry["last_error"] = format_diagnostics(failure.diagnostics)
+        elif kind == CAPABILITY:
+            entry["last_error"] = failure.output.strip()[-1500:]
+
+        if kind == TRANSIENT:
+            entry["transient"] += 1
+            if entry["transient"] > MAX_TRANSIENT_RETRIES:
+                del self.state[task.id]
+                return Decision("give_up", kind, f"{reason}, {entry['transient']} times in a row", entry["model"])
+            delay = backoff_delay(entry["transient"])
+            entry["next_attempt"] = now + delay
+            return Decision("retry", kind, reason, entry["model"], delay)
+
+        larger = next_model(entry["model"], self.models)
+        if larger is None:
+            del self.state[task.id]
+            return Decision("give_up", kind, reason, entry["model"])
+        entry.update(model=larger, transient=0, next_attempt=now)
+        return Decision("escalate", kind, reason, larger)
+
+    def on_success(self, task_id: str):
+        self.state.pop(task_id, None)
+
+
+def main():
+    progress_file = PROJECT_ROOT / ".ai_progress.json"
+    progress = json.loads(progress_file.read_text()) if progress_file.exists() else {}
+    retries = progress.get("task_retries", {})
+    if not retries:
+        print("✅ No tasks waiting for a retry")
+        return
+
+    now = time.time()
+    for task_id, entry in sorted(retries.items()):
+        wait = max(0, entry.get("next_attempt", 0) - now)
+        last = entry["history"][-1] if entry["history"] else {}
+        print(f"🔁 {task_id}: attempt {entry['attempts'] + 1} on {entry['model']} "
+              f"{'now' if not wait else f'in {wait:.0f}s'} (last: {last.get('kind')}, {last.get('reason')})")
+        if "-v" in sys.argv:
+            for item in entry["history"]:
+                print(f"     {time.strftime('%H:%M:%S', time.localtime(item['ts']))} "
+                      f"{item['model']}: {item['kind']} - {item['reason']}")
+
+
+if __name__ == "__main__":
+    main()
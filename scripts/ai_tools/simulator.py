@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+Simulator - Discrete-event replay of the development plan for tuning the orchestrator
+Every development_plan.md task runs through the real scheduler (dependency DAG,
+critical-path order, worktree exclusivity) and retry policy on a virtual clock,
+with aider, Godot and gh latencies and failure rates fitted from .ai_metrics and
+.ai_logs. Policies are compared on makespan, loaded-model memory and gh calls
+"""
+
+import heapq
+import itertools
+import json
+import math
+import random
+import sqlite3
+import statistics
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List
+
+from admission_control import model_memory_gb
+from agent_orchestrator import DEV_PLAN, MODELS, AgentOrchestrator, Task, iter_plan_tasks
+from dependency_graph import DependencyGraph
+from github_counts import COUNT_TTL
+from ollama_client import KEEP_ALIVE
+from retry_policy import Failure, RetryPolicy, model_size
+from task_logs import INDEX_FILE
+from task_scheduler import MAX_FAILURES, TaskScheduler
+from throughput import EVENTS_FILE, FINAL_STAGE
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+# Task events a model needs before its fitted profile replaces the prior
+MIN_SAMPLES = 5
+DEFAULT_SIGMA = 0.6
+DEFAULT_TRANSIENT_SHARE = 0.3
+# Headless Godot check and a single gh call (lognormal median seconds, sigma)
+GODOT_LATENCY = (25.0, 0.5)
+GH_LATENCY = (0.8, 0.4)
+AIDER_TIMEOUT = 600
+# Ollama unloads an idle model after this; aider does not set keep_alive
+OLLAMA_DEFAULT_KEEP_ALIVE = 300
+# A campaign still running after this is reported as unfinished
+MAX_SIMULATED_DAYS = 60
+# Pause between iterations once a stage's pending tasks are done
+ITERATION_PAUSE = 5
+
+# gh calls the orchestrator makes, by occasion
+GH_CALLS = {
+    "labels": 1,  # label list, once per run
+    "issue_create": 1,
+    "attempt_start": 1,  # "in progress" comment
+    "failure": 1,  # "failed" comment
+    "retry": 0,  # "retrying" comment, coalesced with the failure's
+    "success": 2,  # "completed" comment and close
+    "iteration": 1,  # urgent backlog issue list
+    "counts": 1,  # progress summary issue counts, cached for COUNT_TTL
+}
+# Written behind by github_queue.py: counted, but tasks do not wait for them
+GH_BACKGROUND = {"labels", "issue_create", "attempt_start", "failure", "retry", "success"}
+
+TIERS = {model: tier for tier, model in MODELS.items()}
+
+
+@dataclass
+class ModelProfile:
+    """Latency of one aider run (lognormal) and how often it fails"""
+    median: float
+    sigma: float
+    failure_rate: float
+    transient_share: float
+    samples: int = 0
+
+
+def prior_profile(model: str) -> ModelProfile:
+    """Rough profile for a model without traces: larger models are slower and fail less"""
+    size = model_size(model) or 7.0
+    return ModelProfile(
+        median=90 + 15 * size,
+        sigma=DEFAULT_SIGMA,
+        failure_rate=min(0.5, max(0.1, 0.4 - 0.015 * size)),
+        transient_share=DEFAULT_TRANSIENT_SHARE,
+    )
+
+
+def fit_profiles(events_path: Path = EVENTS_FILE, index_path: Path = INDEX_FILE) -> Dict[str, ModelProfile]:
+    """Per-model profiles from recorded task durations and retry outcomes"""
+    durations: Dict[str, List[float]] = {}
+    failed: Dict[str, int] = {}
+    if events_path.exists():
+        with open(events_path) as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if event.get("kind") not in ("task_completed", "task_failed") or not event.get("model"):
+                    continue
+                # Durations include the Godot check, which is modelled separately
+                overhead = GODOT_LATENCY[0]
+                durations.setdefault(event["model"], []).append(max(10.0, event.get("duration", 0.0) - overhead))
+                if event["kind"] == "task_failed":
+                    failed[event["model"]] = failed.get(event["model"], 0) + 1
+
+    transient: Dict[str, List[int]] = {}
+    if index_path.exists():
+        connection = sqlite3.connect(index_path)
+        try:
+            rows = connection.execute(
+                "SELECT model, outcome FROM runs WHERE outcome LIKE '%(transient)' OR outcome LIKE '%(capability)'"
+            ).fetchall()
+        except sqlite3.Error:
+            rows = []
+        finally:
+            connection.close()
+        for model, outcome in rows:
+            counts = transient.setdefault(model, [0, 0])
+            counts[0 if outcome.endswith("(transient)") else 1] += 1
+
+    profiles = {}
+    for model, samples in durations.items():
+        if len(samples) < MIN_SAMPLES:
+            continue
+        logs = [math.log(d) for d in samples]
+        kinds = transient.get(model, [0, 0])
+        profiles[model] = ModelProfile(
+            median=math.exp(statistics.mean(logs)),
+            sigma=max(0.1, statistics.pstdev(logs)),
+            failure_rate=failed.get(model, 0) / len(samples),
+            transient_share=kinds[0] / sum(kinds) if sum(kinds) >= MIN_SAMPLES else DEFAULT_TRANSIENT_SHARE,
+            samples=len(samples),
+        )
+    return profiles
+
+
+def parse_duration(value: str) -> float:
+    """Ollama keep_alive string ("30m", "1h", "90s") in seconds"""
+    units = {"s": 1, "m": 60, "h": 3600}
+    if value and value[-1] in units:
+        return float(value[:-1]) * units[value[-1]]
+    return float(value)
+
+
+@dataclass
+class Policy:
+    max_tasks: int = 5
+    max_parallel: int = 1
+    timeout: float = AIDER_TIMEOUT
+    models: Dict[str, str] = field(default_factory=lambda: dict(MODELS))
+    keep_alive: float = OLLAMA_DEFAULT_KEEP_ALIVE
+    # Slowdown of generation with k tasks sharing the GPU: k ** contention
+    contention: float = 0.5
+
+    def describe(self) -> str:
+        return f"-j {self.max_parallel}, {self.max_tasks}/iter, timeout {self.timeout:.0f}s"
+
+
+@dataclass
+class SimResult:
+    makespan: float = 0.0
+    completed: int = 0
+    given_up: int = 0
+    unfinished: int = 0
+    attempts: int = 0
+    retries: int = 0
+    escalations: int = 0
+    halts: int = 0  # runs stopped for review after MAX_FAILURES
+    peak_memory_gb: float = 0.0
+    gh_calls: int = 0
+
+
+class SimulatedScheduler(TaskScheduler):
+    """The orchestrator's scheduler, with tasks finishing on the simulation clock"""
+
+    def run(self, max_tasks: int, on_result) -> Dict[str, set]:
+        sim = self.orchestrator
+        pending = set(self.nodes)
+        running: Dict[str, object] = {}
+        finishing: List[tuple] = []
+        dispatched = 0
+        sequence = itertools.count()
+
+        while True:
+            for node in [self.nodes[i] for i in pending if self.is_blocked(self.nodes[i])]:
+                pending.discard(node.id)
+                self.deferred.add(node.id)
+
+            if len(self.failed) < MAX_FAILURES:
+                for node in self.ready_queue(pending):
+                    if dispatched >= max_tasks or len(running) >= self.max_parallel:
+                        break
+                    if not self.can_start(node, running):
+                        continue
+                    pending.discard(node.id)
+                    running[node.id] = node
+                    seconds = sim.start(node.task, len(running))
+                    heapq.heappush(finishing, (sim.clock + seconds, next(sequence), node, sim.clock))
+                    dispatched += 1
+
+            if not finishing:
+                break
+
+            finished_at, _, node, started_at = heapq.heappop(finishing)
+            sim.clock = max(sim.clock, finished_at)
+            del running[node.id]
+            sim.finish(node.task)
+            success = node.id not in sim.failures
+            if on_result(node.task, success, finished_at - started_at):
+                self.deferred.add(node.id)
+            elif success:
+                self.done.add(node.id)
+            else:
+                self.failed.add(node.id)
+
+        return {"done": self.done, "failed": self.failed, "deferred": self.deferred, "not_started": pending}
+
+
+class Simulation:
+    """One campaign through the plan under a policy; stands in for the orchestrator"""
+
+    # The orchestrator's own file and model rules (they use no instance state)
+    get_files_for_task = AgentOrchestrator.get_files_for_task
+    determine_model = AgentOrchestrator.determine_model
+
+    def __init__(self, policy: Policy, profiles: Dict[str, ModelProfile], plan: List[tuple],
+                 graph: DependencyGraph, seed: int = 0):
+        self.policy = policy
+        self.profiles = profiles
+        self.plan = plan
+        self.graph = graph
+        self.rng = random.Random(seed)
+        self.clock = 0.0
+        self.progress = {"completed_tasks": [], "failed_tasks": []}
+        self.retries = RetryPolicy(self.progress, policy.models)
+        self.failures: Dict[str, Failure] = {}
+        self.issues = set()
+        self.model_users: Dict[str, int] = {}
+        self.model_expiry: Dict[str, float] = {}  # loaded models: unload time (inf while in use)
+        self.last_counts = -math.inf
+        self.result = SimResult()
+
+    def profile(self, model: str) -> ModelProfile:
+        return self.profiles.get(model) or prior_profile(model)
+
+    def lognormal(self, median: float, sigma: float) -> float:
+        return self.rng.lognormvariate(math.log(median), sigma)
+
+    def gh(self, occasion: str) -> float:
+        """Count one occasion's gh calls; returns the time the caller waits for them"""
+        calls = GH_CALLS[occasion]
+        self.result.gh_calls += calls
+        if occasion in GH_BACKGROUND:
+            return 0.0
+        return sum(self.lognormal(*GH_LATENCY) for _ in range(calls))
+
+    def stage_tasks(self, stage: int) -> List[Task]:
+        tasks = []
+        for task_stage, task_id, description in self.plan:
+            if task_stage != stage:
+                continue
+            tier = TIERS.get(self.determine_model(description), "balanced")
+            tasks.append(Task(id=task_id, title=description[:80], description=description, stage=stage,
+                              priority="normal", model=self.policy.models[tier]))
+        return tasks
+
+    # Models
+
+    def load(self, model: str):
+        for loaded in [m for m, expiry in self.model_expiry.items() if expiry <= self.clock]:
+            del self.model_expiry[loaded]
+        self.model_users[model] = self.model_users.get(model, 0) + 1
+        self.model_expiry[model] = math.inf
+        memory = sum(model_memory_gb(m) for m in self.model_expiry)
+        self.result.peak_memory_gb = max(self.result.peak_memory_gb, memory)
+
+    def unload(self, model: str):
+        self.model_users[model] -= 1
+        if not self.model_users[model]:
+            self.model_expiry[model] = self.clock + self.policy.keep_alive
+
+    # Tasks
+
+    def start(self, task: Task, running: int) -> float:
+        """Sample one attempt; returns its duration and records a failure, if any"""
+        self.result.attempts += 1
+        self.load(task.model)
+        profile = self.profile(task.model)
+        seconds = 0.0
+        if task.id not in self.issues:
+            self.issues.add(task.id)
+            seconds += self.gh("issue_create")
+        seconds += self.gh("attempt_start")
+
+        aider = self.lognormal(profile.median, profile.sigma) * running ** self.policy.contention
+        if aider > self.policy.timeout:
+            self.failures[task.id] = Failure("aider_timeout")
+            return seconds + self.policy.timeout + self.gh("failure")
+        if self.rng.random() < profile.failure_rate:
+            if self.rng.random() < profile.transient_share:
+                self.failures[task.id] = Failure("aider", 1, "Connection refused", stderr="Connection refused")
+                return seconds + aider * self.rng.uniform(0.1, 1.0) + self.gh("failure")
+            self.failures[task.id] = Failure("build")
+            return seconds + aider + self.lognormal(*GODOT_LATENCY) + self.gh("failure")
+        return seconds + aider + self.lognormal(*GODOT_LATENCY) + self.gh("success")
+
+    def finish(self, task: Task):
+        self.unload(task.model)
+
+    def on_result(self, task: Task, success: bool, seconds: float) -> bool:
+        if success:
+            self.progress["completed_tasks"].append(task.id)
+            self.retries.on_success(task.id)
+            return False
+
+        decision = self.retries.on_failure(task, self.failures.pop(task.id), now=self.clock)
+        if decision.action == "give_up":
+            self.progress["failed_tasks"].append(task.id)
+            return False
+        if decision.action == "escalate":
+            self.result.escalations += 1
+        else:
+            self.result.retries += 1
+        self.clock += self.gh("retry")
+        return True
+
+    def run(self) -> SimResult:
+        """Continuous mode from stage 1 through the final stage, as run_stage does it"""
+        stage = 1
+        deadline = MAX_SIMULATED_DAYS * 86400
+        self.gh("labels")
+        while stage <= FINAL_STAGE and self.clock < deadline:
+            self.clock += self.gh("iteration")
+            if self.clock - self.last_counts >= COUNT_TTL:
+                self.last_counts = self.clock
+                self.clock += self.gh("counts")
+
+            settled = set(self.progress["completed_tasks"]) | set(self.progress["failed_tasks"])
+            pending = [t for t in self.stage_tasks(stage) if t.id not in settled]
+            if not pending:
+                stage += 1
+                continue
+
+            due = [t for t in pending if self.retries.due(t.id, self.clock)]
+            if not due:
+                self.clock += min(max(5, self.retries.next_due() - self.clock), 60)
+                continue
+            for task in due:
+                self.retries.apply(task)
+
+            scheduler = SimulatedScheduler(self, due, max_parallel=self.policy.max_parallel, graph=self.graph)
+            outcome = scheduler.run(self.policy.max_tasks, self.on_result)
+            if len(outcome["failed"]) >= MAX_FAILURES:
+                self.result.halts += 1  # a person restarts it (at no cost here)
+            if len(outcome["done"]) + len(outcome["failed"]) >= len(pending):
+                self.clock += ITERATION_PAUSE
+
+        self.result.makespan = self.clock
+        self.result.completed = len(self.progress["completed_tasks"])
+        self.result.given_up = len(self.progress["failed_tasks"])
+        self.result.unfinished = len(self.plan) - self.result.completed - self.result.given_up
+        return self.result
+
+
+def simulate(policy: Policy, profiles: Dict[str, ModelProfile], plan: List[tuple],
+             graph: DependencyGraph, runs: int, seed: int = 0) -> dict:
+    """Summary of `runs` campaigns: means, plus p90 makespan and max memory peak"""
+    results = [Simulation(policy, profiles, plan, graph, seed + i).run() for i in range(runs)]
+    makespans = sorted(r.makespan for r in results)
+    summary = {name: statistics.mean(getattr(r, name) for r in results) for name in asdict(SimResult())}
+    summary["makespan_p90"] = makespans[min(len(makespans) - 1, int(0.9 * len(makespans)))]
+    summary["peak_memory_gb"] = max(r.peak_memory_gb for r in results)
+    return summary
+
+
+def parse_list(name: str, default: list, cast=int) -> list:
+    if name not in sys.argv:
+        return default
+    index = sys.argv.index(name)
+    return [cast(v) for v in sys.argv[index + 1].split(",")]
+
+
+def option(name: str, default, cast=str):
+    if name not in sys.argv:
+        return default
+    return cast(sys.argv[sys.argv.index(name) + 1])
+
+
+def main():
+    if "--help" in sys.argv or "-h" in sys.argv:
+        print("""
+Usage: python3 simulator.py [OPTIONS]
+
+Each comma-separated list is a policy dimension; every combination is simulated.
+
+    --parallel 1,2,4          Independent tasks at once (agent_orchestrator.py -j)
+    --max-tasks 5,10          Tasks per iteration
+    --timeout 600,900         aider timeout in seconds
+    --model TIER=TAG          Model for a tier (fast, balanced, complex); repeatable
+    --backend aider|ollama    Sets how long idle models stay loaded
+    --contention 0.5          GPU sharing: k parallel generations each take k**c longer
+    --runs 20 --seed 0        Monte Carlo runs per policy
+    --json                    Print the summaries as JSON
+""")
+        return
+
+    if not DEV_PLAN.exists():
+        print("❌ development_plan.md not found!")
+        sys.exit(1)
+    plan = list(iter_plan_tasks(DEV_PLAN.read_text()))
+    profiles = fit_profiles()
+    graph = DependencyGraph()
+
+    models = dict(MODELS)
+    for i, arg in enumerate(sys.argv):
+        if arg == "--model":
+            tier, tag = sys.argv[i + 1].split("=", 1)
+            models[tier] = tag if "/" in tag else f"ollama_chat/{tag}"
+    keep_alive = parse_duration(KEEP_ALIVE) if option("--backend", "aider") == "ollama" else OLLAMA_DEFAULT_KEEP_ALIVE
+    contention = option("--contention", 0.5, float)
+    runs = option("--runs", 20, int)
+    seed = option("--seed", 0, int)
+
+    policies = [
+        Policy(max_tasks=max_tasks, max_parallel=parallel, timeout=timeout, models=models,
+               keep_alive=keep_alive, contention=contention)
+        for parallel, max_tasks, timeout in itertools.product(
+            parse_list("--parallel", [1]), parse_list("--max-tasks", [5]),
+            parse_list("--timeout", [AIDER_TIMEOUT], float))
+    ]
+    summaries = [(policy, simulate(policy, profiles, plan, graph, runs, seed)) for policy in policies]
+
+    if "--json" in sys.argv:
+        print(json.dumps([{"policy": asdict(p), **s} for p, s in summaries], indent=2))
+        return
+
+    print(f"🧪 {len(plan)} plan tasks, {runs} runs per policy")
+    for model in sorted(set(models.values())):
+        fitted = profiles.get(model)
+        profile = fitted or prior_profile(model)
+        source = f"fitted from {fitted.samples} tasks" if fitted else "prior, no traces"
+        print(f"   {model}: median {profile.median / 60:.1f} min, {profile.failure_rate:.0%} failures "
+              f"({profile.transient_share:.0%} transient), {model_memory_gb(model):.1f} GB ({source})")
+    print()
+    print(f"   {'policy':<34} {'makespan':>9} {'p90':>7} {'done':>6} {'gave up':>8} "
+          f"{'halts':>6} {'peak mem':>9} {'gh calls':>9}")
+    for policy, s in summaries:
+        print(f"   {policy.describe():<34} {s['makespan'] / 3600:>8.1f}h {s['makespan_p90'] / 3600:>6.1f}h "
+              f"{s['completed']:>6.0f} {s['given_up']:>8.1f} {s['halts']:>6.1f} "
+              f"{s['peak_memory_gb']:>7.1f}GB {s['gh_calls']:>9.0f}")
+        if s["unfinished"]:
+            print(f"   ⚠️  {s['unfinished']:.0f} tasks unfinished after {MAX_SIMULATED_DAYS} simulated days")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Task Coordinator - Dispatches orchestrator tasks to worker machines over TCP
+Workers (worker_daemon.py) register with the models they have and heartbeat
+over one connection each. A dispatched task is a lease carrying the prompt
+and a git bundle of the task's starting point; the worker runs aider and the
+Godot check locally and returns the verification result plus a bundle of its
+commits, which are verified again here and then rebased onto main like any
+worktree task.
+Messages are newline-delimited JSON; bundles travel base64-encoded
+"""
+
+import base64
+import hmac
+import ipaddress
+import json
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from godot_diagnostics import Diagnostic
+from ollama_client import ollama_model
+from retry_policy import Failure
+from task_leases import LEASE_TTL, TaskInterrupted, git, rev_parse, snapshot_worktree
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+# Listens on localhost unless a host is given (--distributed 0.0.0.0:7821)
+COORDINATOR_HOST = "127.0.0.1"
+COORDINATOR_PORT = int(os.environ.get("AI_COORDINATOR_PORT", "7821"))
+# Shared secret workers must present; required unless listening on loopback only
+COORDINATOR_TOKEN = os.environ.get("AI_COORDINATOR_TOKEN", "")
+PROTOCOL_VERSION = 1
+BUNDLE_REF = "refs/ai-bundles"
+# Fetches of a bundle retried while a sibling worktree is being removed
+FETCH_ATTEMPTS = 3
+# Seconds between checks for a free worker or a shutdown
+POLL_INTERVAL = 1.0
+
+
+# Protocol
+
+class Connection:
+    """Newline-delimited JSON messages over a socket; send() is thread-safe"""
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.reader = sock.makefile("rb")
+        self.lock = threading.Lock()
+
+    def send(self, message: dict):
+        data = (json.dumps(message) + "\n").encode()
+        with self.lock:
+            self.sock.sendall(data)
+
+    def receive(self) -> Optional[dict]:
+        """Next message, or None once the peer has closed the connection"""
+        line = self.reader.readline()
+        return json.loads(line) if line else None
+
+    def close(self):
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+
+def parse_address(value: str, default_host: str = COORDINATOR_HOST) -> tuple:
+    """("host", port) from "host:port", ":port" or "port" """
+    host, _, port = value.rpartition(":")
+    return host or default_host, int(port or COORDINATOR_PORT)
+
+
+def is_loopback(host: str) -> bool:
+    """Whether `host` only accepts connections from this machine"""
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        pass
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, None)}
+    except OSError:
+        return False
+    return bool(addresses) and all(ipaddress.ip_address(a.split("%")[0]).is_loopback for a in addresses)
+
+
+def create_bundle(rev: str, exclude: Optional[str], cwd: Path) -> Optional[str]:
+    """Base64 git bundle of `rev` without what `exclude` already has; None if empty"""
+    ref = f"{BUNDLE_REF}/{uuid.uuid4().hex}"
+    git("update-ref", ref, rev, cwd=cwd)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "task.bundle"
+            args = ["bundle", "create", "-q", str(path), ref]
+            if exclude and rev_parse(f"{exclude}^{{commit}}", cwd):
+                args.append(f"^{exclude}")
+            result = git(*args, cwd=cwd)
+            if result.returncode != 0:
+                if "empty bundle" in result.stderr:
+                    return None
+                raise RuntimeError(f"git bundle failed: {result.stderr.strip()}")
+            return base64.b64encode(path.read_bytes()).decode()
+    finally:
+        git("update-ref", "-d", ref, cwd=cwd)
+
+
+def fetch_bundle(data: str, ref: str, cwd: Path) -> str:
+    """Fetch a bundle's commit into `ref`; returns the commit"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "task.bundle"
+        path.write_bytes(base64.b64decode(data))
+        heads = git("bundle", "list-heads", str(path), cwd=cwd).stdout.split()
+        if len(heads) < 2:
+            raise RuntimeError("Bundle has no head")
+        for attempt in range(1, FETCH_ATTEMPTS + 1):
+            result = git("fetch", "-q", str(path), f"+{heads[1]}:{ref}", cwd=cwd)
+            if result.returncode == 0:
+                break
+            # git checks every worktree's HEAD; one being removed by another task
+            # reads as a bad object for a moment
+            if "worktrees/" not in result.stderr or attempt == FETCH_ATTEMPTS:
+                raise RuntimeError(f"git fetch from bundle failed: {result.stderr.strip()}")
+            time.sleep(0.2 * attempt)
+    return heads[0]
+
+
+def failure_to_dict(failure: Optional[Failure]) -> Optional[dict]:
+    return asdict(failure) if failure else None
+
+
+def failure_from_dict(data: Optional[dict]) -> Optional[Failure]:
+    if not data:
+        return None
+    failure = Failure(**data)
+    if failure.diagnostics is not None:
+        failure.diagnostics = [Diagnostic(**d) for d in failure.diagnostics]
+    return failure
+
+
+# Coordinator
+
+@dataclass
+class Lease:
+    task_id: str
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Optional[dict] = None  # None when the worker went away
+
+
+@dataclass
+class RemoteWorker:
+    name: str
+    conn: Connection
+    models: List[str]
+    capacity: int
+    have: Optional[str] = None  # commit the worker already holds (bundles exclude its history)
+    leases: Dict[str, Lease] = field(default_factory=dict)
+    last_seen: float = field(default_factory=time.time)
+
+    def has_model(self, model: str) -> bool:
+        return ollama_model(model) in self.models
+
+
+class WorkerHandler(socketserver.StreamRequestHandler):
+    """One registered worker: reads its heartbeats and results until it goes quiet"""
+
+    def handle(self):
+        coordinator = self.server.coordinator
+        # A worker that misses heartbeats for LEASE_TTL loses its leases
+        self.request.settimeout(LEASE_TTL)
+        conn = Connection(self.request)
+        worker = None
+        try:
+            hello = conn.receive()
+            if not hello or hello.get("type") != "register":
+                return
+            if coordinator.token and not hmac.compare_digest(str(hello.get("token") or "").encode(),
+                                                             coordinator.token.encode()):
+                conn.send({"type": "error", "error": "invalid token"})
+                return
+            if hello.get("version") != PROTOCOL_VERSION:
+                conn.send({"type": "error", "error": f"protocol version {PROTOCOL_VERSION} required"})
+                return
+            worker = coordinator.register(conn, hello)
+            conn.send({"type": "registered", "name": worker.name, "lease_ttl": LEASE_TTL})
+
+            while True:
+                message = conn.receive()
+                if message is None:
+                    break
+                worker.last_seen = time.time()
+                if message.get("have"):
+                    worker.have = message["have"]
+                if message.get("type") == "result":
+                    coordinator.complete(worker, message)
+        except (OSError, ValueError) as e:
+            if worker:
+                print(f"⚠️  Lost worker {worker.name}: {e}")
+        finally:
+            if worker:
+                coordinator.unregister(worker)
+            conn.close()
+
+
+class CoordinatorServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class Coordinator:
+    """Hands tasks to registered workers and brings their commits back
+
+    Passed to TaskScheduler as `remote`; the orchestrator calls run_attempt()
+    in place of running aider and Godot itself.
+    """
+
+    def __init__(self, orchestrator, address: tuple = (COORDINATOR_HOST, COORDINATOR_PORT),
+                 root: Path = PROJECT_ROOT, token: str = COORDINATOR_TOKEN):
+        """Raises:
+            ValueError if asked to listen beyond loopback without a token: any
+            host that reaches the port could otherwise hand back commits
+        """
+        if not token and not is_loopback(address[0]):
+            raise ValueError(f"refusing to listen on {address[0]}:{address[1]} without "
+                             f"AI_COORDINATOR_TOKEN; set it on the coordinator and every worker")
+        self.token = token
+        self.orchestrator = orchestrator
+        self.root = Path(root)
+        self.workers: Dict[str, RemoteWorker] = {}
+        self.changed = threading.Condition()
+        self.server = CoordinatorServer(address, WorkerHandler)
+        self.server.coordinator = self
+        self.address = self.server.server_address
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        print(f"🌐 Coordinator listening on {self.address[0]}:{self.address[1]}")
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        with self.changed:
+            for worker in list(self.workers.values()):
+                worker.conn.close()
+
+    # Workers
+
+    def register(self, conn: Connection, hello: dict) -> RemoteWorker:
+        with self.changed:
+            name = hello.get("name") or "worker"
+            suffix = 2
+            while name in self.workers:
+                name = f"{hello.get('name') or 'worker'}-{suffix}"
+                suffix += 1
+            worker = RemoteWorker(
+                name=name, conn=conn, models=[ollama_model(m) for m in hello.get("models", [])],
+                capacity=max(1, int(hello.get("capacity", 1))), have=hello.get("have")
+            )
+            self.workers[name] = worker
+            self.changed.notify_all()
+        print(f"🖥️  Worker {name} joined ({worker.capacity} slot(s); models: {', '.join(worker.models) or 'none'})")
+        return worker
+
+    def unregister(self, worker: RemoteWorker):
+        with self.changed:
+            if self.workers.get(worker.name) is worker:
+                del self.workers[worker.name]
+            for lease in worker.leases.values():
+                lease.done.set()  # result stays None: the attempt is lost
+            self.changed.notify_all()
+        print(f"👋 Worker {worker.name} left")
+
+    def complete(self, worker: RemoteWorker, message: dict):
+        with self.changed:
+            lease = worker.leases.get(message.get("lease"))
+            if lease:
+                lease.result = message
+                lease.done.set()
+
+    def acquire(self, task) -> tuple:
+        """Reserve a slot on the least busy worker, preferring ones that have the task's model
+
+        Returns:
+            (worker, lease id)
+        """
+        announced = False
+        with self.changed:
+            while True:
+                if self.orchestrator.stopping.is_set():
+                    raise TaskInterrupted(task.id)
+                free = [w for w in self.workers.values() if len(w.leases) < w.capacity]
+                if free:
+                    worker = min(free, key=lambda w: (not w.has_model(task.model), len(w.leases) / w.capacity))
+                    lease_id = f"{task.id}-{uuid.uuid4().hex[:8]}"
+                    worker.leases[lease_id] = Lease(task.id)
+                    return worker, lease_id
+                if not announced:
+                    print(f"⏳ {task.id} waits for a free worker ({len(self.workers)} registered)")
+                    announced = True
+                self.changed.wait(POLL_INTERVAL)
+
+    def release(self, worker: RemoteWorker, lease_id: str):
+        with self.changed:
+            worker.leases.pop(lease_id, None)
+            self.changed.notify_all()
+
+    # Tasks
+
+    def run_attempt(self, task, prompt: str, task_files: List[str], workdir: Path,
+                    base_commit: Optional[str]) -> tuple:
+        """Same contract as AgentOrchestrator.run_attempt, on a worker
+
+        On success the worker's commits are checked out in `workdir` and have
+        passed the orchestrator's own verification there too.
+        """
+        worker, lease_id = self.acquire(task)
+        log = self.orchestrator.task_logs[task.id]
+        try:
+            head = rev_parse("HEAD", workdir)
+            # Work restored from a checkpoint may still be uncommitted
+            snapshot = snapshot_worktree(workdir, f"dispatch {task.id}")
+            job = {
+                "type": "task",
+                "lease": lease_id,
+                "task": asdict(task),
+                "prompt": prompt,
+                "files": task_files,
+                "base": base_commit,
+                "head": head,
+                "snapshot": snapshot,
+                "bundle": create_bundle(snapshot or head, worker.have, workdir),
+            }
+            print(f"📤 {task.id} → worker {worker.name}")
+            log.write_text("worker", f"dispatched to {worker.name} as {lease_id}\n")
+            try:
+                worker.conn.send(job)
+            except OSError as e:
+                return Failure("worker_lost", output=str(e)), f"Could not reach worker `{worker.name}`: {e}"
+
+            lease = worker.leases[lease_id]
+            while not lease.done.wait(POLL_INTERVAL):
+                if self.orchestrator.stopping.is_set():
+                    try:
+                        worker.conn.send({"type": "cancel", "lease": lease_id})
+                    except OSError:
+                        pass
+                    raise TaskInterrupted(task.id)
+
+            result = lease.result
+            if result is None:
+                return (Failure("worker_lost", output=f"worker {worker.name} disconnected"),
+                        f"Worker `{worker.name}` disconnected while running the task")
+
+            log.write_text("worker", result.get("output", ""))
+            failure = failure_from_dict(result.get("failure"))
+            message = f"{result.get('message', '')}\n\n_Ran on worker `{worker.name}`_"
+            if failure is not None:
+                return failure, message
+            if result.get("bundle"):
+                commit = fetch_bundle(result["bundle"], f"{BUNDLE_REF}/{lease_id}", workdir)
+                git("reset", "--hard", "-q", commit, cwd=workdir)
+                git("update-ref", "-d", f"{BUNDLE_REF}/{lease_id}", cwd=workdir)
+                print(f"📥 {task.id}: commits from {worker.name} up to {commit[:8]}")
+
+            # The worker's Godot and checkout may differ from ours: verify again here
+            print(f"🔍 Re-verifying {task.id} locally")
+            failure, local_message = self.orchestrator.verify_attempt(task, workdir, base_commit)
+            if failure is not None:
+                return failure, f"{local_message}\n\n_Passed on worker `{worker.name}` but not locally_"
+            return None, message
+        finally:
+            self.release(worker, lease_id)
+
+    def status(self) -> List[dict]:
+        with self.changed:
+            return [{"name": w.name, "models": w.models, "capacity": w.capacity,
+                     "running": [lease.task_id for lease in w.leases.values()]}
+                    for w in self.workers.values()]
+
+
+def main():
+    """Run a coordinator without the orchestrator, to check that workers can connect"""
+
+    class Idle:
+        stopping = threading.Event()
+        task_logs: dict = {}
+
+    address = parse_address(sys.argv[1]) if len(sys.argv) > 1 else (COORDINATOR_HOST, COORDINATOR_PORT)
+    try:
+        coordinator = Coordinator(Idle(), address)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    coordinator.start()
+    try:
+        while True:
+            time.sleep(30)
+            for worker in coordinator.status():
+                print(f"   {worker['name']}: {len(worker['running'])}/{worker['capacity']} busy")
+    except KeyboardInterrupt:
+        coordinator.stop()
+
+
+if __name__ == "__main__":
+    main()
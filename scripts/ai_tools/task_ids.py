@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Task IDs - Content-stable IDs for development plan tasks
+A task's ID is a hash of its normalised description (S{stage}T-{hash8}), so
+inserting, removing or reordering bullets in development_plan.md no longer
+renames the tasks after it. A task whose wording was edited slightly keeps its
+old ID (and with it its progress, retries and GitHub issue) by fuzzy matching
+against the IDs the plan no longer produces
+"""
+
+import difflib
+import hashlib
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+# Minimum similarity (difflib ratio of normalised descriptions) for an edited
+# task to inherit a vanished task's ID
+MATCH_THRESHOLD = 0.8
+
+LEGACY_ID = re.compile(r'^S\d+T\d+$')
+
+
+def normalize(description: str) -> str:
+    """Description without markdown, case, spacing or trailing punctuation differences"""
+    text = re.sub(r'[`*_]', '', description.lower())
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip().rstrip('.;:,').strip()
+
+
+def content_id(stage: int, description: str) -> str:
+    digest = hashlib.sha1(normalize(description).encode()).hexdigest()[:8]
+    return f"S{stage}T-{digest}"
+
+
+def similarity(a: str, b: str) -> float:
+    return difflib.SequenceMatcher(None, a, b).ratio()
+
+
+class TaskIdRegistry:
+    """Descriptions behind every plan task ID seen so far, kept in progress["task_ids"]"""
+
+    def __init__(self, progress: dict):
+        self.progress = progress
+        self.known: Dict[str, dict] = progress.setdefault("task_ids", {})
+
+    def resolve(self, tasks: List, quiet: bool = False) -> Dict[str, str]:
+        """Give edited tasks the ID of the task they replace and record all
+        descriptions; `tasks` are one stage's plan tasks with content IDs
+        (`quiet` skips the rewording notice, for read-only lookups)
+
+        Returns:
+            {content ID: inherited ID} for tasks that were matched
+        """
+        current = {task.id for task in tasks}
+        stages = {task.stage for task in tasks}
+        # IDs of this stage that the plan no longer produces
+        vanished = {
+            task_id: entry["text"] for task_id, entry in self.known.items()
+            if entry["stage"] in stages and task_id not in current
+        }
+        new = [task for task in tasks if task.id not in self.known]
+
+        candidates = []
+        for task in new:
+            text = normalize(task.description)
+            for task_id, old_text in vanished.items():
+                if self.known[task_id]["stage"] != task.stage:
+                    continue
+                score = similarity(text, old_text)
+                if score >= MATCH_THRESHOLD:
+                    candidates.append((score, task, task_id))
+
+        # Best matches first; each vanished ID is inherited at most once
+        renamed: Dict[str, str] = {}
+        taken = set()
+        for score, task, task_id in sorted(candidates, key=lambda c: -c[0]):
+            if task.id in renamed or task_id in taken:
+                continue
+            renamed[task.id] = task_id
+            taken.add(task_id)
+            # Exact matches are tasks reworded in an earlier run that kept their ID
+            if score < 1.0 and not quiet:
+                print(f"🔗 {task_id} was reworded ({score:.0%} similar); keeping its ID and history")
+
+        for task in tasks:
+            task.id = renamed.get(task.id, task.id)
+            self.known[task.id] = {"stage": task.stage, "text": normalize(task.description)}
+        return renamed
+
+    def needs_migration(self) -> bool:
+        return not self.progress.get("task_ids_migrated")
+
+    def legacy_ids(self) -> List[str]:
+        """Positional IDs (S1T3) still used in progress"""
+        ids = set()
+        for key in ("completed_tasks", "failed_tasks", "github_issues", "task_retries"):
+            ids.update(i for i in self.progress.get(key, []) if LEGACY_ID.match(i))
+        return sorted(ids)
+
+    def unmatched_legacy_ids(self, plan_tasks: List[tuple]) -> List[str]:
+        """Positional IDs in progress that the plan has no bullet for (it lost tasks since)"""
+        positions = {legacy for _, legacy, _, _ in plan_tasks}
+        return [i for i in self.legacy_ids() if i not in positions]
+
+    def migrate(self, plan_tasks: List[tuple]) -> Dict[str, str]:
+        """Rename positional IDs in progress to content IDs (once)
+
+        Args:
+            plan_tasks: (stage, positional ID, content ID, description) for
+                every task of the plan the positional IDs were numbered
+                against, in plan order
+
+        Returns:
+            {positional ID: content ID} for IDs that appeared in progress
+        """
+        mapping = {legacy: new for _, legacy, new, _ in plan_tasks}
+        for stage, _, task_id, description in plan_tasks:
+            self.known.setdefault(task_id, {"stage": stage, "text": normalize(description)})
+
+        used = set()
+        for key in ("completed_tasks", "failed_tasks"):
+            ids = self.progress.get(key, [])
+            used.update(i for i in ids if i in mapping)
+            self.progress[key] = [mapping.get(i, i) for i in ids]
+        for key in ("github_issues", "task_retries"):
+            entries = self.progress.get(key, {})
+            used.update(i for i in entries if i in mapping)
+            self.progress[key] = {mapping.get(i, i): value for i, value in entries.items()}
+
+        self.progress["task_ids_migrated"] = True
+        return {legacy: mapping[legacy] for legacy in used}
+
+
+def main():
+    progress_file = PROJECT_ROOT / ".ai_progress.json"
+    progress = json.loads(progress_file.read_text()) if progress_file.exists() else {}
+    known = progress.get("task_ids", {})
+    if not known:
+        print("ℹ️  No task IDs recorded yet (they are registered on the next orchestrator run)")
+        return
+
+    stage = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    completed = set(progress.get("completed_tasks", []))
+    issues = progress.get("github_issues", {})
+    for task_id, entry in sorted(known.items(), key=lambda item: (item[1]["stage"], item[0])):
+        if stage is not None and entry["stage"] != stage:
+            continue
+        status = "✅" if task_id in completed else "  "
+        issue = f" #{issues[task_id]}" if task_id in issues else ""
+        print(f"{status} {task_id:<14}{issue:<6} {entry['text'][:80]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Task Leases - Heartbeat leases and checkpoints for in-flight tasks
+Every running task holds a lease that a background thread renews. On shutdown
+the task's partial commits and uncommitted edits are snapshotted into a git
+ref, so a restarted orchestrator resumes the work instead of redoing it; tasks
+whose owner died without checkpointing are reclaimed once the lease expires
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+LEASE_DIR = PROJECT_ROOT / ".ai_leases"
+CHECKPOINT_REF = "refs/ai-checkpoints"
+
+# Orchestrator state and editor caches are never part of a task's work
+STATE_PATHSPEC = [".", ":(exclude).ai_*", ":(exclude).validation_log", ":(exclude).godot"]
+
+# Seconds between renewals, and without one before a lease counts as abandoned
+HEARTBEAT_INTERVAL = 30
+LEASE_TTL = 120
+
+
+class TaskInterrupted(Exception):
+    """The orchestrator is shutting down; the task was checkpointed"""
+
+
+def git(*args: str, cwd: Path = PROJECT_ROOT, env: Optional[dict] = None) -> subprocess.CompletedProcess:
+    return subprocess.run(["git", *args], capture_output=True, text=True, cwd=cwd, env=env)
+
+
+def rev_parse(rev: str, cwd: Path = PROJECT_ROOT) -> Optional[str]:
+    result = git("rev-parse", "--verify", "-q", rev, cwd=cwd)
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def is_ancestor(ancestor: str, descendant: str, cwd: Path = PROJECT_ROOT) -> bool:
+    return git("merge-base", "--is-ancestor", ancestor, descendant, cwd=cwd).returncode == 0
+
+
+def snapshot_worktree(workdir: Path, message: str) -> Optional[str]:
+    """Commit object holding the working tree (tracked and untracked, minus
+    ignored files) on top of HEAD, without touching the index or the branch.
+    Returns None when there is nothing uncommitted.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**os.environ, "GIT_INDEX_FILE": str(Path(tmp) / "index")}
+        git("read-tree", "HEAD", cwd=workdir, env=env)
+        git("add", "-A", "--", *STATE_PATHSPEC, cwd=workdir, env=env)
+        tree = git("write-tree", cwd=workdir, env=env).stdout.strip()
+    if not tree or tree == rev_parse("HEAD^{tree}", workdir):
+        return None
+    result = git("commit-tree", tree, "-p", "HEAD", "-m", message, cwd=workdir)
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+class LeaseManager:
+    def __init__(self, lease_dir: Path = LEASE_DIR, root: Path = PROJECT_ROOT):
+        self.lease_dir = Path(lease_dir)
+        self.root = Path(root)
+        self.lease_dir.mkdir(parents=True, exist_ok=True)
+        self.owner = {"host": socket.gethostname(), "pid": os.getpid()}
+        self.held: Dict[str, dict] = {}
+        self.lock = threading.Lock()
+        self._heartbeat: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    # Lease files
+
+    def path(self, task_id: str) -> Path:
+        return self.lease_dir / f"{task_id}.json"
+
+    def read(self, task_id: str) -> Optional[dict]:
+        try:
+            with open(self.path(task_id)) as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def write(self, lease: dict):
+        path = self.path(lease["task_id"])
+        temp_file = path.with_suffix(f".json.{os.getpid()}.tmp")
+        with open(temp_file, "w") as f:
+            json.dump(lease, f, indent=2)
+        temp_file.replace(path)
+
+    def all_leases(self) -> List[dict]:
+        leases = []
+        for path in sorted(self.lease_dir.glob("*.json")):
+            lease = self.read(path.stem)
+            if lease:
+                leases.append(lease)
+        return leases
+
+    def is_live(self, lease: dict) -> bool:
+        """Held by a running orchestrator (its heartbeat is fresh and its process exists)"""
+        if lease.get("state") != "running":
+            return False
+        if time.time() - lease.get("heartbeat", 0) > LEASE_TTL:
+            return False
+        owner = lease.get("owner", {})
+        if owner.get("host") == self.owner["host"]:
+            if owner.get("pid") == self.owner["pid"]:
+                return lease["task_id"] in self.held
+            try:
+                os.kill(owner["pid"], 0)
+            except ProcessLookupError:
+                return False
+            except (PermissionError, KeyError, TypeError):
+                pass
+        return True
+
+    def held_elsewhere(self, task_id: str) -> bool:
+        lease = self.read(task_id)
+        return bool(lease) and task_id not in self.held and self.is_live(lease)
+
+    def resumable(self) -> List[dict]:
+        """Leases of interrupted or abandoned tasks"""
+        return [lease for lease in self.all_leases() if not self.is_live(lease)]
+
+    # Lifecycle
+
+    def acquire(self, task_id: str, base_commit: Optional[str], workdir: Path) -> dict:
+        """Take the lease for a task; returns the previous attempt's lease, if any"""
+        previous = self.read(task_id)
+        if previous and self.is_live(previous):
+            raise RuntimeError(f"{task_id} is leased by {previous['owner']}")
+        if previous and previous.get("state") == "running":
+            # Owner died without a clean shutdown: salvage its worktree if it still exists
+            old_workdir = Path(previous.get("workdir", self.root))
+            previous = self.checkpoint_lease(previous, old_workdir)
+            if old_workdir != self.root and old_workdir.is_dir():
+                git("worktree", "remove", "--force", str(old_workdir), cwd=self.root)
+
+        now = time.time()
+        lease = {
+            "task_id": task_id,
+            "owner": self.owner,
+            "state": "running",
+            "workdir": str(workdir),
+            "base_commit": base_commit,
+            "started": now,
+            "heartbeat": now,
+            "prior_seconds": previous.get("elapsed", 0.0) if previous else 0.0,
+            "elapsed": previous.get("elapsed", 0.0) if previous else 0.0,
+            "attempts": previous.get("attempts", 0) + 1 if previous else 1,
+        }
+        with self.lock:
+            self.held[task_id] = lease
+            self.write(lease)
+        self._start_heartbeat()
+        return previous
+
+    def update(self, task_id: str, **fields):
+        with self.lock:
+            lease = self.held[task_id]
+            lease.update(fields)
+            self.write(lease)
+
+    def release(self, task_id: str):
+        """Task finished (either way): drop the lease and its checkpoint"""
+        with self.lock:
+            self.held.pop(task_id, None)
+        self.path(task_id).unlink(missing_ok=True)
+        git("update-ref", "-d", f"{CHECKPOINT_REF}/{task_id}", cwd=self.root)
+
+    def rename(self, task_id: str, new_id: str):
+        """Move an idle lease and its checkpoint to a new task ID"""
+        lease = self.read(task_id)
+        if lease is None or task_id in self.held:
+            return
+        lease["task_id"] = new_id
+        self.write(lease)
+        self.path(task_id).unlink(missing_ok=True)
+        ref = rev_parse(f"{CHECKPOINT_REF}/{task_id}", self.root)
+        if ref:
+            git("update-ref", f"{CHECKPOINT_REF}/{new_id}", ref, cwd=self.root)
+            git("update-ref", "-d", f"{CHECKPOINT_REF}/{task_id}", cwd=self.root)
+
+    def checkpoint(self, task_id: str, workdir: Path) -> Optional[dict]:
+        """Snapshot a held task's partial work and mark it interrupted"""
+        with self.lock:
+            lease = self.held.pop(task_id, None)
+        if lease is None:
+            return None
+        lease = self.checkpoint_lease(lease, Path(workdir))
+        print(f"💾 Checkpointed {task_id}: {len(lease.get('commits', []))} commit(s), "
+              f"{'uncommitted edits, ' if lease.get('snapshot') else ''}"
+              f"{lease['elapsed'] / 60:.1f} min of work")
+        return lease
+
+    def checkpoint_lease(self, lease: dict, workdir: Path) -> dict:
+        lease = dict(lease)
+        if lease.get("state") == "running":
+            # A dead owner's work is only known up to its last heartbeat
+            until = time.time() if lease.get("owner") == self.owner else lease.get("heartbeat", lease["started"])
+            lease["elapsed"] = lease.get("prior_seconds", 0.0) + max(0.0, until - lease["started"])
+        lease["state"] = "interrupted"
+        lease["interrupted_at"] = time.time()
+
+        head = rev_parse("HEAD", workdir) if workdir.is_dir() else None
+        base = lease.get("base_commit")
+        if head and base:
+            commits = git("rev-list", "--reverse", f"{base}..{head}", cwd=workdir).stdout.split()
+            snapshot = snapshot_worktree(workdir, f"checkpoint {lease['task_id']}")
+            lease["head"] = head
+            lease["commits"] = commits
+            lease["snapshot"] = snapshot
+            # One ref keeps both the partial commits and the snapshot reachable
+            git("update-ref", f"{CHECKPOINT_REF}/{lease['task_id']}", snapshot or head, cwd=self.root)
+
+        self.write(lease)
+        return lease
+
+    def restore(self, previous: dict, workdir: Path) -> Optional[str]:
+        """Bring a previous attempt's work into `workdir`
+
+        Returns:
+            The commit to treat as the task's base (so verification covers the
+            restored commits), or None if nothing could be restored
+        """
+        base, head, snapshot = previous.get("base_commit"), previous.get("head"), previous.get("snapshot")
+        if not base or not head:
+            return None
+        current = rev_parse("HEAD", workdir)
+
+        if head != base and not is_ancestor(head, current, workdir):
+            # A fresh worktree starts at the newer main: replay the partial commits
+            pick = git("cherry-pick", "--allow-empty", f"{base}..{head}", cwd=workdir)
+            if pick.returncode != 0:
+                git("cherry-pick", "--abort", cwd=workdir)
+                print(f"⚠️  Partial commits of {previous['task_id']} no longer apply; starting over")
+                return None
+            base = current
+        elif not is_ancestor(base, current, workdir):
+            base = current
+
+        dirty = bool(git("status", "--porcelain", "--", *STATE_PATHSPEC, cwd=workdir).stdout.strip())
+        if snapshot and not dirty:
+            # A crashed run in the main checkout usually still has its edits on disk
+            apply = git("cherry-pick", "--no-commit", snapshot, cwd=workdir)
+            if apply.returncode != 0:
+                git("reset", "--hard", "-q", cwd=workdir)
+                print(f"⚠️  Uncommitted edits of {previous['task_id']} no longer apply; keeping commits only")
+            else:
+                git("reset", "-q", cwd=workdir)
+        return base
+
+    # Heartbeat
+
+    def _start_heartbeat(self):
+        if self._heartbeat and self._heartbeat.is_alive():
+            return
+        self._heartbeat = threading.Thread(target=self._renew_loop, daemon=True)
+        self._heartbeat.start()
+
+    def _renew_loop(self):
+        while not self._stop.wait(HEARTBEAT_INTERVAL):
+            self.renew()
+
+    def renew(self):
+        now = time.time()
+        with self.lock:
+            for lease in self.held.values():
+                lease["heartbeat"] = now
+                lease["elapsed"] = lease["prior_seconds"] + now - lease["started"]
+                self.write(lease)
+
+    def stop(self):
+        self._stop.set()
+
+
+def format_resumable(leases: List[dict]) -> str:
+    lines = []
+    for lease in leases:
+        state = "interrupted" if lease.get("state") == "interrupted" else "abandoned (lease expired)"
+        work = f"{len(lease.get('commits', []))} commit(s)"
+        if lease.get("snapshot"):
+            work += " + uncommitted edits"
+        lines.append(f"   {lease['task_id']}: {state}, {lease.get('elapsed', 0) / 60:.1f} min, "
+                     f"{work if 'head' in lease else 'no checkpoint yet'} "
+                     f"(attempt {lease.get('attempts', 1)})")
+    return '\n'.join(lines)
+
+
+def main():
+    manager = LeaseManager()
+    if "--clear" in sys.argv:
+        for lease in manager.resumable():
+            manager.release(lease["task_id"])
+            print(f"🗑️  Dropped checkpoint of {lease['task_id']}")
+        return
+
+    leases = manager.all_leases()
+    if not leases:
+        print("✅ No in-flight or interrupted tasks")
+        return
+    live = [lease for lease in leases if manager.is_live(lease)]
+    for lease in live:
+        print(f"🏃 {lease['task_id']}: running on {lease['owner']['host']} (pid {lease['owner']['pid']})")
+    resumable = manager.resumable()
+    if resumable:
+        print("⏸️  Will resume on the next run:")
+        print(format_resumable(resumable))
+
+
+if __name__ == "__main__":
+    main()
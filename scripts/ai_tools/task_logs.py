@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Task Logs - Compressed per-task output archive with a searchable index
+Each task attempt's full output (prompt, aider/Ollama stream, build result) is
+spooled to its own compressed file while only a bounded tail stays in memory;
+an SQLite index records task, model, outcome and error signatures per run
+"""
+
+import gzip
+import io
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional, Set
+
+try:
+    import zstandard
+except ImportError:  # optional: logs fall back to gzip
+    zstandard = None
+
+from retry_policy import TRANSIENT_SIGNATURES
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+LOG_DIR = PROJECT_ROOT / ".ai_logs"
+INDEX_FILE = LOG_DIR / "index.sqlite3"
+
+# Lines of each stream kept in memory for issue comments and failure analysis
+TAIL_LINES = 200
+# Characters of a tail pasted into an issue comment
+COMMENT_CHARS = 4000
+ZSTD_LEVEL = 10
+MAX_SIGNATURES = 20
+
+# Streams carrying the process's own errors (stderr); transient signatures are only read there
+ERROR_STREAMS = {"err"}
+# Lines worth indexing besides the transient signatures
+ERROR_LINE_RE = re.compile(
+    r'^(?:(?:SCRIPT )?ERROR: .+|[\w.]+(?:Error|Exception): .+)'
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    task_id TEXT NOT NULL,
+    model TEXT,
+    stage INTEGER,
+    backend TEXT,
+    started REAL,
+    ended REAL,
+    outcome TEXT,
+    path TEXT,
+    raw_bytes INTEGER,
+    stored_bytes INTEGER,
+    lines INTEGER
+);
+CREATE TABLE IF NOT EXISTS signatures (run_id INTEGER NOT NULL, signature TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS runs_task ON runs (task_id);
+CREATE INDEX IF NOT EXISTS runs_started ON runs (started);
+CREATE INDEX IF NOT EXISTS signatures_signature ON signatures (signature);
+"""
+
+
+def signature_of(line: str, stream: str = "err") -> Optional[str]:
+    """Normalised error signature of an output line (numbers and quoted text removed)
+
+    Transient causes are only recognised on process error streams: model
+    output and prompts quote code that merely looks like them.
+    """
+    if stream in ERROR_STREAMS:
+        for pattern, reason in TRANSIENT_SIGNATURES:
+            if pattern.search(line):
+                return reason
+    match = ERROR_LINE_RE.match(line.strip())
+    if not match:
+        return None
+    text = re.sub(r'(["\']).*?\1', '…', match.group(0))
+    text = re.sub(r'0x[0-9a-f]+|\d+', 'N', text)
+    return text[:120]
+
+
+def open_writer(path: Path):
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(open(path, "wb"))
+    return gzip.open(path, "wb")
+
+
+def open_reader(path: Path) -> io.TextIOBase:
+    if path.suffix == ".zst":
+        if zstandard is None:
+            raise RuntimeError(f"{path.name} is zstd-compressed; install the zstandard package to read it")
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(path, "rb")),
+                                encoding="utf-8", errors="replace")
+    return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+
+
+class TaskLogIndex:
+    def __init__(self, path: Path = INDEX_FILE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.connect() as db:
+            db.executescript(SCHEMA)
+
+    @contextmanager
+    def connect(self):
+        """One short-lived connection per call (parallel tasks close logs from different threads)"""
+        db = sqlite3.connect(self.path, timeout=30)
+        db.row_factory = sqlite3.Row
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def add_run(self, log: "TaskLog") -> int:
+        with self.connect() as db:
+            cursor = db.execute(
+                "INSERT INTO runs (task_id, model, stage, backend, started, ended, outcome, path,"
+                " raw_bytes, stored_bytes, lines) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (log.task_id, log.model, log.stage, log.backend, log.started, log.ended, log.outcome,
+                 os.path.relpath(log.path, self.path.parent), log.raw_bytes,
+                 log.path.stat().st_size, log.lines)
+            )
+            db.executemany("INSERT INTO signatures (run_id, signature) VALUES (?, ?)",
+                           [(cursor.lastrowid, s) for s in sorted(log.signatures)])
+            return cursor.lastrowid
+
+    def get(self, run_id: int) -> Optional[sqlite3.Row]:
+        with self.connect() as db:
+            return db.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+
+    def set_outcome(self, run_id: int, outcome: str):
+        with self.connect() as db:
+            db.execute("UPDATE runs SET outcome = ? WHERE id = ?", (outcome, run_id))
+
+    def search(self, task: Optional[str] = None, model: Optional[str] = None,
+               signature: Optional[str] = None, outcome: Optional[str] = None,
+               since: Optional[float] = None, until: Optional[float] = None,
+               limit: int = 50) -> List[sqlite3.Row]:
+        """Runs matching every given filter, newest first (task/model/signature match substrings)"""
+        query = "SELECT * FROM runs WHERE 1=1"
+        params: list = []
+        if task:
+            query += " AND task_id LIKE ?"
+            params.append(f"%{task}%")
+        if model:
+            query += " AND model LIKE ?"
+            params.append(f"%{model}%")
+        if outcome:
+            query += " AND outcome LIKE ?"
+            params.append(f"{outcome}%")
+        if since is not None:
+            query += " AND started >= ?"
+            params.append(since)
+        if until is not None:
+            query += " AND started < ?"
+            params.append(until)
+        if signature:
+            query += " AND id IN (SELECT run_id FROM signatures WHERE signature LIKE ?)"
+            params.append(f"%{signature}%")
+        query += " ORDER BY started DESC LIMIT ?"
+        params.append(limit)
+        with self.connect() as db:
+            return db.execute(query, params).fetchall()
+
+    def signatures(self, run_id: int) -> List[str]:
+        with self.connect() as db:
+            return [row[0] for row in db.execute("SELECT signature FROM signatures WHERE run_id = ?", (run_id,))]
+
+    def top_signatures(self, since: Optional[float] = None, limit: int = 15) -> List[sqlite3.Row]:
+        query = ("SELECT signature, COUNT(*) AS runs, COUNT(DISTINCT task_id) AS tasks FROM signatures"
+                 " JOIN runs ON runs.id = signatures.run_id WHERE started >= ?"
+                 " GROUP BY signature ORDER BY runs DESC LIMIT ?")
+        with self.connect() as db:
+            return db.execute(query, (since or 0, limit)).fetchall()
+
+
+class TaskLog:
+    """Spool for one task attempt; keeps only the last TAIL_LINES lines of each stream"""
+
+    def __init__(self, task_id: str, model: str, stage: int, backend: str,
+                 log_dir: Path = LOG_DIR, index: Optional[TaskLogIndex] = None):
+        self.task_id = task_id
+        self.model = model
+        self.stage = stage
+        self.backend = backend
+        self.index = index
+        self.started = time.time()
+        self.ended: Optional[float] = None
+        self.outcome: Optional[str] = None
+        self.run_id: Optional[int] = None
+
+        day_dir = Path(log_dir) / datetime.fromtimestamp(self.started).strftime("%Y-%m-%d")
+        day_dir.mkdir(parents=True, exist_ok=True)
+        suffix = ".log.zst" if zstandard is not None else ".log.gz"
+        stem = f"{task_id}-{datetime.fromtimestamp(self.started).strftime('%H%M%S')}"
+        self.path = day_dir / f"{stem}{suffix}"
+        attempt = 1
+        while self.path.exists():
+            attempt += 1
+            self.path = day_dir / f"{stem}-{attempt}{suffix}"
+        self.writer = open_writer(self.path)
+        self.lock = threading.Lock()
+
+        self.tails = {}
+        self.partial = {}
+        self.signatures: Set[str] = set()
+        self.raw_bytes = 0
+        self.lines = 0
+        self.write("meta", f"task={task_id} model={model} stage={stage} backend={backend}")
+
+    def write(self, stream: str, line: str):
+        """Record one complete line of a stream ("prompt", "out", "err", "build", ...)"""
+        line = line.rstrip('\n')
+        data = f"[{stream}] {line}\n".encode("utf-8", errors="replace")
+        with self.lock:
+            self.writer.write(data)
+            self.raw_bytes += len(data)
+            self.lines += 1
+            self.tails.setdefault(stream, deque(maxlen=TAIL_LINES)).append(line)
+            if len(self.signatures) < MAX_SIGNATURES:
+                signature = signature_of(line, stream)
+                if signature:
+                    self.signatures.add(signature)
+
+    def write_text(self, stream: str, text: str):
+        """Record text that may end mid-line (streamed tokens); flushed on close"""
+        buffered = self.partial.get(stream, "") + text
+        *lines, self.partial[stream] = buffered.split('\n')
+        for line in lines:
+            self.write(stream, line)
+
+    def add_signature(self, signature: str):
+        with self.lock:
+            self.signatures.add(signature[:120])
+
+    def tail(self, stream: str, max_chars: Optional[int] = None) -> str:
+        with self.lock:
+            text = '\n'.join(self.tails.get(stream, ()))
+        if max_chars and len(text) > max_chars:
+            text = "…" + text[-max_chars:]
+        return text
+
+    def close(self, outcome: str) -> Optional[int]:
+        """Finish the file and index the run; returns its run id"""
+        for stream, rest in list(self.partial.items()):
+            if rest:
+                self.write(stream, rest)
+        self.partial.clear()
+        self.ended = time.time()
+        self.outcome = outcome
+        self.write("meta", f"outcome={outcome} seconds={self.ended - self.started:.1f}")
+        with self.lock:
+            self.writer.close()
+        if self.index is not None:
+            self.run_id = self.index.add_run(self)
+        return self.run_id
+
+
+def read_log(path: Path, pattern: Optional[str] = None) -> Iterator[str]:
+    """Lines of an archived log (optionally only those matching a regex)"""
+    regex = re.compile(pattern) if pattern else None
+    with open_reader(path) as f:
+        for line in f:
+            if regex is None or regex.search(line):
+                yield line.rstrip('\n')
+
+
+def parse_time(value: str) -> float:
+    """Epoch seconds from "2026-10-19", "2026-10-19T14:00" or a relative "6h" / "3d" """
+    match = re.fullmatch(r'(\d+)([hd])', value)
+    if match:
+        return time.time() - int(match.group(1)) * (3600 if match.group(2) == "h" else 86400)
+    return datetime.fromisoformat(value).timestamp()
+
+
+def take(args: List[str], flag: str) -> Optional[str]:
+    if flag not in args:
+        return None
+    index = args.index(flag)
+    value = args[index + 1]
+    del args[index:index + 2]
+    return value
+
+
+def main():
+    args = sys.argv[1:]
+    command = args.pop(0) if args else "search"
+    index = TaskLogIndex()
+
+    if command == "search":
+        since, until = take(args, "--since"), take(args, "--until")
+        rows = index.search(
+            task=take(args, "--task"), model=take(args, "--model"),
+            signature=take(args, "--signature"), outcome=take(args, "--outcome"),
+            since=parse_time(since) if since else None, until=parse_time(until) if until else None,
+            limit=int(take(args, "--limit") or 50)
+        )
+        for row in rows:
+            started = datetime.fromtimestamp(row["started"]).strftime("%Y-%m-%d %H:%M")
+            seconds = (row["ended"] or row["started"]) - row["started"]
+            print(f"#{row['id']:<6} {started}  {row['task_id']:<10} {row['outcome'] or '?':<12} "
+                  f"{seconds / 60:5.1f}m  {row['model']}")
+            for signature in index.signatures(row["id"])[:3]:
+                print(f"         ↳ {signature}")
+        print(f"\n🔎 {len(rows)} run(s)")
+
+    elif command == "show":
+        target = args.pop(0)
+        if target.lstrip("#").isdigit():
+            rows = [row for row in [index.get(int(target.lstrip("#")))] if row]
+        else:
+            rows = index.search(task=target, limit=1)
+        if not rows:
+            print(f"❌ No run matches {target}")
+            sys.exit(1)
+        for line in read_log(LOG_DIR / rows[0]["path"], take(args, "--grep")):
+            print(line)
+
+    elif command == "signatures":
+        since = take(args, "--since")
+        for row in index.top_signatures(parse_time(since) if since else None):
+            print(f"{row['runs']:>6} runs {row['tasks']:>5} tasks  {row['signature']}")
+
+    else:
+        print("""Usage:
+    task_logs.py search [--task ID] [--model NAME] [--signature TEXT] [--outcome failed]
+                        [--since 2026-10-01|6h|3d] [--until DATE] [--limit N]
+    task_logs.py show RUN_ID|TASK_ID [--grep REGEX]
+    task_logs.py signatures [--since DATE]""")
+
+
+if __name__ == "__main__":
+    main()
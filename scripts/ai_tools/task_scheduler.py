@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Task Scheduler - Runs orchestrator tasks as a dependency DAG
+Edges come from each task's expected outputs (get_files_for_task and
+STAGE_DELIVERABLES) and inputs (files its description names, autoloads and
+existing scene/script references). Ready tasks are dispatched in critical-path
+order; independent ones can run concurrently in separate git worktrees
+"""
+
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+
+from admission_control import ADMISSION_POLL
+from dependency_graph import DependencyGraph
+from task_verifier import STAGE_DELIVERABLES
+from throughput import load_rollups, stage_cycle_times
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+# Used for critical-path weights until a stage has measured cycle times
+DEFAULT_TASK_SECONDS = 300
+# Stop dispatching after this many failures in one run that will not be retried
+MAX_FAILURES = 3
+# Files every task gets as context; never treated as an output
+CONTEXT_FILES = {"development_plan.md"}
+
+
+class IntegrationConflict(Exception):
+    """A worktree task's commits no longer apply on top of the main branch"""
+
+
+@dataclass
+class TaskNode:
+    task: object
+    order: int
+    outputs: Set[str]
+    inputs: Set[str] = field(default_factory=set)
+    deps: Set[str] = field(default_factory=set)
+    dependents: Set[str] = field(default_factory=set)
+    exclusive: bool = False  # outputs unknown: never run alongside other tasks
+    estimate: float = DEFAULT_TASK_SECONDS
+    rank: float = 0.0  # critical path: longest estimated time from here to the end
+
+    @property
+    def id(self) -> str:
+        return self.task.id
+
+
+def task_outputs(orchestrator, task) -> Set[str]:
+    """Files a task is expected to create or modify"""
+    outputs = set(orchestrator.get_files_for_task(task)) - CONTEXT_FILES
+    for path in STAGE_DELIVERABLES.get(task.stage, {}):
+        if path in task.description:
+            outputs.add(path)
+    return outputs
+
+
+def mentions(description: str, path: str) -> bool:
+    """Whether a task description refers to a file ("level_data.gd" -> "level data")"""
+    stem = Path(path).stem.lower()
+    text = description.lower()
+    return stem in text or stem.replace("_", " ") in text
+
+
+def build_task_graph(orchestrator, tasks: List, graph: Optional[DependencyGraph] = None) -> Dict[str, TaskNode]:
+    """DAG of tasks keyed by id
+
+    A task depends on an earlier task (in the given order) that produces one of
+    its inputs, or that writes one of the same files. Only earlier producers
+    are considered, which keeps the graph acyclic and the given order as the
+    tie-breaker.
+    """
+    graph = graph or DependencyGraph()
+    cycle_times = stage_cycle_times(load_rollups())
+
+    nodes: Dict[str, TaskNode] = {}
+    for order, task in enumerate(tasks):
+        outputs = task_outputs(orchestrator, task)
+        nodes[task.id] = TaskNode(
+            task=task,
+            order=order,
+            outputs=outputs,
+            exclusive=not outputs,
+            estimate=cycle_times.get(task.stage, {}).get("mean") or DEFAULT_TASK_SECONDS,
+        )
+
+    all_outputs = set().union(*(node.outputs for node in nodes.values())) if nodes else set()
+    for node in nodes.values():
+        for path in all_outputs - node.outputs:
+            # Autoload singletons are available to (and used by) every script
+            if "/autoloads/" in path or mentions(node.task.description, path):
+                node.inputs.add(path)
+        # Scenes/scripts that already exist show what they load
+        for path in node.outputs:
+            node.inputs.update(graph.files.get(path, {}).get("deps", []))
+        node.inputs -= node.outputs
+
+    ordered = sorted(nodes.values(), key=lambda n: n.order)
+    for node in ordered:
+        for earlier in ordered[:node.order]:
+            if earlier.outputs & (node.inputs | node.outputs):
+                node.deps.add(earlier.id)
+                earlier.dependents.add(node.id)
+
+    # Critical path, computed from the last task backwards
+    for node in reversed(ordered):
+        node.rank = node.estimate + max((nodes[d].rank for d in node.dependents), default=0.0)
+
+    return nodes
+
+
+class WorktreeRunner:
+    """Runs one task in its own git worktree and fast-forwards main onto it"""
+
+    def __init__(self, root: Path = PROJECT_ROOT):
+        self.root = Path(root)
+        self.workspace = Path(tempfile.mkdtemp(prefix="ai-tasks-"))
+        # Worktree creation and integration both update shared refs
+        self.git_lock = threading.Lock()
+
+    def git(self, *args: str, cwd: Optional[Path] = None) -> subprocess.CompletedProcess:
+        return subprocess.run(["git", *args], capture_output=True, text=True, cwd=cwd or self.root)
+
+    def create(self, task_id: str, rev: str = "HEAD") -> Path:
+        worktree = self.workspace / task_id
+        with self.git_lock:
+            result = self.git("worktree", "add", "--detach", "--force", str(worktree), rev)
+        if result.returncode != 0:
+            raise RuntimeError(f"Could not create worktree for {task_id}: {result.stderr.strip()}")
+
+        # Reuse the editor's import cache so headless checks skip the full import
+        imported = self.root / ".godot"
+        if imported.is_dir():
+            shutil.copytree(imported, worktree / ".godot", dirs_exist_ok=True)
+        return worktree
+
+    def integrate(self, worktree: Path) -> Optional[str]:
+        """Rebase the worktree's commits onto main and fast-forward main
+
+        Returns:
+            The main commit the task was applied on top of
+
+        Raises:
+            IntegrationConflict if the commits do not rebase cleanly
+        """
+        with self.git_lock:
+            main_head = self.git("rev-parse", "HEAD").stdout.strip()
+            rebase = self.git("rebase", main_head, cwd=worktree)
+            if rebase.returncode != 0:
+                self.git("rebase", "--abort", cwd=worktree)
+                raise IntegrationConflict(rebase.stderr.strip() or rebase.stdout.strip())
+
+            task_head = self.git("rev-parse", "HEAD", cwd=worktree).stdout.strip()
+            merge = self.git("merge", "--ff-only", task_head)
+            if merge.returncode != 0:
+                raise IntegrationConflict(merge.stderr.strip())
+        return main_head
+
+    def remove(self, worktree: Path):
+        with self.git_lock:
+            self.git("worktree", "remove", "--force", str(worktree))
+
+    def close(self):
+        shutil.rmtree(self.workspace, ignore_errors=True)
+        self.git("worktree", "prune")
+
+
+class TaskScheduler:
+    def __init__(self, orchestrator, tasks: List, max_parallel: int = 1, resume: Optional[Set[str]] = None,
+                 graph: Optional[DependencyGraph] = None, remote=None):
+        self.orchestrator = orchestrator
+        self.max_parallel = max(1, max_parallel)
+        self.remote = remote  # a task_coordinator.Coordinator: tasks run on workers
+        self.resume = resume or set()  # interrupted tasks with checkpointed work
+        self.nodes = build_task_graph(orchestrator, tasks, graph)
+        self.done: Set[str] = set()
+        self.failed: Set[str] = set()
+        self.deferred: Set[str] = set()  # conflicts or failed prerequisites: retried next run
+
+    def is_ready(self, node: TaskNode) -> bool:
+        return node.deps <= self.done
+
+    def is_blocked(self, node: TaskNode) -> bool:
+        """A prerequisite failed or was deferred in this run"""
+        return bool(node.deps & (self.failed | self.deferred))
+
+    def ready_queue(self, pending: Set[str]) -> List[TaskNode]:
+        """Ready tasks: urgent backlog first, then interrupted ones, then longest
+        critical path, then plan order"""
+        ready = [self.nodes[i] for i in pending if self.is_ready(self.nodes[i])]
+        return sorted(ready, key=lambda n: (not n.id.startswith("GH"), n.id not in self.resume, -n.rank, n.order))
+
+    def can_start(self, node: TaskNode, running: Dict[str, TaskNode]) -> bool:
+        if not running:
+            return True
+        if node.exclusive or any(r.exclusive for r in running.values()):
+            return False
+        return not any(node.outputs & r.outputs for r in running.values())
+
+    def execute(self, node: TaskNode, runner: Optional[WorktreeRunner]) -> bool:
+        if runner is None:
+            return self.orchestrator.execute_task_with_aider(node.task)
+
+        worktree = runner.create(node.id)
+        try:
+            return self.orchestrator.execute_task_with_aider(
+                node.task, workdir=worktree, integrate=lambda: runner.integrate(worktree), remote=self.remote
+            )
+        finally:
+            runner.remove(worktree)
+
+    def release(self, node: TaskNode):
+        """Drop the lease of a task that ended without cleaning up after itself"""
+        leases = self.orchestrator.leases
+        if node.id in leases.held:
+            leases.release(node.id)
+
+    def run(self, max_tasks: int, on_result: Callable[[object, bool, float], bool]) -> Dict[str, Set[str]]:
+        """Dispatch up to `max_tasks` tasks; dependents of unfinished work wait
+
+        `on_result(task, success, seconds)` is called once per finished task
+        (from the scheduling thread) and returns True if a failed task will be
+        retried later. Retried tasks, tasks whose prerequisites failed and
+        worktree tasks that could not be integrated are left pending rather
+        than failed. A task that raises is counted as failed (its worktree is
+        removed by execute) and the others keep running.
+        """
+        pending = set(self.nodes)
+        running: Dict[str, TaskNode] = {}
+        futures = {}
+        started_at: Dict[str, float] = {}
+        reservations = {}
+        admission = self.orchestrator.admission
+        waiting_for_memory = None
+        dispatched = 0
+        # Remote tasks always get a local worktree for their commits to land in
+        runner = WorktreeRunner() if self.max_parallel > 1 or self.remote else None
+
+        if self.remote:
+            print(f"🌐 Dispatching up to {self.max_parallel} independent tasks to workers")
+        elif runner:
+            print(f"🧵 Running up to {self.max_parallel} independent tasks in parallel worktrees")
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_parallel) as pool:
+                try:
+                    while True:
+                        for node in [self.nodes[i] for i in pending if self.is_blocked(self.nodes[i])]:
+                            pending.discard(node.id)
+                            self.deferred.add(node.id)
+                            print(f"⏸️  {node.id} waits: a prerequisite did not complete")
+
+                        throttled = False
+                        if len(self.failed) < MAX_FAILURES:
+                            for node in self.ready_queue(pending):
+                                if dispatched >= max_tasks or len(running) >= self.max_parallel:
+                                    break
+                                if not self.can_start(node, running):
+                                    continue
+                                # Not enough memory for another task (and its model) yet;
+                                # workers check their own memory
+                                if not self.remote:
+                                    reservation = admission.try_admit("task", node.task.model)
+                                    if reservation is None:
+                                        if waiting_for_memory != node.id:
+                                            print(f"⏳ {node.id} waits for memory: {admission.last_refusal}")
+                                            waiting_for_memory = node.id
+                                        throttled = True
+                                        break
+                                    reservations[node.id] = reservation
+                                pending.discard(node.id)
+                                running[node.id] = node
+                                started_at[node.id] = time.time()
+                                futures[pool.submit(self.execute, node, runner)] = node
+                                dispatched += 1
+
+                        if not futures:
+                            break
+
+                        # While throttled, re-check the headroom even if no task finishes
+                        finished, _ = wait(list(futures), timeout=ADMISSION_POLL if throttled else None,
+                                           return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            node = futures.pop(future)
+                            del running[node.id]
+                            admission.release(reservations.pop(node.id, None))
+                            try:
+                                success = future.result()
+                            except IntegrationConflict as e:
+                                print(f"🔀 {node.id} conflicts with newer commits; retrying next iteration\n   {e}")
+                                self.deferred.add(node.id)
+                                continue
+                            except Exception as e:
+                                # A crashed task must not take the other running tasks down with it
+                                print(f"💥 {node.id} crashed: {type(e).__name__}: {e}")
+                                self.release(node)
+                                self.failed.add(node.id)
+                                continue
+
+                            retry = on_result(node.task, success, time.time() - started_at[node.id])
+                            if success:
+                                self.done.add(node.id)
+                            else:
+                                (self.deferred if retry else self.failed).add(node.id)
+                except BaseException:
+                    # Ctrl+C / SIGTERM: stop running tasks so they checkpoint
+                    # before the pool waits for them
+                    self.orchestrator.shutdown()
+                    raise
+        finally:
+            for reservation in reservations.values():
+                admission.release(reservation)
+            if runner:
+                runner.close()
+
+        if len(self.failed) >= MAX_FAILURES:
+            print(f"❌ Too many failures ({len(self.failed)}). Stopping for review.")
+
+        return {"done": self.done, "failed": self.failed, "deferred": self.deferred, "not_started": pending}
+
+
+def format_plan(nodes: Dict[str, TaskNode]) -> str:
+    lines = []
+    for node in sorted(nodes.values(), key=lambda n: (-n.rank, n.order)):
+        deps = ", ".join(sorted(node.deps, key=lambda d: nodes[d].order)) or "-"
+        flag = " (exclusive)" if node.exclusive else ""
+        lines.append(f"   {node.id:<8} path {node.rank / 60:>6.1f}m  after: {deps}{flag}")
+    return '\n'.join(lines)
+
+
+def main():
+    from agent_orchestrator import AgentOrchestrator
+
+    orchestrator = AgentOrchestrator()
+    if len(sys.argv) > 1:
+        orchestrator.current_stage = int(sys.argv[1])
+    tasks = orchestrator.parse_development_plan()
+    nodes = build_task_graph(orchestrator, tasks)
+    print(f"🗺️  Stage {orchestrator.current_stage}: {len(nodes)} tasks, critical path first")
+    print(format_plan(nodes))
+
+
+if __name__ == "__main__":
+    main()
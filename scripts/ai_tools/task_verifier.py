@@ -6,13 +6,22 @@ Creates GitHub issues for incomplete work
 
 import subprocess
 import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set, Tuple
+
+from dependency_graph import DependencyGraph, changed_files
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 PROGRESS_FILE = PROJECT_ROOT / ".ai_progress.json"
 DEV_PLAN = PROJECT_ROOT / "development_plan.md"
 
+# Upper bound on concurrent `gh issue create` calls in a single verification run
+MAX_PARALLEL_CREATES = 4
+# gh defaults to 30 results, which would silently hide older urgent issues
+ISSUE_LIST_LIMIT = 1000
+
 # Expected deliverables based on development plan stages
 STAGE_DELIVERABLES = {
     1: {
@@ -52,6 +61,17 @@ class TaskVerifier:
     def __init__(self):
         self.progress = self.load_progress()
         self.missing_deliverables: Dict[int, List[str]] = {}
+        # {stage: {title: issue_number}}, fetched lazily with a single gh call
+        self.urgent_issue_index: Optional[Dict[int, Dict[str, int]]] = None
+        self.graph: Optional[DependencyGraph] = None
+
+    def get_graph(self) -> DependencyGraph:
+        """Load the dependency graph once and bring it up to date"""
+        if self.graph is None:
+            self.graph = DependencyGraph()
+            self.graph.refresh()
+            self.graph.save()
+        return self.graph
 
     def load_progress(self) -> dict:
         """Load AI progress tracking"""
@@ -75,9 +95,13 @@ class TaskVerifier:
             full_path = PROJECT_ROOT / filepath
 
             if full_path.exists():
+                broken = self.get_graph().broken_references([filepath]).get(filepath)
                 # Check if file is not empty
-                if full_path.stat().st_size > 0:
+                if full_path.stat().st_size > 0 and not broken:
                     print(f"  ✅ {filepath}")
+                elif broken:
+                    print(f"  ⚠️  {filepath} (broken references: {', '.join(broken)})")
+                    missing.append(f"{filepath} - {description} (references missing {', '.join(broken)})")
                 else:
                     print(f"  ⚠️  {filepath} (exists but empty)")
                     missing.append(f"{filepath} - {description} (file is empty)")
@@ -104,38 +128,58 @@ class TaskVerifier:
 
         return stages
 
-    def check_existing_issue(self, stage: int) -> bool:
-        """Check if an open issue already exists for this stage's missing deliverables"""
+    def load_urgent_issue_index(self) -> Dict[int, Dict[str, int]]:
+        """Fetch all open urgent issues once and index them by stage and title"""
+        if self.urgent_issue_index is not None:
+            return self.urgent_issue_index
+
+        index: Dict[int, Dict[str, int]] = {}
         try:
             result = subprocess.run(
                 ["gh", "issue", "list",
                  "--state", "open",
-                 "--label", f"stage-{stage}",
                  "--label", "urgent",
-                 "--json", "number,title"],
+                 "--limit", str(ISSUE_LIST_LIMIT),
+                 "--json", "number,title,labels"],
                 capture_output=True,
                 text=True
             )
 
             if result.returncode == 0:
-                issues = json.loads(result.stdout)
-                # Check if any open issue matches this stage's missing deliverables pattern
-                for issue in issues:
-                    if f"[Stage {stage}]" in issue["title"] and "Missing Deliverables" in issue["title"]:
-                        print(f"\n⚠️  Open issue already exists for Stage {stage}: #{issue['number']}")
-                        return True
-            return False
+                for issue in json.loads(result.stdout):
+                    for label in issue.get("labels", []):
+                        name = label.get("name", "")
+                        if name.startswith("stage-") and name[6:].isdigit():
+                            index.setdefault(int(name[6:]), {})[issue["title"]] = issue["number"]
+            else:
+                print(f"\n⚠️  Error listing urgent issues: {result.stderr.strip()}")
         except Exception as e:
             print(f"\n⚠️  Error checking for existing issues: {e}")
-            return False
 
-    def create_github_issue_for_missing(self, stage: int, missing: List[str]):
-        """Create a GitHub issue for missing deliverables (only if one doesn't already exist)"""
-        # Check if an issue already exists for this stage
-        if self.check_existing_issue(stage):
-            print(f"   Skipping issue creation - open issue already exists")
-            return None
+        self.urgent_issue_index = index
+        return index
+
+    def get_affected_stages(self, base: str) -> Set[int]:
+        """Completed stages whose deliverables are touched by changes since `base`"""
+        changed = changed_files(base)
+        affected = self.get_graph().affected_by(changed) | set(changed)
+
+        return {
+            stage for stage in self.get_completed_stages()
+            if stage in STAGE_DELIVERABLES and affected & set(STAGE_DELIVERABLES[stage])
+        }
 
+    def check_existing_issue(self, stage: int) -> bool:
+        """Check if an open issue already exists for this stage's missing deliverables"""
+        for title, number in self.load_urgent_issue_index().get(stage, {}).items():
+            # Check if any open issue matches this stage's missing deliverables pattern
+            if f"[Stage {stage}]" in title and "Missing Deliverables" in title:
+                print(f"\n⚠️  Open issue already exists for Stage {stage}: #{number}")
+                return True
+        return False
+
+    def build_missing_issue(self, stage: int, missing: List[str]) -> Tuple[str, str]:
+        """Build the title and body of a missing-deliverables issue"""
         title = f"[Stage {stage}] Missing Deliverables - Incomplete Work"
 
         body = f"""## Stage {stage} Verification Failed
@@ -147,7 +191,7 @@ The automated task verifier has detected that Stage {stage} was marked as comple
         for item in missing:
             body += f"- [ ] `{item}`\n"
 
-        body += """
+        body += f"""
 ### Required Actions:
 1. Review each missing deliverable
 2. Implement the missing components
@@ -163,7 +207,10 @@ The automated task verifier has detected that Stage {stage} was marked as comple
 ### Labels:
 `ai-generated`, `build-error`, `urgent`, `stage-{stage}`
 """
+        return title, body
 
+    def submit_issue(self, stage: int, title: str, body: str) -> Optional[str]:
+        """Create a single GitHub issue and record it in the index"""
         try:
             result = subprocess.run(
                 ["gh", "issue", "create",
@@ -177,6 +224,9 @@ The automated task verifier has detected that Stage {stage} was marked as comple
             if result.returncode == 0:
                 issue_url = result.stdout.strip()
                 print(f"\n📋 Created GitHub issue: {issue_url}")
+                number = issue_url.rstrip('/').split('/')[-1]
+                if number.isdigit() and self.urgent_issue_index is not None:
+                    self.urgent_issue_index.setdefault(stage, {})[title] = int(number)
                 return issue_url
             else:
                 print(f"\n❌ Failed to create GitHub issue: {result.stderr}")
@@ -185,12 +235,46 @@ The automated task verifier has detected that Stage {stage} was marked as comple
             print(f"\n❌ Error creating GitHub issue: {e}")
             return None
 
-    def verify_all_completed_stages(self):
-        """Verify all stages that have completed tasks"""
+    def submit_issues(self, creates: Dict[int, Tuple[str, str]]) -> Dict[int, Optional[str]]:
+        """Create all pending issues concurrently with bounded parallelism"""
+        if not creates:
+            return {}
+
+        workers = min(MAX_PARALLEL_CREATES, len(creates))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                stage: pool.submit(self.submit_issue, stage, title, body)
+                for stage, (title, body) in creates.items()
+            }
+            return {stage: future.result() for stage, future in futures.items()}
+
+    def create_github_issue_for_missing(self, stage: int, missing: List[str]):
+        """Create a GitHub issue for missing deliverables (only if one doesn't already exist)"""
+        # Check if an issue already exists for this stage
+        if self.check_existing_issue(stage):
+            print("   Skipping issue creation - open issue already exists")
+            return None
+
+        title, body = self.build_missing_issue(stage, missing)
+        return self.submit_issue(stage, title, body)
+
+    def verify_all_completed_stages(self, changed_since: Optional[str] = None):
+        """Verify all stages that have completed tasks
+
+        Args:
+            changed_since: Only verify stages whose deliverables are affected by
+                           commits after this revision
+        """
         print("🔍 Task Verification Agent")
         print("=" * 80)
 
-        completed_stages = self.get_completed_stages()
+        if changed_since:
+            completed_stages = self.get_affected_stages(changed_since)
+            if not completed_stages:
+                print(f"\n✅ No completed stage deliverables affected since {changed_since}")
+                return True
+        else:
+            completed_stages = self.get_completed_stages()
 
         if not completed_stages:
             print("\n✅ No completed stages found in progress file")
@@ -199,6 +283,7 @@ The automated task verifier has detected that Stage {stage} was marked as comple
         print(f"\nFound completed tasks in stages: {sorted(completed_stages)}")
 
         all_valid = True
+        pending_creates: Dict[int, Tuple[str, str]] = {}
 
         for stage in sorted(completed_stages):
             is_valid = self.verify_stage(stage)
@@ -211,11 +296,18 @@ The automated task verifier has detected that Stage {stage} was marked as comple
                     missing = self.missing_deliverables[stage]
                     print(f"   Missing {len(missing)} deliverable(s)")
 
-                    # Create GitHub issue
-                    self.create_github_issue_for_missing(stage, missing)
+                    # Queue GitHub issue (submitted together once all stages are checked)
+                    if self.check_existing_issue(stage):
+                        print("   Skipping issue creation - open issue already exists")
+                    else:
+                        pending_creates[stage] = self.build_missing_issue(stage, missing)
             else:
                 print(f"\n✅ Stage {stage} verification PASSED")
 
+        if pending_creates:
+            print(f"\n📋 Creating {len(pending_creates)} GitHub issue(s)...")
+            self.submit_issues(pending_creates)
+
         print("\n" + "=" * 80)
 
         if all_valid:
@@ -228,8 +320,12 @@ The automated task verifier has detected that Stage {stage} was marked as comple
         return all_valid
 
 def main():
+    changed_since = None
+    if len(sys.argv) > 2 and sys.argv[1] == "--changed":
+        changed_since = sys.argv[2]
+
     verifier = TaskVerifier()
-    verifier.verify_all_completed_stages()
+    verifier.verify_all_completed_stages(changed_since)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,214 @@
+"""A small plan dispatched through the coordinator to worker_daemon processes on 127.0.0.1
+
+Each worker runs from its own clone of a throwaway project, with a stand-in
+aider on PATH that writes one notes file per task and commits it.
+"""
+
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from agent_orchestrator import Task
+from plan_tasks import iter_plan_tasks
+from retry_policy import Failure
+from task_coordinator import Coordinator, is_loopback
+from task_leases import rev_parse
+from task_scheduler import WorktreeRunner
+
+TOOLS_DIR = Path(__file__).parent.parent
+WORKERS = 3
+REGISTER_TIMEOUT = 60
+MODEL = "ollama_chat/qwen2.5-coder:7b"
+
+PLAN = """# Development Plan
+
+## Stage 1
+### Tasks
+- Write the movement notes
+- Write the camera notes
+- Write the input notes
+- Write the audio notes
+"""
+
+FAKE_AIDER = """#!{python}
+import subprocess, sys, time
+from pathlib import Path
+
+message = sys.argv[sys.argv.index("--message") + 1]
+name = message.split()[0]
+time.sleep(0.5)
+Path(f"notes_{{name}}.md").write_text(message.splitlines()[0] + "\\n")
+subprocess.run(["git", "add", "--", f"notes_{{name}}.md"], check=True)
+subprocess.run(["git", "commit", "-q", "-m", f"Notes for {{name}}"], check=True)
+"""
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="needs git")
+
+
+def git(*args, cwd):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+class Log:
+    def __init__(self):
+        self.entries = []
+
+    def write_text(self, stream: str, text: str):
+        self.entries.append((stream, text))
+
+
+class Driver:
+    """The parts of AgentOrchestrator the coordinator uses"""
+
+    def __init__(self, reject=()):
+        self.stopping = threading.Event()
+        self.task_logs = {}
+        self.reject = set(reject)
+        self.verified = []
+
+    def verify_attempt(self, task, workdir: Path, base_commit):
+        self.verified.append((task.id, sorted(p.name for p in workdir.glob("notes_*.md"))))
+        if task.id in self.reject:
+            return Failure("build", output="broken"), "Build verification failed"
+        return None, "Build verification passed"
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "project"
+    shutil.copytree(TOOLS_DIR, root / "scripts" / "ai_tools",
+                    ignore=shutil.ignore_patterns("tests", "__pycache__", ".*"))
+    (root / "development_plan.md").write_text(PLAN)
+    (root / ".gitignore").write_text(".ai_*\n.validation_log/\n__pycache__/\n")
+    git("init", "-q", cwd=root)
+    git("config", "user.name", "test", cwd=root)
+    git("config", "user.email", "test@example.com", cwd=root)
+    git("add", "-A", cwd=root)
+    git("commit", "-q", "-m", "Project", cwd=root)
+    return root
+
+
+@pytest.fixture
+def cluster(project, tmp_path):
+    """Coordinator on an ephemeral port plus WORKERS worker daemons"""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    aider = bin_dir / "aider"
+    aider.write_text(FAKE_AIDER.format(python=sys.executable))
+    aider.chmod(0o755)
+
+    driver = Driver()
+    coordinator = Coordinator(driver, ("127.0.0.1", 0), root=project)
+    coordinator.start()
+    host, port = coordinator.address
+
+    env = {
+        **os.environ,
+        "PATH": f"{bin_dir}{os.pathsep}{os.environ['PATH']}",
+        # Nothing listens there: workers register without models
+        "OLLAMA_HOST": "http://127.0.0.1:9",
+        "AI_BACKEND": "aider",
+        "PYTHONUNBUFFERED": "1",
+    }
+    env.pop("AI_COORDINATOR_TOKEN", None)
+    processes = []
+    for n in range(WORKERS):
+        clone = tmp_path / f"worker{n}"
+        git("clone", "-q", str(project), str(clone), cwd=tmp_path)
+        git("config", "user.name", f"worker{n}", cwd=clone)
+        git("config", "user.email", f"worker{n}@example.com", cwd=clone)
+        processes.append(subprocess.Popen(
+            [sys.executable, str(clone / "scripts" / "ai_tools" / "worker_daemon.py"),
+             f"{host}:{port}", "--name", f"w{n}"],
+            cwd=clone, env=env, stdout=open(tmp_path / f"worker{n}.log", "w"), stderr=subprocess.STDOUT
+        ))
+
+    deadline = time.time() + REGISTER_TIMEOUT
+    while len(coordinator.status()) < WORKERS:
+        if time.time() > deadline:
+            logs = "\n".join((tmp_path / f"worker{n}.log").read_text() for n in range(WORKERS))
+            pytest.fail(f"workers did not register:\n{logs}")
+        time.sleep(0.2)
+
+    yield driver, coordinator
+    for process in processes:
+        # Ctrl+C: the daemon closes its worktree runner on the way out
+        process.send_signal(signal.SIGINT)
+    for process in processes:
+        process.wait(timeout=10)
+    coordinator.stop()
+
+
+def dispatch(project, driver, coordinator) -> dict:
+    """Run every plan task on the workers and integrate what verifies"""
+    tasks = [Task(task_id, desc, desc, stage, "normal", MODEL)
+             for stage, task_id, desc in iter_plan_tasks((project / "development_plan.md").read_text())]
+    runner = WorktreeRunner(project)
+
+    def run(task):
+        driver.task_logs[task.id] = Log()
+        worktree = runner.create(task.id)
+        try:
+            base = rev_parse("HEAD", worktree)
+            failure, message = coordinator.run_attempt(task, f"{task.id} {task.description}", [], worktree, base)
+            if failure is None:
+                runner.integrate(worktree)
+            return failure, message
+        finally:
+            runner.remove(worktree)
+
+    try:
+        with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+            return dict(zip([t.id for t in tasks], pool.map(run, tasks)))
+    finally:
+        runner.close()
+
+
+def test_plan_runs_on_workers_and_lands_on_main(project, cluster):
+    driver, coordinator = cluster
+
+    results = dispatch(project, driver, coordinator)
+
+    assert len(results) == 4
+    assert all(failure is None for failure, _ in results.values()), results
+    workers = {message.rsplit("`", 2)[-2] for _, message in results.values()}
+    assert len(workers) > 1
+    for task_id in results:
+        assert (project / f"notes_{task_id}.md").exists()
+    # Every result was verified locally, with the worker's commit checked out
+    assert sorted(task_id for task_id, _ in driver.verified) == sorted(results)
+    for task_id, notes in driver.verified:
+        assert f"notes_{task_id}.md" in notes
+
+
+def test_result_failing_local_verification_is_not_integrated(project, cluster):
+    driver, coordinator = cluster
+    rejected = next(iter_plan_tasks(PLAN))[1]
+    driver.reject.add(rejected)
+
+    results = dispatch(project, driver, coordinator)
+
+    failure, message = results[rejected]
+    assert failure is not None and failure.step == "build"
+    assert "not locally" in message
+    assert not (project / f"notes_{rejected}.md").exists()
+    assert sum(1 for failure, _ in results.values() if failure is None) == 3
+
+
+def test_coordinator_needs_a_token_beyond_loopback(tmp_path):
+    assert is_loopback("127.0.0.1") and is_loopback("localhost") and is_loopback("::1")
+    assert not is_loopback("0.0.0.0") and not is_loopback("")
+
+    with pytest.raises(ValueError, match="AI_COORDINATOR_TOKEN"):
+        Coordinator(Driver(), ("0.0.0.0", 0), root=tmp_path, token="")
+
+    coordinator = Coordinator(Driver(), ("0.0.0.0", 0), root=tmp_path, token="secret")
+    coordinator.server.server_close()
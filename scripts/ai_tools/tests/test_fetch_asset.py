@@ -0,0 +1,193 @@
+"""fetch_asset.py against a local stand-in for the Poly Pizza API"""
+
+import json
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import fetch_asset
+from asset_cache import AssetCache
+from fetch_asset import AssetFetcher, RateLimiter
+
+FILES = {
+    "crate.glb": b"glTF-crate-" * 5000,
+    "barrel.glb": b"glTF-barrel-" * 4000,
+}
+ASSETS = {
+    "crate": {"ID": "1", "Title": "Crate", "DownloadURL": "/files/crate.glb"},
+    "barrel": {"ID": "2", "Title": "Barrel", "DownloadURL": "/files/barrel.glb"},
+}
+# Queries the search endpoint resolves; two of them name the same asset
+SEARCHES = {"crate": ["crate"], "wooden crate": ["crate"], "barrel": ["barrel"]}
+
+
+class PolyPizzaStub(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.requests = Counter()
+        self.ranges = []
+        # File name -> bytes to send before dropping the connection (once)
+        self.cut = {}
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests[self.path] += 1
+
+        if self.path.startswith("/search/"):
+            query = self.path[len("/search/"):].replace("%20", " ")
+            if query == "broken":
+                self.send_error(400)
+                return
+            if query == "garbled":
+                self.send_response(200)
+                self.send_header("Content-Length", "10")
+                self.end_headers()
+                self.wfile.write(b"<html>oops")
+                return
+            results = [
+                {**ASSETS[name], "DownloadURL": server.url + ASSETS[name]["DownloadURL"]}
+                for name in SEARCHES.get(query, [])
+            ]
+            body = json.dumps({"total": len(results), "results": results}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        name = self.path.rsplit("/", 1)[-1]
+        data = FILES.get(name)
+        if data is None:
+            self.send_error(404)
+            return
+
+        range_header = self.headers.get("Range")
+        with server.lock:
+            server.ranges.append((name, range_header))
+            cut = server.cut.pop(name, None)
+
+        offset = int(range_header[len("bytes="):].rstrip("-")) if range_header else 0
+        if offset >= len(data):
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{len(data)}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = data[offset:]
+        self.send_response(206 if offset else 200)
+        if offset:
+            self.send_header("Content-Range", f"bytes {offset}-{len(data) - 1}/{len(data)}")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body[:cut] if cut is not None else body)
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    server = PolyPizzaStub()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(fetch_asset, "API_BASE", server.url)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_fetcher(tmp_path, save_dir: str = "models", max_workers: int = 4) -> AssetFetcher:
+    # The stub files are not real models, so the budget gate is off
+    fetcher = AssetFetcher(save_dir=tmp_path / save_dir, max_workers=max_workers,
+                           cache=AssetCache(tmp_path / "cache"), budgets=None)
+    fetcher.rate_limiter = RateLimiter(0)
+    return fetcher
+
+
+def test_download_resumes_with_range_after_cut_transfer(stub, tmp_path):
+    half = len(FILES["crate.glb"]) // 2
+    stub.cut["crate.glb"] = half
+
+    dest = make_fetcher(tmp_path).download(f"{stub.url}/files/crate.glb", tmp_path / "crate.glb")
+
+    assert dest.read_bytes() == FILES["crate.glb"]
+    assert stub.ranges == [("crate.glb", None), ("crate.glb", f"bytes={half}-")]
+    assert not (tmp_path / "crate.glb.part").exists()
+
+
+def test_complete_part_file_is_kept_on_416(stub, tmp_path):
+    (tmp_path / "crate.glb.part").write_bytes(FILES["crate.glb"])
+
+    dest = make_fetcher(tmp_path).download(f"{stub.url}/files/crate.glb", tmp_path / "crate.glb")
+
+    assert dest.read_bytes() == FILES["crate.glb"]
+    assert stub.ranges == [("crate.glb", f"bytes={len(FILES['crate.glb'])}-")]
+
+
+def test_oversized_part_file_is_discarded_on_416(stub, tmp_path):
+    (tmp_path / "crate.glb.part").write_bytes(b"stale" * 20000)
+
+    dest = make_fetcher(tmp_path).download(f"{stub.url}/files/crate.glb", tmp_path / "crate.glb")
+
+    assert dest.read_bytes() == FILES["crate.glb"]
+    assert stub.ranges == [("crate.glb", "bytes=100000-"), ("crate.glb", None)]
+
+
+def test_concurrent_fetches_download_each_asset_once(stub, tmp_path):
+    queries = ["crate", "Crate ", "wooden crate", "barrel"]
+
+    results = make_fetcher(tmp_path).fetch_many(queries)
+
+    assert all(results[query] for query in queries)
+    assert results["crate"].read_bytes() == FILES["crate.glb"]
+    assert results["barrel"].read_bytes() == FILES["barrel.glb"]
+    assert stub.requests["/files/crate.glb"] == 1
+    assert stub.requests["/files/barrel.glb"] == 1
+    # "crate" and "Crate " are one query
+    assert stub.requests["/search/crate"] == 1
+
+
+def test_cached_query_never_touches_the_network(stub, tmp_path):
+    first = make_fetcher(tmp_path).fetch("crate")
+    before = sum(stub.requests.values())
+
+    second = make_fetcher(tmp_path, save_dir="other_worktree").fetch("crate")
+
+    assert sum(stub.requests.values()) == before
+    assert second.read_bytes() == FILES["crate.glb"]
+    assert second.stat().st_ino == first.stat().st_ino
+
+
+def test_query_without_results_is_cached_as_unavailable(stub, tmp_path):
+    fetcher = make_fetcher(tmp_path)
+
+    assert fetcher.fetch("dragon") is None
+    assert fetcher.fetch("Dragon") is None
+
+    assert stub.requests["/search/dragon"] == 1
+    assert fetcher.cache.is_unavailable("dragon")
+
+
+@pytest.mark.parametrize("query", ["broken", "garbled"])
+def test_api_error_is_not_cached(stub, tmp_path, query):
+    fetcher = make_fetcher(tmp_path)
+
+    assert fetcher.fetch(query) is None
+    assert fetcher.fetch(query) is None
+
+    assert stub.requests[f"/search/{query}"] == 2
+    assert not fetcher.cache.is_unavailable(query)
@@ -0,0 +1,53 @@
+"""Incremental updates in git_stats.py"""
+
+import shutil
+import subprocess
+
+import pytest
+
+from git_stats import GitStats
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="needs git")
+
+
+def git(*args, cwd):
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+def commit(repo, path, text, message):
+    (repo / path).parent.mkdir(parents=True, exist_ok=True)
+    (repo / path).write_text(text)
+    git("add", "-A", cwd=repo)
+    git("commit", "-q", "-m", message, cwd=repo)
+    return git("rev-parse", "HEAD", cwd=repo)
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    monkeypatch.setattr(GitStats, "load_task_commits", lambda self: {})
+    root = tmp_path / "repo"
+    root.mkdir()
+    git("init", "-q", cwd=root)
+    git("config", "user.name", "test", cwd=root)
+    git("config", "user.email", "test@example.com", cwd=root)
+    return root
+
+
+def test_reset_to_an_ancestor_subtracts_the_dropped_commits(repo, tmp_path):
+    commit(repo, "scripts/player.gd", "a\nb\n", "S1T-aaaa1111: Player")
+    keep = commit(repo, "scripts/hud.gd", "c\n", "S1T-bbbb2222: HUD")
+    stats = GitStats(repo, tmp_path / "stats.json")
+    stats.update()
+    commit(repo, "scripts/hud.gd", "c\nd\ne\n", "S1T-bbbb2222: HUD, again")
+    commit(repo, "scenes/level.tscn", "[gd_scene]\n", "S1T-cccc3333: Level")
+    stats.update()
+
+    git("reset", "-q", "--hard", keep, cwd=repo)
+    rewound = GitStats(repo, tmp_path / "stats.json").update()
+    rebuilt = GitStats(repo, tmp_path / "rebuilt.json").update()
+
+    assert rewound == rebuilt
+    assert rewound["total_commits"] == 2
+    assert rewound["files_by_task"] == {"S1T-aaaa1111": ["scripts/player.gd"],
+                                        "S1T-bbbb2222": ["scripts/hud.gd"]}
+    assert "scenes" not in rewound["churn_by_dir"]
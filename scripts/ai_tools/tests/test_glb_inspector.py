@@ -0,0 +1,57 @@
+"""glb_inspector.py on hand-built GLB files"""
+
+import json
+import struct
+
+import pytest
+
+from glb_inspector import CHUNK_JSON, GLBError, inspect
+
+TRIANGLE = {
+    "asset": {"version": "2.0"},
+    "nodes": [{"mesh": 0}, {"mesh": 0}],
+    "meshes": [{"primitives": [{"attributes": {"POSITION": 0}, "indices": 1}]}],
+    "accessors": [{"count": 3}, {"count": 3}],
+}
+
+
+def glb(document) -> bytes:
+    data = json.dumps(document).encode()
+    data += b" " * (-len(data) % 4)
+    return struct.pack("<4sII", b"glTF", 2, 12 + 8 + len(data)) + struct.pack("<II", len(data), CHUNK_JSON) + data
+
+
+def write(tmp_path, data: bytes):
+    path = tmp_path / "model.glb"
+    path.write_bytes(data)
+    return path
+
+
+def test_counts_instanced_triangles(tmp_path):
+    stats = inspect(write(tmp_path, glb(TRIANGLE)))
+
+    assert (stats.meshes, stats.vertices, stats.triangles) == (1, 6, 2)
+
+
+@pytest.mark.parametrize("data", [
+    glb(TRIANGLE)[:40],                  # cut inside the JSON chunk
+    b"glTF\x02\x00",                      # cut inside the header
+    b"glTF" + bytes(range(256)) * 4,      # garbage after the magic
+    b"\x00\xffnot a model at all",
+])
+def test_truncated_or_garbage_file_is_a_glb_error(tmp_path, data):
+    with pytest.raises(GLBError):
+        inspect(write(tmp_path, data))
+
+
+@pytest.mark.parametrize("document", [
+    {**TRIANGLE, "accessors": [{"count": 3}]},               # index accessor out of range
+    {**TRIANGLE, "accessors": [{"count": 3}, {}]},           # accessor without a count
+    {**TRIANGLE, "meshes": {"primitives": []}},              # meshes is not a list
+    {**TRIANGLE, "nodes": [{"mesh": 4}]},                    # node names a missing mesh
+    {**TRIANGLE, "images": "texture.png"},                  # images is not a list
+    ["not", "an", "object"],
+])
+def test_malformed_json_is_a_glb_error(tmp_path, document):
+    with pytest.raises(GLBError, match="malformed"):
+        inspect(write(tmp_path, glb(document)))
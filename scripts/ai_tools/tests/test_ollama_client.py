@@ -0,0 +1,143 @@
+"""ollama_client.py against a local stand-in for Ollama's /api/chat"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ollama_client import OllamaClient, OllamaError, PatchError, run_task
+
+TIMINGS = {"prompt_eval_count": 1200, "prompt_eval_duration": 2_500_000_000,
+           "eval_count": 40, "eval_duration": 800_000_000, "load_duration": 0}
+
+
+class ChatStub(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), ChatHandler)
+        self.requests = []
+        # Raw NDJSON lines sent back for the next request
+        self.lines = []
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def reply(self, text: str, pieces: int = 4):
+        """Stream `text` in a few message chunks followed by the final one"""
+        size = max(1, len(text) // pieces + 1)
+        self.lines = [
+            json.dumps({"message": {"role": "assistant", "content": text[i:i + size]}, "done": False})
+            for i in range(0, len(text), size)
+        ] + [json.dumps({"message": {"role": "assistant", "content": ""}, "done": True, **TIMINGS})]
+
+
+class ChatHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        if self.path != "/api/chat":
+            self.send_error(404)
+            return
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.requests.append(json.loads(body))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        for line in self.server.lines:
+            self.wfile.write(line.encode() + b"\n")
+            self.wfile.flush()
+
+
+@pytest.fixture
+def stub():
+    server = ChatStub()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_chat_assembles_streamed_chunks(stub):
+    stub.reply("Hello from the stand-in model")
+    tokens = []
+
+    result = OllamaClient(stub.url).chat("ollama_chat/qwen2.5-coder:7b",
+                                         [{"role": "user", "content": "hi"}], on_token=tokens.append)
+
+    assert result["content"] == "Hello from the stand-in model"
+    assert len(tokens) > 1 and ''.join(tokens) == result["content"]
+    assert result["prompt_tokens"] == 1200
+    assert result["prompt_seconds"] == pytest.approx(2.5)
+    assert result["stopped"] is False
+    assert stub.requests[0]["model"] == "qwen2.5-coder:7b"
+    assert stub.requests[0]["stream"] is True
+
+
+def test_chat_stops_when_asked(stub):
+    stub.reply("a long answer that is cut short", pieces=8)
+
+    result = OllamaClient(stub.url).chat("m", [], should_stop=lambda: True)
+
+    assert result["stopped"] is True
+
+
+def test_malformed_stream_line_is_an_ollama_error(stub):
+    stub.lines = [json.dumps({"message": {"content": "ok"}, "done": False}), "{not json"]
+
+    with pytest.raises(OllamaError, match="Malformed"):
+        OllamaClient(stub.url).chat("m", [])
+
+
+def test_error_chunk_and_truncated_stream_are_ollama_errors(stub):
+    stub.lines = [json.dumps({"error": "model 'm' not found"})]
+    with pytest.raises(OllamaError, match="not found"):
+        OllamaClient(stub.url).chat("m", [])
+
+    stub.lines = [json.dumps({"message": {"content": "partial"}, "done": False})]
+    with pytest.raises(OllamaError, match="ended"):
+        OllamaClient(stub.url).chat("m", [])
+
+
+def test_run_task_applies_search_replace_edits(stub, tmp_path):
+    (tmp_path / "scripts").mkdir()
+    player = tmp_path / "scripts" / "player.gd"
+    player.write_text("extends CharacterBody3D\n\nvar speed := 5.0\n")
+    stub.reply(
+        "scripts/player.gd\n"
+        "<<<<<<< SEARCH\nvar speed := 5.0\n=======\n@export var speed := 7.5\n>>>>>>> REPLACE\n\n"
+        "scripts/new_state.gd\n"
+        "<<<<<<< SEARCH\n=======\nextends Node\n>>>>>>> REPLACE\n"
+    )
+
+    result = run_task(OllamaClient(stub.url), "m", "RULES", "Make speed editable",
+                      ["scripts/player.gd"], tmp_path)
+
+    assert sorted(result["changed"]) == ["scripts/new_state.gd", "scripts/player.gd"]
+    assert player.read_text() == "extends CharacterBody3D\n\n@export var speed := 7.5\n"
+    assert (tmp_path / "scripts" / "new_state.gd").read_text() == "extends Node\n"
+    # The task's files are sent with the prompt
+    assert "var speed := 5.0" in stub.requests[0]["messages"][1]["content"]
+
+
+def test_non_matching_block_rolls_back_every_edit(stub, tmp_path):
+    player = tmp_path / "player.gd"
+    player.write_text("var speed := 5.0\n")
+    stub.reply(
+        "player.gd\n"
+        "<<<<<<< SEARCH\nvar speed := 5.0\n=======\nvar speed := 9.0\n>>>>>>> REPLACE\n\n"
+        "player.gd\n"
+        "<<<<<<< SEARCH\nvar jump := 2.0\n=======\nvar jump := 3.0\n>>>>>>> REPLACE\n"
+        "hud.gd\n"
+        "<<<<<<< SEARCH\n=======\nextends Control\n>>>>>>> REPLACE\n"
+    )
+
+    with pytest.raises(PatchError, match="does not match"):
+        run_task(OllamaClient(stub.url), "m", "RULES", "task", ["player.gd"], tmp_path)
+
+    assert player.read_text() == "var speed := 5.0\n"
+    assert not (tmp_path / "hud.gd").exists()
@@ -0,0 +1,33 @@
+"""Failure classification in retry_policy.py"""
+
+from retry_policy import CAPABILITY, TRANSIENT, Failure, classify
+from task_logs import signature_of
+
+GDSCRIPT = """func _ready() -> void:
+\t$Timer.timeout.connect(_on_timer_timeout)
+\tawait get_tree().create_timer(0.5).timeout
+"""
+
+
+def test_gdscript_timeout_in_model_output_is_a_capability_failure():
+    assert classify(Failure("aider", 1, "$Timer.timeout.connect(...)")) == (CAPABILITY, "aider exited with 1")
+    assert classify(Failure("aider", 1, GDSCRIPT + "SyntaxError", stderr="Traceback: SyntaxError"))[0] == CAPABILITY
+
+
+def test_transport_errors_on_stderr_are_transient():
+    assert classify(Failure("aider", 1, stderr="requests.exceptions.ReadTimeout: Read timed out.")) == \
+        (TRANSIENT, "timeout")
+    assert classify(Failure("aider", 1, stderr="litellm.APIConnectionError: Connection refused"))[0] == TRANSIENT
+    assert classify(Failure("aider", 1, stderr="context deadline exceeded")) == (TRANSIENT, "timeout")
+
+
+def test_build_diagnostics_mentioning_timeout_are_not_transient():
+    failure = Failure("build", output="ERROR: Signal 'timeout' is already connected")
+    assert classify(failure)[0] == CAPABILITY
+
+
+def test_log_signatures_ignore_model_text():
+    line = "\t$Timer.timeout.connect(_on_timer_timeout)"
+    assert signature_of(line, "out") is None
+    assert signature_of(line, "prompt") is None
+    assert signature_of("urllib3 ... Read timed out. (read timeout=600)", "err") == "timeout"
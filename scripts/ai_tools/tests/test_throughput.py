@@ -0,0 +1,18 @@
+"""Remaining-work counts in throughput.py"""
+
+import throughput
+from task_ids import content_id, normalize
+
+
+def test_reworded_completed_task_is_not_counted_as_remaining(monkeypatch):
+    old = content_id(2, "Add the jump ability")
+    plan = [(2, content_id(2, "Add the jump abilities."), "Add the jump abilities."),
+            (2, content_id(2, "Add a HUD"), "Add a HUD"),
+            (3, content_id(3, "Add enemies"), "Add enemies")]
+    monkeypatch.setattr(throughput, "load_plan_tasks", lambda *args: plan)
+    progress = {"current_stage": 2, "completed_tasks": [old],
+                "task_ids": {old: {"stage": 2, "text": normalize("Add the jump ability")}}}
+
+    assert throughput.remaining_by_stage(progress) == {2: 1, 3: 1}
+    # The orchestrator's registry is left alone
+    assert list(progress["task_ids"]) == [old]
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Throughput - Time series of orchestrator events with rollups and ETA
+Events are appended to a JSONL file; hourly/daily rollups and per-stage cycle
+times are updated as events arrive so reports never rescan the raw history
+"""
+
+import copy
+import fcntl  # For file locking
+import json
+import math
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+from plan_tasks import load_plan_tasks
+from task_ids import TaskIdRegistry
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+METRICS_DIR = PROJECT_ROOT / ".ai_metrics"
+EVENTS_FILE = METRICS_DIR / "events.jsonl"
+ROLLUPS_FILE = METRICS_DIR / "rollups.json"
+FINAL_STAGE = 12
+
+# Hourly buckets are downsampled to daily ones after this many days
+HOURLY_RETENTION_DAYS = 14
+# Window used for the current throughput rate and the ETA
+RATE_WINDOW_HOURS = 24
+# z-score of the ETA band (90% two-sided)
+ETA_Z = 1.645
+
+EMPTY_BUCKET = {"completed": 0, "failed": 0, "verify_pass": 0, "verify_fail": 0, "busy_seconds": 0.0}
+
+# path -> (mtime_ns, size, rollups); the progress daemon reports every second
+_rollups_cache: Dict[Path, tuple] = {}
+
+
+def hour_key(ts: float) -> str:
+    return datetime.fromtimestamp(ts).strftime("%Y-%m-%dT%H")
+
+
+def day_key(ts: float) -> str:
+    return datetime.fromtimestamp(ts).strftime("%Y-%m-%d")
+
+
+def load_rollups(path: Path = ROLLUPS_FILE, cached: bool = False) -> dict:
+    """Read the rollups; `cached` reuses the last read while the file's mtime is unchanged
+    (callers must not modify the result then)"""
+    if path.exists():
+        try:
+            stat = path.stat()
+            key = (stat.st_mtime_ns, stat.st_size)
+            if cached and _rollups_cache.get(path, (None,))[0] == key:
+                return _rollups_cache[path][1]
+            with open(path) as f:
+                rollups = json.load(f)
+            if cached:
+                _rollups_cache[path] = (key, rollups)
+            return rollups
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️  Error loading throughput rollups: {e}")
+    return {"hourly": {}, "daily": {}, "stages": {}}
+
+
+class ThroughputStore:
+    def __init__(self, metrics_dir: Path = METRICS_DIR):
+        self.metrics_dir = Path(metrics_dir)
+        self.events_path = self.metrics_dir / EVENTS_FILE.name
+        self.rollups_path = self.metrics_dir / ROLLUPS_FILE.name
+        self.metrics_dir.mkdir(parents=True, exist_ok=True)
+
+    def record(self, kind: str, **data):
+        """Append one event and fold it into the rollups"""
+        event = {"ts": time.time(), "kind": kind, **data}
+
+        # The lock file serialises appends and the rollup read-modify-write
+        with open(self.metrics_dir / ".lock", "w") as lock:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            with open(self.events_path, "a") as f:
+                f.write(json.dumps(event) + "\n")
+
+            rollups = load_rollups(self.rollups_path)
+            self._apply(rollups, event)
+            self._downsample(rollups, event["ts"])
+
+            temp_file = self.rollups_path.with_suffix(".json.tmp")
+            with open(temp_file, "w") as f:
+                json.dump(rollups, f)
+            temp_file.replace(self.rollups_path)
+
+    def record_task(self, task_id: str, stage: int, model: str, success: bool, duration: float):
+        self.record(
+            "task_completed" if success else "task_failed",
+            task_id=task_id, stage=stage, model=model, duration=round(duration, 1)
+        )
+
+    def record_verification(self, task_id: str, passed: bool):
+        self.record("verification", task_id=task_id, passed=passed)
+
+    def record_generation(self, task_id: str, model: str, result: dict):
+        """Token counts and timings of one native Ollama generation"""
+        self.record(
+            "generation", task_id=task_id, model=model,
+            prompt_tokens=result["prompt_tokens"], prompt_seconds=round(result["prompt_seconds"], 3),
+            eval_tokens=result["eval_tokens"], eval_seconds=round(result["eval_seconds"], 3)
+        )
+
+    def _apply(self, rollups: dict, event: dict):
+        kind, ts = event["kind"], event["ts"]
+        for granularity, key in (("hourly", hour_key(ts)), ("daily", day_key(ts))):
+            bucket = rollups[granularity].setdefault(key, dict(EMPTY_BUCKET))
+            if kind == "task_completed":
+                bucket["completed"] += 1
+            elif kind == "task_failed":
+                bucket["failed"] += 1
+            elif kind == "verification":
+                bucket["verify_pass" if event.get("passed") else "verify_fail"] += 1
+            bucket["busy_seconds"] += event.get("duration", 0.0)
+
+        if kind == "task_completed":
+            stage = rollups["stages"].setdefault(str(event["stage"]), {
+                "completed": 0, "duration_sum": 0.0, "duration_sq_sum": 0.0,
+                "first_ts": ts, "last_ts": ts
+            })
+            duration = event.get("duration", 0.0)
+            stage["completed"] += 1
+            stage["duration_sum"] += duration
+            stage["duration_sq_sum"] += duration * duration
+            stage["last_ts"] = ts
+
+        if kind == "generation":
+            generation = rollups.setdefault("generation", {
+                "calls": 0, "prompt_tokens": 0, "prompt_seconds": 0.0, "eval_tokens": 0, "eval_seconds": 0.0
+            })
+            generation["calls"] += 1
+            for name in ("prompt_tokens", "prompt_seconds", "eval_tokens", "eval_seconds"):
+                generation[name] += event.get(name, 0)
+
+    def _downsample(self, rollups: dict, now: float):
+        """Drop hourly buckets older than the retention (daily ones keep the totals)"""
+        cutoff = hour_key(now - HOURLY_RETENTION_DAYS * 86400)
+        for key in [k for k in rollups["hourly"] if k < cutoff]:
+            del rollups["hourly"][key]
+
+
+def window_totals(rollups: dict, hours: int = RATE_WINDOW_HOURS, now: Optional[float] = None) -> dict:
+    """Summed hourly buckets over the last `hours` hours"""
+    now = time.time() if now is None else now
+    totals = dict(EMPTY_BUCKET)
+    active_hours = 0
+    for offset in range(hours):
+        bucket = rollups["hourly"].get(hour_key(now - offset * 3600))
+        if bucket:
+            active_hours += 1
+            for name in totals:
+                totals[name] += bucket[name]
+    totals["active_hours"] = active_hours
+    return totals
+
+
+def tasks_per_hour(rollups: dict, hours: int = RATE_WINDOW_HOURS) -> float:
+    """Completions per hour the orchestrator was active in the window"""
+    totals = window_totals(rollups, hours)
+    return totals["completed"] / totals["active_hours"] if totals["active_hours"] else 0.0
+
+
+def pass_rate_trend(rollups: dict, days: int = 7) -> List[tuple]:
+    """(day, verification pass rate or None) for the last `days` days"""
+    trend = []
+    for offset in reversed(range(days)):
+        day = (datetime.now() - timedelta(days=offset)).strftime("%Y-%m-%d")
+        bucket = rollups["daily"].get(day, EMPTY_BUCKET)
+        checks = bucket["verify_pass"] + bucket["verify_fail"]
+        trend.append((day, bucket["verify_pass"] / checks if checks else None))
+    return trend
+
+
+def stage_cycle_times(rollups: dict) -> Dict[int, dict]:
+    """Mean and standard deviation of task duration per stage, in seconds"""
+    result = {}
+    for stage, data in rollups["stages"].items():
+        n = data["completed"]
+        mean = data["duration_sum"] / n
+        variance = max(0.0, data["duration_sq_sum"] / n - mean * mean)
+        result[int(stage)] = {"completed": n, "mean": mean, "stdev": math.sqrt(variance)}
+    return dict(sorted(result.items()))
+
+
+def estimate_eta(remaining: int, rollups: dict, hours: int = RATE_WINDOW_HOURS) -> Optional[dict]:
+    """Projected hours until `remaining` tasks are done, with a 90% band
+
+    Completions are modelled as a Poisson process whose rate is estimated from
+    the window. The band combines the uncertainty of the rate (k observed
+    completions) and of the remaining work itself (Gamma(remaining, rate)):
+    relative error sqrt(1/k + 1/remaining), normal approximation.
+    """
+    totals = window_totals(rollups, hours)
+    observed = totals["completed"]
+    if remaining <= 0:
+        return {"hours": 0.0, "low": 0.0, "high": 0.0, "rate": 0.0}
+    if not observed or not totals["active_hours"]:
+        return None
+
+    rate = observed / totals["active_hours"]
+    expected = remaining / rate
+    relative = math.sqrt(1 / observed + 1 / remaining)
+    return {
+        "hours": expected,
+        "low": expected / (1 + ETA_Z * relative),
+        "high": expected / max(0.05, 1 - ETA_Z * relative),
+        "rate": rate,
+    }
+
+
+def remaining_plan_tasks(progress: dict) -> int:
+    """Plan tasks from the current stage through the final stage not yet completed"""
+    return sum(remaining_by_stage(progress).values())
+
+
+def remaining_by_stage(progress: dict) -> Dict[int, int]:
+    """Tasks not yet completed in each stage from the current one through the final stage"""
+    tasks = load_plan_tasks()
+    if not tasks:
+        return {}
+    done = set(progress.get("completed_tasks", []))
+    current = progress.get("current_stage", 1)
+    # Reworded tasks are tracked under the ID they inherited; resolve on a copy
+    # so reporting never touches the orchestrator's registry
+    registry = TaskIdRegistry({"task_ids": copy.deepcopy(progress.get("task_ids", {}))})
+    by_stage: Dict[int, list] = {}
+    for stage, task_id, description in tasks:
+        if current <= stage <= FINAL_STAGE:
+            by_stage.setdefault(stage, []).append(
+                SimpleNamespace(id=task_id, stage=stage, description=description))
+    remaining: Dict[int, int] = {}
+    for stage, stage_tasks in by_stage.items():
+        registry.resolve(stage_tasks, quiet=True)
+        count = sum(1 for task in stage_tasks if task.id not in done)
+        if count:
+            remaining[stage] = count
+    return dict(sorted(remaining.items()))
+
+
+def stage_etas(progress: dict, rollups: dict) -> Dict[int, Optional[dict]]:
+    """ETA until each remaining stage is finished (stages run in order, so each
+    one includes the tasks of the stages before it)"""
+    etas = {}
+    cumulative = 0
+    for stage, count in remaining_by_stage(progress).items():
+        cumulative += count
+        eta = estimate_eta(cumulative, rollups)
+        etas[stage] = eta and {**eta, "tasks": count, "cumulative": cumulative}
+    return etas
+
+
+def format_duration(hours: float) -> str:
+    if hours < 1:
+        return f"{hours * 60:.0f}m"
+    if hours < 48:
+        return f"{hours:.1f}h"
+    return f"{hours / 24:.1f}d"
+
+
+def format_throughput_report(progress: dict) -> str:
+    rollups = load_rollups(cached=True)
+    lines = [
+        "📈 THROUGHPUT",
+        f"  Tasks/hour (last {RATE_WINDOW_HOURS}h, active hours): {tasks_per_hour(rollups):.2f}",
+    ]
+
+    trend = " ".join("·" if rate is None else f"{rate * 100:.0f}%" for _, rate in pass_rate_trend(rollups))
+    lines.append(f"  Verification pass rate (7d): {trend}")
+
+    cycle_times = stage_cycle_times(rollups)
+    if cycle_times:
+        lines.append("  Cycle time per stage:")
+        for stage, data in cycle_times.items():
+            lines.append(f"    Stage {stage:>2}: {data['mean'] / 60:.1f} ± {data['stdev'] / 60:.1f} min "
+                         f"({data['completed']} tasks)")
+
+    generation = rollups.get("generation")
+    if generation and generation["calls"]:
+        calls = generation["calls"]
+        lines.append(f"  Ollama prompt eval per task: {generation['prompt_tokens'] / calls:.0f} tokens, "
+                     f"{generation['prompt_seconds'] / calls:.1f}s ({calls} generations)")
+
+    etas = stage_etas(progress, rollups)
+    if not etas:
+        lines.append(f"  ETA to stage {FINAL_STAGE}: done (no plan tasks left)")
+    elif all(eta is None for eta in etas.values()):
+        remaining = remaining_plan_tasks(progress)
+        lines.append(f"  ETA to stage {FINAL_STAGE}: unknown ({remaining} tasks left, no recent completions)")
+    else:
+        lines.append("  ETA per stage (90% band):")
+        for stage, eta in etas.items():
+            finish = datetime.now() + timedelta(hours=eta["hours"])
+            lines.append(f"    Stage {stage:>2}: {format_duration(eta['hours'])} "
+                         f"({format_duration(eta['low'])}-{format_duration(eta['high'])}, "
+                         f"~{finish.strftime('%Y-%m-%d %H:%M')}) {eta['tasks']} tasks left")
+    return '\n'.join(lines)
+
+
+def main():
+    progress = {}
+    progress_file = PROJECT_ROOT / ".ai_progress.json"
+    if progress_file.exists():
+        with open(progress_file) as f:
+            progress = json.load(f)
+
+    if "--json" in sys.argv:
+        rollups = load_rollups()
+        print(json.dumps({
+            "tasks_per_hour": tasks_per_hour(rollups),
+            "pass_rate_trend": pass_rate_trend(rollups),
+            "stage_cycle_times": stage_cycle_times(rollups),
+            "eta": estimate_eta(remaining_plan_tasks(progress), rollups),
+            "stage_etas": stage_etas(progress, rollups),
+        }, indent=2))
+        return
+
+    print(format_throughput_report(progress))
+
+
+if __name__ == "__main__":
+    main()
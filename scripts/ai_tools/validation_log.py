@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Validation Log - Append-only, size-rotated history of build validations
+Keeps an on-disk hash index for reported errors and a small summary file so
+readers never have to load the full history
+"""
+
+import dbm
+import fcntl  # For file locking
+import gzip
+import json
+import shutil
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+VALIDATION_LOG_DIR = PROJECT_ROOT / ".validation_log"
+LEGACY_VALIDATION_LOG = PROJECT_ROOT / ".validation_log.json"
+
+ACTIVE_SEGMENT = "current.jsonl"
+SEGMENTS_DIR = "segments"
+ERROR_INDEX = "errors.db"
+SUMMARY_FILE = "summary.json"
+
+# Rotate the active segment once it grows past this many bytes
+MAX_SEGMENT_BYTES = 4 * 1024 * 1024
+# Number of compressed segments kept before the oldest are deleted
+MAX_SEGMENTS = 50
+# Number of recent validations kept in the summary
+SUMMARY_RECENT = 20
+
+EMPTY_SUMMARY = {
+    "total_validations": 0,
+    "successful_validations": 0,
+    "error_count": 0,
+    "recent": [],
+    "last_commit": None,
+    "last_good_commit": None,
+    "last_good_timestamp": None,
+    "first_bad_commit": None,
+    "updated": None,
+}
+
+
+def load_summary(log_dir: Path = VALIDATION_LOG_DIR) -> dict:
+    """Read the validation summary (cheap; used by reporting tools)"""
+    summary_path = Path(log_dir) / SUMMARY_FILE
+    if summary_path.exists():
+        try:
+            with open(summary_path) as f:
+                return {**EMPTY_SUMMARY, **json.load(f)}
+        except Exception as e:
+            print(f"⚠️  Error loading validation summary: {e}")
+    return dict(EMPTY_SUMMARY)
+
+
+class ValidationLog:
+    def __init__(self, log_dir: Path = VALIDATION_LOG_DIR):
+        self.log_dir = Path(log_dir)
+        self.segments_dir = self.log_dir / SEGMENTS_DIR
+        self.active_path = self.log_dir / ACTIVE_SEGMENT
+        self.index_path = self.log_dir / ERROR_INDEX
+        self.summary_path = self.log_dir / SUMMARY_FILE
+
+        self.segments_dir.mkdir(parents=True, exist_ok=True)
+        self.summary = load_summary(self.log_dir)
+        self.migrate_legacy()
+
+    def migrate_legacy(self):
+        """Import a pre-JSONL .validation_log.json once, then set it aside"""
+        if self.log_dir != VALIDATION_LOG_DIR or not LEGACY_VALIDATION_LOG.exists():
+            return
+
+        print("📦 Migrating .validation_log.json to the append-only log...")
+        try:
+            with open(LEGACY_VALIDATION_LOG) as f:
+                legacy = json.load(f)
+
+            for entry in legacy.get("validations", []):
+                self.append_validation(entry)
+            for error in legacy.get("errors", []):
+                if error.get("error_hash"):
+                    self.record_error(**error)
+
+            LEGACY_VALIDATION_LOG.replace(LEGACY_VALIDATION_LOG.with_suffix(".json.migrated"))
+        except Exception as e:
+            print(f"⚠️  Error migrating legacy validation log: {e}")
+
+    def _append(self, record: dict):
+        """Append one JSON line to the active segment, rotating when it is full"""
+        line = json.dumps(record) + "\n"
+        with open(self.active_path, "a") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                f.write(line)
+                f.flush()
+                size = f.tell()
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+        if size >= MAX_SEGMENT_BYTES:
+            self.rotate()
+
+    def rotate(self):
+        """Compress the active segment into segments/ and start a new one"""
+        if not self.active_path.exists() or self.active_path.stat().st_size == 0:
+            return
+
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        staging = self.log_dir / f"rotating-{stamp}.jsonl"
+        # Renaming first means concurrent appends land in a fresh segment
+        self.active_path.replace(staging)
+
+        target = self.segments_dir / f"validations-{stamp}.jsonl.gz"
+        with open(staging, "rb") as src, gzip.open(target, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        staging.unlink()
+
+        segments = sorted(self.segments_dir.glob("validations-*.jsonl.gz"))
+        for old in segments[:-MAX_SEGMENTS]:
+            old.unlink()
+
+    def _write_summary(self):
+        self.summary["updated"] = datetime.now().isoformat()
+        temp_file = self.summary_path.with_suffix(".json.tmp")
+        with open(temp_file, "w") as f:
+            json.dump(self.summary, f, indent=2)
+        temp_file.replace(self.summary_path)
+
+    def append_validation(self, entry: dict):
+        """Record one validation result"""
+        self._append({"type": "validation", **entry})
+
+        summary = self.summary
+        success = bool(entry.get("success"))
+        summary["total_validations"] += 1
+        summary["successful_validations"] += int(success)
+        summary["last_commit"] = entry.get("commit")
+
+        if success:
+            summary["last_good_commit"] = entry.get("commit")
+            summary["last_good_timestamp"] = entry.get("timestamp")
+            summary["first_bad_commit"] = None
+        elif not summary.get("first_bad_commit"):
+            summary["first_bad_commit"] = entry.get("commit")
+
+        summary["recent"] = (summary.get("recent", []) + [{
+            "timestamp": entry.get("timestamp"),
+            "commit": entry.get("commit"),
+            "success": success,
+        }])[-SUMMARY_RECENT:]
+        self._write_summary()
+
+    def record_error(self, error_hash: str, **details):
+        """Record a reported error and index it by hash"""
+        record = {"error_hash": error_hash, **details}
+        record.setdefault("timestamp", datetime.now().isoformat())
+        self._append({"type": "error", **record})
+
+        with dbm.open(str(self.index_path), "c") as index:
+            is_new = error_hash.encode() not in index
+            index[error_hash] = json.dumps(record)
+
+        if is_new:
+            self.summary["error_count"] += 1
+            self._write_summary()
+
+    def record_event(self, kind: str, data: dict):
+        """Append any other record (e.g. bisect results) to the log"""
+        self._append({"type": kind, **data})
+
+    def find_error(self, error_hash: str) -> Optional[dict]:
+        """Look up a previously reported error by hash (O(1) on disk)"""
+        try:
+            with dbm.open(str(self.index_path), "r") as index:
+                value = index.get(error_hash)
+        except dbm.error:
+            return None
+        return json.loads(value) if value else None
+
+    def iter_records(self, include_rotated: bool = False) -> Iterator[dict]:
+        """Stream records oldest first, optionally including compressed segments"""
+        paths = sorted(self.segments_dir.glob("validations-*.jsonl.gz")) if include_rotated else []
+        paths.append(self.active_path)
+
+        for path in paths:
+            if not path.exists():
+                continue
+            opener = gzip.open if path.suffix == ".gz" else open
+            with opener(path, "rt") as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        yield json.loads(line)
+
+
+def main():
+    log = ValidationLog()
+    summary = log.summary
+    segments = sorted(log.segments_dir.glob("validations-*.jsonl.gz"))
+    active_size = log.active_path.stat().st_size if log.active_path.exists() else 0
+
+    print("📜 Validation Log")
+    print(f"   Validations: {summary['total_validations']} "
+          f"({summary['successful_validations']} successful)")
+    print(f"   Errors reported: {summary['error_count']}")
+    print(f"   Last good commit: {summary['last_good_commit']}")
+    print(f"   First bad commit: {summary['first_bad_commit']}")
+    print(f"   Active segment: {active_size / 1024:.1f} KiB, {len(segments)} rotated segment(s)")
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--rotate":
+        log.rotate()
+        print("✅ Rotated active segment")
+
+
+if __name__ == "__main__":
+    main()
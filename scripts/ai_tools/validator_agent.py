@@ -5,34 +5,39 @@ Runs in the background to catch issues early
 """
 
 import subprocess
-import time
 import json
-import hashlib
 from pathlib import Path
 from datetime import datetime
+from typing import List, Optional
+
+from dependency_graph import DependencyGraph, changed_files, format_broken_references
+from git_watch import GitHeadWatcher, read_head_commit
+from validation_log import ValidationLog
+from error_fingerprint import ErrorClusters, fingerprint
+from auto_bisect import bisect_from_log, format_bisect_result
+from godot_diagnostics import (
+    Diagnostic, DiagnosticsStore, diagnostics_text, errors, files_with_errors,
+    format_diagnostics, parse_output, run_godot_check
+)
 
 GODOT_PATH = "/Applications/Godot.app/Contents/MacOS/Godot"
 PROJECT_ROOT = Path(__file__).parent.parent.parent
-VALIDATION_LOG = PROJECT_ROOT / ".validation_log.json"
 
 class ValidatorAgent:
-    def __init__(self):
-        self.validation_history = self.load_history()
+    def __init__(self, auto_bisect: bool = False):
+        self.auto_bisect = auto_bisect
+        self.log = ValidationLog()
+        self.clusters = ErrorClusters()
+        self.diagnostics_store = DiagnosticsStore()
         self.last_commit = None
         self.ensure_github_labels()
 
-    def load_history(self):
-        if VALIDATION_LOG.exists():
-            with open(VALIDATION_LOG) as f:
-                return json.load(f)
-        return {"validations": [], "errors": []}
-
-    def save_history(self):
-        with open(VALIDATION_LOG, "w") as f:
-            json.dump(self.validation_history, f, indent=2)
-
     def get_current_commit(self):
-        """Get current git commit hash"""
+        """Get current git commit hash (read straight from the ref files when possible)"""
+        commit = read_head_commit(PROJECT_ROOT)
+        if commit:
+            return commit
+
         result = subprocess.run(
             ["git", "rev-parse", "HEAD"],
             capture_output=True,
@@ -40,19 +45,52 @@ class ValidatorAgent:
         )
         return result.stdout.strip()
 
-    def validate_build(self):
-        """Run Godot headless validation"""
-        print(f"🔍 [{datetime.now().strftime('%H:%M:%S')}] Validating build...")
+    def validate_build(self, changed: Optional[List[str]] = None):
+        """Run Godot headless validation
 
-        result = subprocess.run(
-            [GODOT_PATH, "--headless", "--check-only", "--quit"],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
+        Args:
+            changed: Files changed since the last validated commit. When given,
+                     broken references are reported statically and Godot is only
+                     launched if a scene or script is affected; otherwise the
+                     previous result stands and nothing is logged. An empty
+                     list (or a failed diff) runs the full check.
+        """
+        print(f"🔍 [{datetime.now().strftime('%H:%M:%S')}] Validating build...")
 
         commit = self.get_current_commit()
         timestamp = datetime.now().isoformat()
+        result = None
+
+        if changed is not None and not changed:
+            # An empty or failed diff proves nothing: don't pass the commit unchecked
+            print("🔍 No changes found - running the full Godot check")
+            changed = None
+
+        if changed is not None:
+            affected, broken = DependencyGraph().check_change(changed)
+
+            if broken:
+                stderr = format_broken_references(broken)
+                result = (1, parse_output(stderr), stderr, "")
+            elif not affected:
+                # The build is as good (or as broken) as the last validated commit. Nothing
+                # is logged: an unchecked commit must not become last_good_commit and
+                # shift the bisect range
+                still_good = not self.log.summary.get("first_bad_commit")
+                print(f"{'✅' if still_good else '❌'} No scenes or scripts affected - skipping Godot check "
+                      f"(build still {'valid' if still_good else 'broken'})")
+                return still_good
+            else:
+                print(f"   {len(affected)} scenes/scripts affected by {len(changed)} changed files")
+
+        if result is None:
+            result = run_godot_check(
+                [GODOT_PATH, "--headless", "--check-only", "--quit"],
+                timeout=30
+            )
+
+        returncode, diagnostics, stderr, stdout = result
+        self.diagnostics_store.save(commit, diagnostics)
 
         validation_entry = {
             "timestamp": timestamp,
@@ -62,21 +100,26 @@ class ValidatorAgent:
             "stdout": ""
         }
 
-        if result.returncode != 0 and ("ERROR" in result.stderr or "SCRIPT ERROR" in result.stderr):
+        if returncode != 0 and errors(diagnostics):
             validation_entry["success"] = False
-            validation_entry["stderr"] = result.stderr
-            validation_entry["stdout"] = result.stdout
+            validation_entry["stderr"] = stderr
+            validation_entry["stdout"] = stdout
+            validation_entry["error_files"] = files_with_errors(diagnostics)
 
             print(f"❌ Validation failed!")
-            print(f"Errors:\n{result.stderr}")
+            print(format_diagnostics(diagnostics))
 
             # Create GitHub issue for the error
-            self.create_error_issue(commit, result.stderr)
+            issue_url = self.create_error_issue(commit, stderr, diagnostics)
         else:
             print(f"✅ Build valid")
 
-        self.validation_history["validations"].append(validation_entry)
-        self.save_history()
+        was_broken = bool(self.log.summary.get("first_bad_commit"))
+        self.log.append_validation(validation_entry)
+
+        # Only bisect on a fresh good → bad transition spanning several commits
+        if not validation_entry["success"] and self.auto_bisect and not was_broken:
+            self.bisect_failure(issue_url)
 
         return validation_entry["success"]
 
@@ -110,31 +153,58 @@ class ValidatorAgent:
             except:
                 pass  # Silently continue if label creation fails
 
-    def create_error_issue(self, commit: str, error_text: str):
+    def create_error_issue(self, commit: str, error_text: str,
+                           diagnostics: Optional[List[Diagnostic]] = None):
         """Create GitHub issue for build errors"""
-        # Check if we already created an issue for this error
-        # Use SHA256 for stable, deterministic hashing (not Python's hash())
-        error_hash = hashlib.sha256(error_text.encode()).hexdigest()[:16]
-        recent_errors = [e for e in self.validation_history.get("errors", [])
-                        if e.get("error_hash") == error_hash]
-
-        if recent_errors:
-            print("⚠️  Similar error already reported")
-            return
+        diagnostics = diagnostics if diagnostics is not None else parse_output(error_text)
+        raw_output = error_text
+        # Dedupe on the parsed errors rather than the raw log when we have them
+        error_text = diagnostics_text(diagnostics) or error_text
+
+        # Check if we already created an issue for this error. The fingerprint is
+        # taken over normalized output, so line numbers, paths and timestamps
+        # don't make a repeat error look new.
+        error_hash = fingerprint(error_text)
+        known = self.log.find_error(error_hash)
+        cluster = self.clusters.match(error_text)
+
+        regression_of = None
+        if known or cluster:
+            issue_url = (known or {}).get("issue_url") or (cluster or {}).get("issue_url")
+            if issue_url and self.issue_state(issue_url) == "CLOSED":
+                # A fixed error came back: a comment on the closed issue would go unnoticed,
+                # so open a new urgent issue for it
+                print(f"🔁 Error from closed issue {issue_url} is back - opening a new issue")
+                regression_of = issue_url
+            else:
+                print(f"⚠️  Similar error already reported: {issue_url or 'issue unknown'}")
+                if issue_url and (known or {}).get("commit") != commit:
+                    self.attach_occurrence(issue_url, commit, error_hash, cluster, known is None)
+                return issue_url
 
         # Extract error details
-        error_lines = [line for line in error_text.split('\n') if 'ERROR' in line]
-        error_summary = error_lines[0] if error_lines else "Build verification failed"
+        error_diagnostics = errors(diagnostics)
+        error_summary = error_diagnostics[0].message if error_diagnostics else "Build verification failed"
+        affected_files = '\n'.join(f"- `{f}`" for f in files_with_errors(diagnostics)) or "- (engine)"
 
+        regression = f"**Regression of:** {regression_of}\n" if regression_of else ""
         body = f"""## Automated Build Validation Error
 
 **Commit:** `{commit}`
 **Timestamp:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+{regression}
+### Diagnostics:
+{format_diagnostics(diagnostics)}
+
+### Affected Files:
+{affected_files}
+
+<details><summary>Raw output</summary>
 
-### Error Output:
 ```
-{error_text}
+{raw_output[-5000:]}
 ```
+</details>
 
 ### Action Required:
 This build error was detected by the automated validation agent. Please review and fix before proceeding.
@@ -157,49 +227,160 @@ This build error was detected by the automated validation agent. Please review a
                 issue_url = result.stdout.strip()
                 print(f"📋 Created error issue: {issue_url}")
 
-                # Log the error
-                if "errors" not in self.validation_history:
-                    self.validation_history["errors"] = []
-
-                self.validation_history["errors"].append({
-                    "timestamp": datetime.now().isoformat(),
-                    "commit": commit,
-                    "error_hash": error_hash,
-                    "issue_url": issue_url
-                })
-                self.save_history()
+                # Log and index the error, and start a cluster for near-duplicates
+                self.log.record_error(
+                    error_hash,
+                    timestamp=datetime.now().isoformat(),
+                    commit=commit,
+                    issue_url=issue_url
+                )
+                if cluster:
+                    # Later near-duplicates belong to the new issue, not the closed one
+                    self.clusters.reassign(cluster, issue_url, commit)
+                else:
+                    self.clusters.add(error_text, issue_url, commit)
+                if regression_of:
+                    subprocess.run(
+                        ["gh", "issue", "comment", regression_of, "--body",
+                         f"🔁 **Regressed** in commit `{commit}`, tracked in {issue_url}"],
+                        capture_output=True,
+                        text=True
+                    )
+                return issue_url
         except Exception as e:
             print(f"⚠️  Failed to create error issue: {e}")
 
+    def bisect_failure(self, issue_url: Optional[str]):
+        """Pin the breaking commit between the last good and first bad validation"""
+        good = self.log.summary.get("last_good_commit")
+        bad = self.log.summary.get("first_bad_commit")
+        if not good or not bad or good == bad:
+            return
+
+        count = subprocess.run(
+            ["git", "rev-list", "--count", "--ancestry-path", f"{good}..{bad}"],
+            capture_output=True,
+            text=True
+        ).stdout.strip()
+        if not count.isdigit() or int(count) < 2:
+            return  # A single new commit is already the culprit
+
+        try:
+            result = bisect_from_log()
+        except Exception as e:
+            print(f"⚠️  Auto-bisect failed: {e}")
+            return
+
+        if not result:
+            return
+
+        report = format_bisect_result(result)
+        print(report)
+        if issue_url:
+            subprocess.run(
+                ["gh", "issue", "comment", issue_url, "--body", report],
+                capture_output=True,
+                text=True
+            )
+
+    def issue_state(self, issue_url: str) -> Optional[str]:
+        """OPEN or CLOSED, or None if GitHub can't be asked"""
+        try:
+            result = subprocess.run(
+                ["gh", "issue", "view", issue_url, "--json", "state"],
+                capture_output=True,
+                text=True,
+                timeout=30
+            )
+            if result.returncode == 0:
+                return json.loads(result.stdout).get("state")
+        except (OSError, subprocess.TimeoutExpired, json.JSONDecodeError) as e:
+            print(f"⚠️  Could not check issue state: {e}")
+        return None
+
+    def attach_occurrence(self, issue_url: str, commit: str, error_hash: str,
+                          cluster: Optional[dict], new_variant: bool):
+        """Note a repeat of a known error on its existing issue instead of opening a new one"""
+        if cluster:
+            if commit in cluster["commits"]:
+                return  # Same commit re-validated; nothing new to report
+            self.clusters.record_occurrence(cluster, commit)
+
+        if new_variant:
+            # Index this variant so the next exact repeat is a direct hit
+            self.log.record_error(
+                error_hash,
+                timestamp=datetime.now().isoformat(),
+                commit=commit,
+                issue_url=issue_url,
+                cluster=cluster["id"] if cluster else None
+            )
+
+        seen = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        if cluster:
+            count = cluster["occurrences"]
+            seen = f"{count} occurrence{'s' if count != 1 else ''} so far, {seen}"
+        comment = f"🔁 **Seen again** in commit `{commit}` ({seen})"
+        try:
+            subprocess.run(
+                ["gh", "issue", "comment", issue_url, "--body", comment],
+                capture_output=True,
+                text=True
+            )
+        except Exception as e:
+            print(f"⚠️  Failed to comment on existing issue: {e}")
+
     def watch(self, interval: int = 60):
-        """Continuously watch for changes and validate"""
-        print(f"👁️  Validator Agent starting (checking every {interval}s)")
+        """Continuously watch for changes and validate
+
+        Reacts to updates of .git/HEAD and refs (inotify/kqueue, or stat polling
+        as a fallback) instead of polling git; bursts of commits are debounced
+        into a single validation. `interval` is only a safety re-check period.
+        """
+        watcher = GitHeadWatcher(PROJECT_ROOT)
+        print(f"👁️  Validator Agent starting (watching git refs via {watcher.backend})")
         print("Press Ctrl+C to stop\n")
 
         try:
+            # Validate the current state once on startup
+            if watcher.last_commit != self.last_commit:
+                self.validate_build()
+                self.last_commit = watcher.last_commit
+
             while True:
-                current_commit = self.get_current_commit()
+                current_commit = watcher.wait_for_change(timeout=interval)
 
                 # Only validate if commit changed
-                if current_commit != self.last_commit:
-                    self.validate_build()
+                if current_commit and current_commit != self.last_commit:
+                    changed = changed_files(self.last_commit, current_commit) if self.last_commit else None
+                    self.validate_build(changed)
                     self.last_commit = current_commit
-
-                time.sleep(interval)
         except KeyboardInterrupt:
             print("\n\n👋 Validator Agent stopped")
-            self.save_history()
+        finally:
+            watcher.close()
 
 def main():
     import sys
-    agent = ValidatorAgent()
+    args = sys.argv[1:]
+    auto_bisect = "--bisect" in args
+    args = [a for a in args if a != "--bisect"]
+
+    if args and args[0] == "bisect":
+        # Bisect the last good → bad range from the validation log
+        result = bisect_from_log()
+        if result:
+            print(format_bisect_result(result))
+        return
+
+    agent = ValidatorAgent(auto_bisect=auto_bisect)
 
-    if len(sys.argv) > 1 and sys.argv[1] == "once":
+    if args and args[0] == "once":
         # Single validation
         agent.validate_build()
     else:
         # Watch mode
-        interval = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+        interval = int(args[0]) if args else 60
         agent.watch(interval)
 
 if __name__ == "__main__":
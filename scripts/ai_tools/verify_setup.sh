@@ -22,7 +22,7 @@ echo ""
 
 # Check 2: Progress files in gitignore
 echo "2. Checking .gitignore..."
-if grep -q ".ai_progress.json" .gitignore && grep -q ".validation_log.json" .gitignore; then
+if grep -q ".ai_progress.json" .gitignore && grep -q ".validation_log" .gitignore; then
     echo "   ✅ Progress files excluded from git"
 else
     echo "   ❌ Progress files NOT in .gitignore"
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Worker Daemon - Runs tasks dispatched by a coordinating orchestrator
+Connects to the coordinator (agent_orchestrator.py --distributed), registers
+the Ollama models this machine has, and heartbeats while it works. Each task
+is checked out from the coordinator's bundle into a fresh worktree, run with
+aider (or the native Ollama backend) and verified with the local Godot, and
+the result goes back with a bundle of the task's commits
+"""
+
+import json
+import socket
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Dict, Optional
+
+from agent_orchestrator import BACKEND, AgentOrchestrator, Task
+from ollama_client import OLLAMA_HOST, base_url
+from retry_policy import Failure
+from task_coordinator import (
+    COORDINATOR_TOKEN, PROTOCOL_VERSION, Connection, create_bundle, failure_to_dict, fetch_bundle,
+    parse_address
+)
+from task_leases import HEARTBEAT_INTERVAL, TaskInterrupted, git, rev_parse
+from task_logs import COMMENT_CHARS, TaskLog
+from task_scheduler import WorktreeRunner
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+# The last commit received from the coordinator; its history is not sent again
+HAVE_REF = "refs/ai-worker/base"
+
+# Seconds between reconnection attempts, doubling up to the cap
+RECONNECT_DELAY = 5
+RECONNECT_CAP = 60
+
+
+def local_models(host: str = OLLAMA_HOST) -> list:
+    try:
+        with urllib.request.urlopen(f"{base_url(host)}/api/tags", timeout=5) as response:
+            return [m["name"] for m in json.load(response).get("models", [])]
+    except (OSError, ValueError, urllib.error.URLError):
+        return []
+
+
+class WorkerDaemon:
+    def __init__(self, address: tuple, name: str, capacity: int = 1, backend: str = BACKEND):
+        self.address = address
+        self.name = name
+        self.capacity = capacity
+        self.orchestrator = AgentOrchestrator(backend)
+        self.runner = WorktreeRunner(PROJECT_ROOT)
+        self.conn: Optional[Connection] = None
+        self.jobs: Dict[str, str] = {}  # lease -> task id
+        self.lock = threading.Lock()
+
+    def have(self) -> Optional[str]:
+        return rev_parse(HAVE_REF, PROJECT_ROOT)
+
+    # Connection
+
+    def serve_forever(self):
+        delay = RECONNECT_DELAY
+        while True:
+            try:
+                self.serve()
+                delay = RECONNECT_DELAY
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Coordinator {self.address[0]}:{self.address[1]} unreachable: {e}")
+            self.cancel_all()
+            print(f"🔌 Reconnecting in {delay}s")
+            time.sleep(delay)
+            delay = min(RECONNECT_CAP, delay * 2)
+
+    def serve(self):
+        sock = socket.create_connection(self.address, timeout=30)
+        sock.settimeout(None)
+        self.conn = Connection(sock)
+        try:
+            self.conn.send({
+                "type": "register", "version": PROTOCOL_VERSION, "token": COORDINATOR_TOKEN,
+                "name": self.name, "capacity": self.capacity, "models": local_models(),
+                "have": self.have(),
+            })
+            reply = self.conn.receive()
+            if not reply or reply.get("type") != "registered":
+                raise ValueError((reply or {}).get("error", "registration refused"))
+            print(f"🤝 Registered with {self.address[0]}:{self.address[1]} as {reply['name']}")
+
+            stop = threading.Event()
+            heartbeat = threading.Thread(target=self.heartbeat, args=(stop,), daemon=True)
+            heartbeat.start()
+            try:
+                while True:
+                    message = self.conn.receive()
+                    if message is None:
+                        print("🔌 Coordinator closed the connection")
+                        return
+                    if message.get("type") == "task":
+                        threading.Thread(target=self.run_job, args=(message,), daemon=True).start()
+                    elif message.get("type") == "cancel":
+                        self.cancel(message["lease"])
+            finally:
+                stop.set()
+        finally:
+            self.conn.close()
+
+    def heartbeat(self, stop: threading.Event):
+        while not stop.wait(HEARTBEAT_INTERVAL):
+            with self.lock:
+                running = list(self.jobs.values())
+            try:
+                self.conn.send({"type": "heartbeat", "running": running})
+            except OSError:
+                return
+
+    def cancel(self, lease_id: str):
+        with self.lock:
+            task_id = self.jobs.get(lease_id)
+        process = self.orchestrator.active_processes.get(task_id) if task_id else None
+        if process:
+            print(f"🛑 Coordinator cancelled {task_id}")
+            process.terminate()
+
+    def cancel_all(self):
+        with self.lock:
+            leases = list(self.jobs)
+        for lease_id in leases:
+            self.cancel(lease_id)
+
+    # Tasks
+
+    def run_job(self, job: dict):
+        task = Task(**job["task"])
+        lease_id = job["lease"]
+        with self.lock:
+            self.jobs[lease_id] = task.id
+        print(f"📥 {task.id}: {task.title} ({task.model})")
+
+        reply = {"type": "result", "lease": lease_id}
+        worktree = None
+        log = None
+        try:
+            if job.get("bundle"):
+                fetch_bundle(job["bundle"], HAVE_REF, PROJECT_ROOT)
+            worktree = self.runner.create(lease_id, job["snapshot"] or job["head"])
+            if job["snapshot"]:
+                # Uncommitted work restored by the coordinator stays uncommitted here too
+                git("reset", "-q", "HEAD~1", cwd=worktree)
+
+            with self.orchestrator.admission.hold("task", task.model):
+                log = TaskLog(task.id, task.model, task.stage, self.orchestrator.backend,
+                              index=self.orchestrator.log_index)
+                self.orchestrator.task_logs[task.id] = log
+                failure, message = self.orchestrator.run_attempt(
+                    task, job["prompt"], job["files"], worktree, job["base"]
+                )
+            output = log.tail("out", COMMENT_CHARS) + log.tail("err", COMMENT_CHARS)
+            reply.update(failure=failure_to_dict(failure), message=message, have=job["head"], output=output)
+            head = rev_parse("HEAD", worktree)
+            if failure is None and head != job["head"]:
+                reply["bundle"] = create_bundle(head, job["head"], worktree)
+            print(f"{'✅' if failure is None else '❌'} {task.id} finished")
+        except TaskInterrupted:
+            reply.update(failure=failure_to_dict(Failure("worker_lost", output="worker shutting down")),
+                         message="The worker was shut down during the task")
+        except Exception as e:
+            print(f"❌ {task.id} could not run: {e}")
+            reply.update(failure=failure_to_dict(Failure("worker_lost", output=str(e))),
+                         message=f"Worker `{self.name}` could not run the task: {e}")
+        finally:
+            if log:
+                log.close("completed" if reply.get("message") and not reply.get("failure") else "failed")
+                self.orchestrator.task_logs.pop(task.id, None)
+            if worktree:
+                self.runner.remove(worktree)
+            with self.lock:
+                self.jobs.pop(lease_id, None)
+
+        try:
+            self.conn.send(reply)
+        except OSError:
+            print(f"⚠️  Could not report {task.id}: coordinator gone")
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] in ("-h", "--help"):
+        print("""
+Usage: python3 worker_daemon.py HOST:PORT [--name NAME] [--capacity N] [--backend aider|ollama]
+
+Runs tasks for an orchestrator started with --distributed. Set AI_COORDINATOR_TOKEN
+to the coordinator's token if it uses one.
+""")
+        return
+
+    address = parse_address(sys.argv[1])
+    name = socket.gethostname()
+    capacity = 1
+    backend = BACKEND
+    if "--name" in sys.argv:
+        name = sys.argv[sys.argv.index("--name") + 1]
+    if "--capacity" in sys.argv:
+        capacity = int(sys.argv[sys.argv.index("--capacity") + 1])
+    if "--backend" in sys.argv:
+        backend = sys.argv[sys.argv.index("--backend") + 1]
+
+    daemon = WorkerDaemon(address, name, capacity, backend)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        daemon.orchestrator.shutdown()
+        daemon.runner.close()
+        print("\n👋 Worker stopped")
+
+
+if __name__ == "__main__":
+    main()